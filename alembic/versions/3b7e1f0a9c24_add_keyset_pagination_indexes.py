@@ -0,0 +1,37 @@
+"""add keyset pagination indexes
+
+Revision ID: 3b7e1f0a9c24
+Revises: cdb9f848e0f3
+Create Date: 2026-10-18 10:02:14.318406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7e1f0a9c24"
+down_revision: Union[str, None] = "cdb9f848e0f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_users_created_at_id", "users", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_projects_created_at_id", "projects", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_tasks_created_at_id", "tasks", ["created_at", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_created_at_id", table_name="tasks")
+    op.drop_index("ix_projects_created_at_id", table_name="projects")
+    op.drop_index("ix_users_created_at_id", table_name="users")
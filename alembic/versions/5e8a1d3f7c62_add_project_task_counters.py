@@ -0,0 +1,44 @@
+"""add project task counters
+
+Revision ID: 5e8a1d3f7c62
+Revises: c41f9e2d7b08
+Create Date: 2026-10-18 21:42:08.519204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8a1d3f7c62"
+down_revision: Union[str, None] = "c41f9e2d7b08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "projects",
+        sa.Column("task_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "projects",
+        sa.Column("completed_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    # backfill; large tables can use `python -m app.cli.reconcile_counters`
+    op.execute(
+        "UPDATE projects SET "
+        "task_count = (SELECT count(*) FROM tasks "
+        "WHERE tasks.project_id = projects.id), "
+        "completed_count = (SELECT count(*) FROM tasks "
+        "WHERE tasks.project_id = projects.id AND tasks.complete)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("projects", "completed_count")
+    op.drop_column("projects", "task_count")
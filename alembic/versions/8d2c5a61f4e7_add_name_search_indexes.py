@@ -0,0 +1,80 @@
+"""add name search indexes
+
+Revision ID: 8d2c5a61f4e7
+Revises: 3b7e1f0a9c24
+Create Date: 2026-10-18 11:40:52.104377
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2c5a61f4e7"
+down_revision: Union[str, None] = "3b7e1f0a9c24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCHABLE = ("tasks", "projects")
+
+
+def _sqlite_upgrade(table: str) -> None:
+    fts = f"{table}_fts"
+    op.execute(
+        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+        f"name, content='{table}', content_rowid='rowid', tokenize='trigram')"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, name) VALUES (new.rowid, new.name); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, name) "
+        f"VALUES ('delete', old.rowid, old.name); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF name ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, name) "
+        f"VALUES ('delete', old.rowid, old.name); "
+        f"INSERT INTO {fts}(rowid, name) VALUES (new.rowid, new.name); END"
+    )
+    # index the rows that already exist
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for table in SEARCHABLE:
+            _sqlite_upgrade(table)
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in SEARCHABLE:
+        op.create_index(
+            f"ix_{table}_name_trgm",
+            table,
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for table in SEARCHABLE:
+            fts = f"{table}_fts"
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
+        return
+
+    for table in SEARCHABLE:
+        op.drop_index(f"ix_{table}_name_trgm", table_name=table)
+    # pg_trgm is left installed: other schemas may rely on it
@@ -0,0 +1,39 @@
+"""add sort indexes
+
+Revision ID: 9a4c2e7d1b35
+Revises: 5e8a1d3f7c62
+Create Date: 2026-10-18 23:05:41.207713
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4c2e7d1b35"
+down_revision: Union[str, None] = "5e8a1d3f7c62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_users_updated_at_id", "users", ["updated_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_projects_updated_at_id", "projects", ["updated_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_tasks_updated_at_id", "tasks", ["updated_at", "id"], unique=False
+    )
+    op.create_index("ix_tasks_deadline_id", "tasks", ["deadline", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_deadline_id", table_name="tasks")
+    op.drop_index("ix_tasks_updated_at_id", table_name="tasks")
+    op.drop_index("ix_projects_updated_at_id", table_name="projects")
+    op.drop_index("ix_users_updated_at_id", table_name="users")
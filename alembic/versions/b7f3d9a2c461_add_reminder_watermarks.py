@@ -0,0 +1,35 @@
+"""add reminder watermarks
+
+Revision ID: b7f3d9a2c461
+Revises: 9a4c2e7d1b35
+Create Date: 2026-10-19 09:12:55.830417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b7f3d9a2c461"
+down_revision: Union[str, None] = "9a4c2e7d1b35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "reminder_watermarks",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("deadline", sa.Date(), nullable=False),
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("reminder_watermarks")
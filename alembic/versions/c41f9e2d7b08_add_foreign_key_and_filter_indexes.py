@@ -0,0 +1,43 @@
+"""add foreign key and filter indexes
+
+Revision ID: c41f9e2d7b08
+Revises: 8d2c5a61f4e7
+Create Date: 2026-10-18 13:15:37.662910
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c41f9e2d7b08"
+down_revision: Union[str, None] = "8d2c5a61f4e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f("ix_projects_owner_id"), "projects", ["owner_id"], unique=False
+    )
+    op.create_index(
+        "ix_tasks_owner_id_complete_deadline",
+        "tasks",
+        ["owner_id", "complete", "deadline"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tasks_project_id_complete",
+        "tasks",
+        ["project_id", "complete"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_project_id_complete", table_name="tasks")
+    op.drop_index("ix_tasks_owner_id_complete_deadline", table_name="tasks")
+    op.drop_index(op.f("ix_projects_owner_id"), table_name="projects")
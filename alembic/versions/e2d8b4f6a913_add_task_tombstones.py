@@ -0,0 +1,72 @@
+"""add task tombstones
+
+Revision ID: e2d8b4f6a913
+Revises: b7f3d9a2c461
+Create Date: 2026-10-19 14:37:08.512934
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e2d8b4f6a913"
+down_revision: Union[str, None] = "b7f3d9a2c461"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_tombstones",
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("owner_id", sa.UUID(), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=True),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("task_id"),
+    )
+    op.create_index(
+        "ix_task_tombstones_deleted_at_task_id",
+        "task_tombstones",
+        ["deleted_at", "task_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_task_tombstones_owner_id_deleted_at_task_id",
+        "task_tombstones",
+        ["owner_id", "deleted_at", "task_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tasks_owner_id_updated_at_id",
+        "tasks",
+        ["owner_id", "updated_at", "id"],
+        unique=False,
+    )
+    # delta sync compares against updated_at: a new row must not predate its
+    # insert by up to a minute
+    op.alter_column("tasks", "updated_at", server_default=sa.text("now()"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "tasks",
+        "updated_at",
+        server_default=sa.text("date_trunc('minutes', now())"),
+    )
+    op.drop_index("ix_tasks_owner_id_updated_at_id", table_name="tasks")
+    op.drop_index(
+        "ix_task_tombstones_owner_id_deleted_at_task_id",
+        table_name="task_tombstones",
+    )
+    op.drop_index("ix_task_tombstones_deleted_at_task_id", table_name="task_tombstones")
+    op.drop_table("task_tombstones")
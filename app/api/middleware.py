@@ -0,0 +1,47 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import querybudget
+from app.core.metrics import RequestStats, current_request, route_metrics
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task hop): times each request,
+    keeps its status code and hands a ``RequestStats`` to the DB cursor hooks
+    through a context variable. Routes are labelled by their path template so
+    ids do not blow up the label space. Once the response is out the request's
+    statements are checked against the route's query budget.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path_format", None) or "unmatched"
+            route_metrics.record(scope["method"], path, status, elapsed, stats)
+
+        if route is not None:
+            querybudget.check(f"{scope['method']} {path}", route.endpoint, stats)
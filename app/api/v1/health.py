@@ -1,7 +1,12 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
+from app.core.cache import entity_cache
+from app.core.coalesce import single_flight
+from app.core.database import engine, pool_stats
+from app.core.events import change_feed
 from app.core.deps import get_db
+from app.tasks.reminders import reminder_scheduler
 
 router = APIRouter(tags=["meta"])
 
@@ -11,3 +16,33 @@ async def health(db: AsyncSession = Depends(get_db)):
     # quick “SELECT 1” round-trip
     await db.execute(text("SELECT 1"))
     return {"status": "ok"}
+
+
+@router.get("/health/cache")
+async def cache_stats():
+    # hit/miss/eviction counters of the in-process entity cache
+    return entity_cache.stats()
+
+
+@router.get("/health/pool")
+async def connection_pool_stats():
+    # checked-out/overflow connections and checkout wait-time histogram
+    return pool_stats(engine)
+
+
+@router.get("/health/reminders")
+async def reminder_stats():
+    # deadline reminder queue, throughput, delivery lag and watermark
+    return reminder_scheduler.stats()
+
+
+@router.get("/health/events")
+async def event_stats():
+    # SSE subscribers, published/delivered events and slow-consumer evictions
+    return change_feed.stats()
+
+
+@router.get("/health/coalescing")
+async def coalescing_stats():
+    # single-flight leaders and requests collapsed onto them, per route
+    return single_flight.stats()
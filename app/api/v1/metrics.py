@@ -0,0 +1,56 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.cache import entity_cache
+from app.core.database import engine, pool_stats
+from app.core.coalesce import single_flight
+from app.core.events import change_feed
+from app.core.metrics import render_prometheus
+from app.core.security import hasher
+from app.tasks.reminders import reminder_scheduler
+from app.tasks.tombstones import tombstone_compactor
+
+router = APIRouter(tags=["meta"])
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _process_metrics() -> tuple[dict[str, float], dict[str, float]]:
+    cache = entity_cache.stats()
+    pool = pool_stats(engine)
+    reminders = reminder_scheduler.stats()
+    events = change_feed.stats()
+    coalescing = single_flight.stats()
+    counters = {
+        "entity_cache_hits_total": cache["hits"],
+        "entity_cache_misses_total": cache["misses"],
+        "entity_cache_evictions_total": cache["evictions"],
+        "reminders_sent_total": reminders["sent"],
+        "reminders_dropped_total": reminders["dropped"],
+        "reminder_sink_errors_total": reminders["sink_errors"],
+        "sse_events_published_total": events["published"],
+        "sse_events_delivered_total": events["delivered"],
+        "sse_subscribers_evicted_total": events["evicted"],
+        "task_tombstones_compacted_total": tombstone_compactor.compacted,
+        "coalesce_leaders_total": coalescing["leaders"],
+        "requests_coalesced_total": coalescing["collapsed"],
+    }
+    gauges = {
+        "entity_cache_entries": cache["size"],
+        "password_hash_queued": hasher.stats()["queued"],
+        "reminders_queued": reminders["queued"],
+        "sse_subscribers": events["subscribers"],
+        "coalesce_in_flight": coalescing["in_flight"],
+    }
+    if "checked_out" in pool:
+        gauges["db_pool_checked_out"] = pool["checked_out"]
+        gauges["db_pool_overflow"] = pool["overflow"]
+    return gauges, counters
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    gauges, counters = _process_metrics()
+    return PlainTextResponse(
+        render_prometheus(gauges, counters), media_type=PROMETHEUS_MEDIA_TYPE
+    )
@@ -0,0 +1,339 @@
+"""
+Generate a synthetic users/projects/tasks dataset and bulk-load it.
+
+    python -m app.cli.load_dataset --users 100000 [--seed 0] [--db-url URL]
+
+Rows are produced by ``generate`` from a seeded RNG – the same arguments
+(``--today`` included) always give the same rows, ids and timestamps – and
+written in batches: ``COPY`` (asyncpg ``copy_records_to_table``) on
+PostgreSQL, multi-row ``INSERT ... VALUES (...), (...)`` on SQLite and the
+driver's ``executemany`` on anything else. Parents
+are always written before the tasks that reference them, so memory stays at
+one batch per table however large the dataset.
+
+Shape of the data:
+
+* projects per user and tasks per project follow an exponential
+  distribution around the given means – most users have a few, some many;
+* ``--loose-tasks-per-user`` tasks (mean) belong to no project;
+* 20% of tasks have no deadline, the rest are due 1-90 days after creation
+  (mode two weeks);
+* open tasks are completed with ``--complete-ratio``; of the tasks whose
+  deadline has passed only ``--overdue-ratio`` are still open.
+
+Every user gets the password ``--password`` (hashed once).
+"""
+
+import argparse
+import asyncio
+import datetime
+import random
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Iterator
+from uuid import UUID
+
+from sqlalchemy import Table, insert
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base
+from app.core.security import get_password_hash, hasher
+from app.projects.models import Project
+from app.tasks.models import Task
+from app.users.models import User
+
+Row = dict[str, Any]
+
+# SQLITE_MAX_VARIABLE_NUMBER default; 999 before 3.32
+SQLITE_MAX_VARIABLES = 32_766 if sqlite3.sqlite_version_info >= (3, 32) else 999
+_SQLITE = sqlite.dialect()
+
+FIRST_NAMES = ("Ana", "Ben", "Chen", "Dara", "Eli", "Fatima", "Goran", "Hana")
+LAST_NAMES = ("Novak", "Smith", "Ito", "Garcia", "Kowalski", "Okafor", "Berg")
+WORDS = (
+    "api", "backlog", "billing", "client", "design", "docs", "infra", "launch",
+    "migration", "mobile", "onboarding", "release", "research", "review",
+    "search", "security", "sprint", "support", "testing", "website",
+)  # fmt: skip
+VERBS = ("Fix", "Write", "Review", "Plan", "Ship", "Update", "Test", "Draft")
+
+
+def seeded_uuid(rng: random.Random) -> UUID:
+    """A version-4 UUID drawn from ``rng``, safe to store in SQLite."""
+    # SQLite gives the UUID column NUMERIC affinity: a hex string of only
+    # digits and one "e" would be stored (and read back) as a float
+    while True:
+        id_ = UUID(int=rng.getrandbits(128), version=4)
+        if not set(id_.hex) <= set("0123456789e"):
+            return id_
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    users: int
+    projects_per_user: float = 3.0
+    tasks_per_project: float = 20.0
+    loose_tasks_per_user: float = 5.0
+    complete_ratio: float = 0.3
+    overdue_ratio: float = 0.15
+    seed: int = 0
+    today: datetime.date = field(default_factory=datetime.date.today)
+
+
+class Generator:
+    """Deterministic row source for a ``DatasetSpec``."""
+
+    def __init__(self, spec: DatasetSpec, hashed_pass: str) -> None:
+        self.spec = spec
+        self.hashed_pass = hashed_pass
+        self.rng = random.Random(spec.seed)
+        self.now = datetime.datetime.combine(
+            spec.today, datetime.time(12), tzinfo=datetime.timezone.utc
+        )
+
+    def uuid(self) -> UUID:
+        return seeded_uuid(self.rng)
+
+    def fanout(self, mean: float) -> int:
+        return round(self.rng.expovariate(1 / mean)) if mean > 0 else 0
+
+    def since(self, start: datetime.datetime) -> datetime.datetime:
+        """A moment between ``start`` and now."""
+        span = (self.now - start).total_seconds()
+        return start + datetime.timedelta(seconds=self.rng.uniform(0, span))
+
+    def user(self, n: int) -> Row:
+        created = self.now - datetime.timedelta(days=self.rng.uniform(0, 730))
+        return {
+            "id": self.uuid(),
+            "email": f"user{n}.s{self.spec.seed}@example.com",
+            "full_name": f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
+            "hashed_pass": self.hashed_pass,
+            "is_active": self.rng.random() < 0.95,
+            "created_at": created,
+            "updated_at": self.since(created),
+        }
+
+    def project(self, owner: Row) -> Row:
+        created = self.since(owner["created_at"])
+        name = " ".join(self.rng.sample(WORDS, 2)).capitalize()
+        return {
+            "id": self.uuid(),
+            "name": name,
+            "description": f"{name} work for {owner['full_name']}",
+            "owner_id": owner["id"],
+            "created_at": created,
+            "updated_at": self.since(created),
+        }
+
+    def task(self, owner: Row, project: Row | None) -> Row:
+        created = self.since((project or owner)["created_at"])
+        deadline = None
+        if self.rng.random() >= 0.2:
+            days = round(self.rng.triangular(1, 90, 14))
+            deadline = created.date() + datetime.timedelta(days=days)
+        if deadline is not None and deadline < self.spec.today:
+            complete = self.rng.random() >= self.spec.overdue_ratio
+        else:
+            complete = self.rng.random() < self.spec.complete_ratio
+        return {
+            "id": self.uuid(),
+            "name": f"{self.rng.choice(VERBS)} {self.rng.choice(WORDS)}",
+            "description": None if self.rng.random() < 0.3 else "Generated task",
+            "deadline": deadline,
+            "complete": complete,
+            "owner_id": owner["id"],
+            "project_id": project["id"] if project else None,
+            "created_at": created,
+            "updated_at": self.since(created),
+        }
+
+    def rows(self) -> Iterator[tuple[Table, Row]]:
+        """``(table, row)`` pairs; each row follows the rows it references."""
+        spec = self.spec
+        for n in range(spec.users):
+            owner = self.user(n)
+            yield User.__table__, owner
+            for _ in range(self.fanout(spec.projects_per_user)):
+                project = self.project(owner)
+                tasks = [
+                    self.task(owner, project)
+                    for _ in range(self.fanout(spec.tasks_per_project))
+                ]
+                project["task_count"] = len(tasks)
+                project["completed_count"] = sum(t["complete"] for t in tasks)
+                yield Project.__table__, project
+                for task in tasks:
+                    yield Task.__table__, task
+            for _ in range(self.fanout(spec.loose_tasks_per_user)):
+                yield Task.__table__, self.task(owner, None)
+
+
+def generate(spec: DatasetSpec, hashed_pass: str) -> Iterator[tuple[Table, Row]]:
+    return Generator(spec, hashed_pass).rows()
+
+
+@lru_cache(maxsize=32)
+def _sqlite_multirow_sql(table: Table, columns: tuple[str, ...], n_rows: int) -> str:
+    """
+    ``INSERT ... VALUES (?, ...), (?, ...)`` for ``n_rows`` rows. Written by
+    hand: SQLAlchemy does not cache compiled multi-VALUES statements, and
+    compiling 30k bind parameters per batch costs more than the insert itself.
+    """
+    quote = _SQLITE.identifier_preparer.quote
+    row = "(" + ", ".join("?" * len(columns)) + ")"
+    return (
+        f"INSERT INTO {quote(table.name)} ({', '.join(map(quote, columns))}) "
+        f"VALUES {', '.join([row] * n_rows)}"
+    )
+
+
+class BulkLoader:
+    """
+    Buffers rows per table and writes them a batch at a time, parents first.
+    Counts rows and write time per table in ``rows`` / ``seconds``.
+    """
+
+    order = (User.__table__, Project.__table__, Task.__table__)
+
+    def __init__(self, conn: AsyncConnection, batch_size: int = 5_000) -> None:
+        self.conn = conn
+        self.batch_size = batch_size
+        self.use_copy = conn.dialect.driver == "asyncpg"
+        self.buffers: dict[Table, list[Row]] = {t: [] for t in self.order}
+        self.rows: dict[str, int] = {t.name: 0 for t in self.order}
+        self.seconds: dict[str, float] = {t.name: 0.0 for t in self.order}
+
+    async def add(self, table: Table, row: Row) -> None:
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        for table in self.order:  # FK order
+            rows = self.buffers[table]
+            if not rows:
+                continue
+            start = time.perf_counter()
+            if self.use_copy:
+                await self._copy(table, rows)
+            else:
+                await self._insert(table, rows)
+            self.seconds[table.name] += time.perf_counter() - start
+            self.rows[table.name] += len(rows)
+            rows.clear()
+
+    async def _copy(self, table: Table, rows: list[Row]) -> None:
+        columns = list(rows[0])
+        raw = await self.conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name,
+            records=[tuple(row[c] for c in columns) for row in rows],
+            columns=columns,
+        )
+
+    async def _insert(self, table: Table, rows: list[Row]) -> None:
+        if self.conn.dialect.name != "sqlite":
+            await self.conn.execute(insert(table), rows)  # driver executemany
+            return
+        columns = tuple(rows[0])
+        dialect = self.conn.dialect
+        processors = [
+            table.c[c].type.dialect_impl(dialect).bind_processor(dialect)
+            for c in columns
+        ]
+        per_statement = SQLITE_MAX_VARIABLES // len(columns)
+        for start in range(0, len(rows), per_statement):
+            chunk = rows[start : start + per_statement]
+            params = tuple(
+                proc(row[c]) if proc else row[c]
+                for row in chunk
+                for c, proc in zip(columns, processors)
+            )
+            sql = _sqlite_multirow_sql(table, columns, len(chunk))
+            await self.conn.exec_driver_sql(sql, params)
+
+
+async def load(
+    conn: AsyncConnection, rows: Iterator[tuple[Table, Row]], batch_size: int
+) -> BulkLoader:
+    loader = BulkLoader(conn, batch_size)
+    if loader.use_copy:
+        # the COPYs go straight to the driver; this statement opens the
+        # transaction they then join (and skips the WAL flush per batch)
+        await conn.exec_driver_sql("SET LOCAL synchronous_commit TO OFF")
+    for table, row in rows:
+        await loader.add(table, row)
+    await loader.flush()
+    return loader
+
+
+def _report(loader: BulkLoader, elapsed: float) -> None:
+    for name, n in loader.rows.items():
+        seconds = loader.seconds[name]
+        rate = n / seconds if seconds else 0.0
+        print(f"{name:>10}: {n:>12,} rows  {seconds:8.2f}s  {rate:>12,.0f} rows/s")
+    total = sum(loader.rows.values())
+    print(
+        f"{'total':>10}: {total:>12,} rows  {elapsed:8.2f}s  {total / elapsed:>12,.0f} rows/s"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    spec = DatasetSpec(
+        users=args.users,
+        projects_per_user=args.projects_per_user,
+        tasks_per_project=args.tasks_per_project,
+        loose_tasks_per_user=args.loose_tasks_per_user,
+        complete_ratio=args.complete_ratio,
+        overdue_ratio=args.overdue_ratio,
+        seed=args.seed,
+        today=args.today or datetime.date.today(),
+    )
+    engine = create_async_engine(args.db_url)
+    try:
+        if args.create_schema:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+        hashed_pass = await get_password_hash(args.password)
+        start = time.perf_counter()
+        async with engine.begin() as conn:  # one transaction: all or nothing
+            loader = await load(conn, generate(spec, hashed_pass), args.batch_size)
+        _report(loader, time.perf_counter() - start)
+    finally:
+        hasher.shutdown()
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Bulk-load a synthetic users/projects/tasks dataset."
+    )
+    parser.add_argument("--users", type=int, required=True)
+    parser.add_argument("--projects-per-user", type=float, default=3.0)
+    parser.add_argument("--tasks-per-project", type=float, default=20.0)
+    parser.add_argument("--loose-tasks-per-user", type=float, default=5.0)
+    parser.add_argument("--complete-ratio", type=float, default=0.3)
+    parser.add_argument("--overdue-ratio", type=float, default=0.15)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--today",
+        type=datetime.date.fromisoformat,
+        help="reference date (YYYY-MM-DD) for timestamps and deadlines",
+    )
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--db-url", default=settings.db_url)
+    parser.add_argument(
+        "--create-schema", action="store_true", help="create missing tables first"
+    )
+    asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Rebuild ``Project.task_count`` / ``completed_count`` from the tasks table.
+
+    python -m app.cli.reconcile_counters [--batch-size 1000] [--db-url URL]
+
+Runs one short transaction per batch of projects, so it can run against a
+live database; prints how many projects were checked and corrected.
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.projects.counters import reconcile
+from app.users.models import User  # noqa: F401 – registers the mapper
+
+
+async def _main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.db_url)
+    try:
+        start = time.perf_counter()
+        checked, fixed = await reconcile(
+            async_sessionmaker(engine, expire_on_commit=False), args.batch_size
+        )
+        elapsed = time.perf_counter() - start
+        print(f"checked {checked:,} projects, corrected {fixed:,} in {elapsed:.2f}s")
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Rebuild the denormalized project task counters."
+    )
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--db-url", default=settings.db_url)
+    asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+In-process read-through cache for single-entity lookups.
+
+``LRUTTLCache`` is a bounded mapping: entries expire ``ttl`` seconds after they
+were written and the least recently used one is evicted once ``max_entries``
+is reached. Anything implementing ``CacheBackend`` can replace it.
+
+``EntityCache`` stores a snapshot of an ORM object's *column* values, never the
+object itself: a hit re-attaches a fresh instance to the caller's session
+without a SELECT. Relationships are not cached – reads with ``?expand=`` go to
+the database. Only read routes use it; a write route loads its target from the
+primary (``get(..., cached=False)``), since a snapshot may be stale.
+
+Writers invalidate explicitly after committing. A global version counter
+closes the read/write race: a snapshot read before an invalidation is not
+stored. The cache is per process, so other workers may serve an entry for up
+to ``ttl`` seconds after a write.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Protocol, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Select, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from app.core.config import settings
+
+M = TypeVar("M")
+
+
+class CacheBackend(Protocol):
+    def get(self, key: Hashable) -> Any | None: ...
+
+    def set(self, key: Hashable, value: Any) -> None: ...
+
+    def delete(self, key: Hashable) -> None: ...
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> int: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict[str, int]: ...
+
+
+class LRUTTLCache:
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        doomed = [
+            key for key, (_, value) in self._data.items() if predicate(key, value)
+        ]
+        for key in doomed:
+            del self._data[key]
+        return len(doomed)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class EntityCache:
+    def __init__(self, backend: CacheBackend, enabled: bool = True) -> None:
+        self.backend = backend
+        self.enabled = enabled
+        self._version = 0
+
+    @staticmethod
+    def _key(model: type, id_: UUID) -> tuple[str, UUID]:
+        return (model.__name__, id_)
+
+    def _attach(self, db: AsyncSession, model: type[M], values: dict) -> M:
+        obj = model(**values)
+        make_transient_to_detached(obj)  # as if just loaded, no pending changes
+        db.add(obj)
+        return obj
+
+    async def get_or_load(
+        self, db: AsyncSession, model: type[M], id_: UUID, stmt: Select
+    ) -> M | None:
+        """Return the cached ``model`` row ``id_`` or run ``stmt`` to fetch it."""
+        if not self.enabled:
+            return (await db.execute(stmt)).scalar_one_or_none()
+
+        # the session's own copy wins; it may hold newer, uncommitted state
+        if identity_key(model, id_) not in db.identity_map:
+            values = self.backend.get(self._key(model, id_))
+            if values is not None:
+                return self._attach(db, model, values)
+
+        version = self._version
+        obj = (await db.execute(stmt)).scalar_one_or_none()
+        # replica rows may lag behind an invalidation that already happened
+        from_primary = not db.info.get("replica", False)
+        if obj is not None and from_primary and version == self._version:
+            columns = inspect(model).column_attrs
+            self.backend.set(
+                self._key(model, id_), {c.key: getattr(obj, c.key) for c in columns}
+            )
+        return obj
+
+    def invalidate(self, model: type, *ids: UUID | None) -> None:
+        self._version += 1
+        for id_ in ids:
+            if id_ is not None:
+                self.backend.delete(self._key(model, id_))
+
+    def invalidate_where(self, model: type, column: str, value: Any) -> int:
+        """Drop every cached ``model`` whose ``column`` equals ``value``."""
+        self._version += 1
+        name = model.__name__
+        return self.backend.delete_where(
+            lambda key, values: key[0] == name and values.get(column) == value
+        )
+
+    def clear(self) -> None:
+        self._version += 1
+        self.backend.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self.backend.stats()
+
+
+entity_cache = EntityCache(
+    LRUTTLCache(
+        max_entries=settings.entity_cache_max_entries,
+        ttl=settings.entity_cache_ttl_seconds,
+    ),
+    enabled=settings.entity_cache_enabled,
+)
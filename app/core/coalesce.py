@@ -0,0 +1,153 @@
+"""
+Single-flight coalescing of identical concurrent reads.
+
+A route opts in with ``@coalesce()`` under its ``@router.get`` and a router
+built with ``route_class=CoalescingRoute``::
+
+    router = APIRouter(prefix="/projects", route_class=CoalescingRoute)
+
+    @router.get("/{project_id}")
+    @query_budget(3)
+    @coalesce()
+    async def get_project(...): ...
+
+While one request for a key is being handled, later requests with the same
+key wait for it instead of running the route themselves: the dependencies,
+the queries and the serialization run once, and every waiter gets a copy of
+the finished response that shares its body bytes. Followers never touch their
+session, so they do not check out a connection either. Errors are shared the
+same way.
+
+The default key (``request_key``) is the method, path, query string and the
+headers that change a read's outcome (``If-None-Match``, ``Authorization``);
+pass ``key=`` to narrow or widen it. A key function returning ``None`` opts
+that request out – the default does so for clients inside their
+read-your-writes window, which must not join a read that began before their
+write. ``COALESCE_ENABLED=false`` turns coalescing off everywhere.
+
+Only routes returning a buffered ``Response`` (not a stream) may opt in.
+The shared run is a task of its own, so a leader whose client disconnects
+does not cancel it under the followers. Coalescing is per worker process.
+"""
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+from app.core.replica import recently_wrote
+
+F = TypeVar("F", bound=Callable[..., Any])
+T = TypeVar("T")
+
+KeyFunc = Callable[[Request], Hashable | None]
+
+
+def request_key(request: Request) -> Hashable | None:
+    """Method, path, query and the headers that change the response."""
+    if recently_wrote(request):
+        return None
+    return (
+        request.method,
+        request.url.path,
+        request.url.query,
+        request.headers.get("if-none-match"),
+        request.headers.get("authorization"),
+    )
+
+
+@dataclass(frozen=True)
+class Coalesce:
+    key: KeyFunc = request_key
+
+
+def coalesce(key: KeyFunc = request_key) -> Callable[[F], F]:
+    """Opt a route handler into coalescing (needs a ``CoalescingRoute`` router)."""
+
+    def decorate(fn: F) -> F:
+        fn.__coalesce__ = Coalesce(key)  # type: ignore[attr-defined]
+        return fn
+
+    return decorate
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.leaders: Counter[str] = Counter()
+        self.collapsed: Counter[str] = Counter()
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable[T]], label: str = ""
+    ) -> tuple[T, bool]:
+        """
+        ``fn()``'s result, run once per concurrent ``key``; the flag is True
+        for callers that joined a run already in flight.
+        """
+        flight = self._inflight.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = asyncio.ensure_future(fn())
+            self._inflight[key] = flight
+            flight.add_done_callback(lambda done: self._land(key, done))
+            self.leaders[label] += 1
+        else:
+            self.collapsed[label] += 1
+        return await asyncio.shield(flight), shared
+
+    def _land(self, key: Hashable, flight: asyncio.Future) -> None:
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        if not flight.cancelled():
+            flight.exception()  # retrieved, even if every waiter went away
+
+    def stats(self) -> dict:
+        routes = sorted(self.leaders.keys() | self.collapsed.keys())
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": sum(self.leaders.values()),
+            "collapsed": sum(self.collapsed.values()),
+            "routes": {
+                route: {
+                    "leaders": self.leaders[route],
+                    "collapsed": self.collapsed[route],
+                }
+                for route in routes
+            },
+        }
+
+
+single_flight = SingleFlight()
+
+
+def _replay(response: Response) -> Response:
+    """A fresh response with the same status, headers and body bytes."""
+    clone = Response(response.body, status_code=response.status_code)
+    clone.raw_headers = list(response.raw_headers)
+    return clone
+
+
+class CoalescingRoute(APIRoute):
+    """Runs the handlers marked with ``@coalesce`` through ``single_flight``."""
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        handler = super().get_route_handler()
+        policy: Coalesce | None = getattr(self.endpoint, "__coalesce__", None)
+        if policy is None:
+            return handler
+        label = f"{','.join(sorted(self.methods))} {self.path_format}"
+
+        async def coalesced(request: Request) -> Response:
+            key = policy.key(request) if settings.coalesce_enabled else None
+            if key is None:
+                return await handler(request)
+            response, shared = await single_flight.do(
+                key, lambda: handler(request), label
+            )
+            return _replay(response) if shared else response
+
+        return coalesced
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,8 +7,81 @@ class Settings(BaseSettings):
     # env vars picked up from .env in dev or real env in prod
     db_url: str = "postgresql+asyncpg://user:admin@db:5432/tasks"
     secret_key: str
+
+    # connection pool, per worker process (see app.core.database)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_pre_ping: bool = False
+    db_pool_recycle: int = -1  # seconds, -1 = never
+    db_pool_warmup: int | None = None  # connections opened at startup; None = size
+    # asyncpg prepared statements kept per connection; 0 behind pgbouncer
+    db_statement_cache_size: int = 100
+
+    # SQL statements per request (see app.core.querybudget)
+    query_budget_mode: Literal["off", "warn", "raise"] = "warn"
+    query_budget_default: int | None = None  # for routes without @query_budget
+    n_plus_one_threshold: int = 5  # same SELECT shape more often than this
+
+    # optional read replica for GET routes (see app.core.replica)
+    db_replica_url: str | None = None
+    read_your_writes_seconds: float = 5.0
+    replica_recheck_seconds: float = 5.0
     access_token_expire_minutes: int = 30
 
+    # list endpoints (keyset pagination)
+    page_size_default: int = 50
+    page_size_max: int = 500
+
+    # name search (see app.core.search)
+    search_limit_default: int = 20
+    search_limit_max: int = 100
+
+    # largest payload accepted by bulk endpoints
+    bulk_max_items: int = 10_000
+
+    # rows fetched per round trip when streaming exports
+    export_batch_size: int = 1000
+
+    # password hashing (see app.core.security); raising the cost rehashes
+    # stored passwords on their next successful verify
+    password_hash_rounds: int = 12
+    password_hash_pool: Literal["thread", "process"] = "thread"
+    password_hash_workers: int = 4
+    password_hash_max_concurrency: int | None = None  # defaults to workers
+
+    # read-through cache for single-entity lookups (see app.core.cache)
+    entity_cache_enabled: bool = True
+    entity_cache_max_entries: int = 10_000
+    entity_cache_ttl_seconds: float = 30.0
+
+    # deadline reminders (see app.tasks.reminders): off by default, enable them
+    # in exactly one process per database
+    reminders_enabled: bool = False
+    reminder_lead_days: int = 1  # remind at 00:00 UTC this many days before
+    reminder_lookahead_seconds: float = 3600.0  # queue reminders due this soon
+    reminder_scan_interval_seconds: float = 60.0
+    reminder_batch_size: int = 500
+    reminder_max_queued: int = 50_000
+    reminder_sink: str = "app.tasks.reminders:LogSink"
+
+    # SSE change feed (see app.core.events): events buffered per subscriber
+    # before it is evicted, and the idle keep-alive interval
+    sse_queue_size: int = 256
+    sse_keepalive_seconds: float = 15.0
+
+    # single-flight coalescing of identical concurrent reads on the routes
+    # marked with @coalesce (see app.core.coalesce)
+    coalesce_enabled: bool = True
+
+    # delta sync (GET /tasks/changes, see app.tasks.tombstones): changes newer
+    # than the settle window wait for the next sync, so it must exceed the
+    # longest write transaction; tombstones are kept for the retention period
+    sync_settle_seconds: float = 5.0
+    tombstone_retention_days: int = 30
+    tombstone_compact_interval_seconds: float = 3600.0
+    tombstone_compact_batch_size: int = 10_000
+
     model_config = SettingsConfigDict(
         env_file=str(Path(__file__).resolve().parents[2] / ".env"),
         extra="ignore",
@@ -1,10 +1,111 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+import asyncio
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
 from app.core.config import settings
+from app.core.metrics import Histogram, current_request
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_time.observe(time.perf_counter() - start)
+
+
+# the start time lives on the statement's execution context, which is dropped
+# with it, so a statement that raises leaves nothing behind on the connection
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    stats = current_request.get()
+    if stats is not None:
+        stats.note(statement, elapsed)
 
-engine = create_async_engine(settings.db_url, echo=False)
+
+def instrument(engine: AsyncEngine) -> None:
+    """Attribute statement count and time to the request being served."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def build_engine(db_url: str) -> AsyncEngine:
+    """Create the async engine with the pool settings from ``Settings``."""
+    url = make_url(db_url)
+    kwargs: dict = {
+        "echo": False,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    # in-memory SQLite lives in a single connection (StaticPool): nothing to size
+    if url.get_backend_name() != "sqlite" or url.database not in (None, "", ":memory:"):
+        kwargs.update(
+            poolclass=TimedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    if url.get_driver_name() == "asyncpg":
+        kwargs["connect_args"] = {
+            "prepared_statement_cache_size": settings.db_statement_cache_size
+        }
+    engine = create_async_engine(url, **kwargs)
+    instrument(engine)
+    return engine
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> None:
+    """Open ``connections`` up front so the first requests skip the handshake."""
+    if connections <= 0:
+        return
+    conns = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections))
+    )
+    await asyncio.gather(*(conn.close() for conn in conns))
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.sync_engine.pool
+    stats: dict = {"status": pool.status()}
+    if isinstance(pool, TimedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            wait_seconds=pool.wait_time.snapshot(),
+        )
+    return stats
+
+
+engine = build_engine(settings.db_url)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
+replica_engine = (
+    build_engine(settings.db_replica_url) if settings.db_replica_url else None
+)
+ReplicaSessionLocal = (
+    async_sessionmaker(replica_engine, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
 
 class Base(DeclarativeBase):
     pass
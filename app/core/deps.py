@@ -1,9 +1,49 @@
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession
 
+from fastapi import Request
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import replica
 from app.core.database import AsyncSessionLocal
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only routes: the replica when one is configured and
+    healthy and the client has not written recently, the primary otherwise.
+    A DBAPI error on the replica fails this request and sends the following
+    ones to the primary; the read itself is not retried.
+    """
+    router = replica.read_router
+    factory, on_replica = await router.factory_for(request)
+    async with factory() as session:
+        session.info["replica"] = on_replica
+        try:
+            yield session
+        except DBAPIError:
+            if on_replica:
+                router.mark_unhealthy()  # the next reads go to the primary
+            raise
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    For work that outlives the request scope (e.g. streamed bodies): FastAPI
+    closes ``get_db`` sessions before a StreamingResponse is iterated, so such
+    generators open their own session from this factory.
+    """
+    return AsyncSessionLocal
+
+
+async def get_read_session_factory(
+    request: Request,
+) -> async_sessionmaker[AsyncSession]:
+    """``get_session_factory`` for read-only streams; routed like ``get_read_db``."""
+    factory, _ = await replica.read_router.factory_for(request)
+    return factory
@@ -0,0 +1,75 @@
+"""
+Strong ETags for single-resource reads.
+
+A tag hashes the resource kind, its id, the requested representation
+(``?fields=`` / ``?expand=``) and a *version* tuple: the row's ``updated_at``
+plus ``(count, max(updated_at))`` for every expanded child collection. The
+crud modules can compute the same version either with one cheap SELECT
+(``version()``, used to answer ``If-None-Match`` with 304 before anything is
+hydrated) or from already loaded objects (``version_of()``, used to tag a 200).
+
+``If-Match`` is checked against the row read from the primary with
+``FOR UPDATE`` (``get(..., lock=True)``), never against a cached snapshot: the
+lock holds until the write commits, so no other writer can change the version
+in between.
+"""
+
+import hashlib
+from typing import Any, Iterable
+from uuid import UUID
+
+from fastapi import Response, status
+from sqlalchemy import func, select
+
+from app.core.exceptions import PreconditionFailedError
+from app.core.fieldsets import FieldSelection
+
+
+def compute(
+    kind: str,
+    id_: UUID,
+    version: tuple,
+    selection: FieldSelection = FieldSelection(),
+) -> str:
+    fields = sorted(selection.fields) if selection.fields is not None else None
+    parts = (kind, str(id_), version, fields, sorted(selection.expand))
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def child_version_columns(child_model: Any, *where: Any) -> list:
+    """Correlated ``count(*)`` and ``max(updated_at)`` over a child collection."""
+    return [
+        select(func.count()).select_from(child_model).where(*where).scalar_subquery(),
+        select(func.max(child_model.updated_at)).where(*where).scalar_subquery(),
+    ]
+
+
+def child_version(children: Iterable[Any]) -> list:
+    children = list(children)
+    return [len(children), max((c.updated_at for c in children), default=None)]
+
+
+def _tags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def none_match(header: str | None, etag: str) -> bool:
+    """``If-None-Match`` uses the weak comparison: ``W/`` prefixes are ignored."""
+    if header is None:
+        return False
+    tags = _tags(header)
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+def require_match(header: str | None, etag: str) -> None:
+    """Raise 412 unless ``If-Match`` is absent or strongly matches ``etag``."""
+    if header is None:
+        return
+    tags = _tags(header)
+    if "*" not in tags and etag not in tags:
+        raise PreconditionFailedError(ctx={"etag": etag})
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
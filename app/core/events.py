@@ -0,0 +1,168 @@
+"""
+In-process change feed, streamed as Server-Sent Events.
+
+The crud layer publishes after every committed task/project write; the SSE
+routes (``GET /users/{id}/events``, ``GET /projects/{id}/events``) subscribe
+to one user's or project's topic and stream what arrives.
+
+An event is encoded once, when published, into a ready-to-send SSE frame; the
+same bytes go onto the queue of every matching subscriber, and nothing is
+encoded at all while a topic has no subscribers. Queues are bounded
+(``SSE_QUEUE_SIZE``): a subscriber that falls that far behind is evicted – its
+backlog is replaced by a single ``evicted`` frame and the stream ends, so the
+client reconnects and resyncs instead of the worker buffering for it. An idle
+subscriber costs one queue and one parked coroutine; a comment line every
+``SSE_KEEPALIVE_SECONDS`` keeps proxies from closing the connection.
+
+The broker is per worker process: a client sees the writes handled by the
+worker it is connected to.
+"""
+
+import asyncio
+import itertools
+from typing import Any, AsyncIterator, Iterable
+from uuid import UUID
+
+import pydantic_core
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.responses import adapter_for
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+Topic = tuple[str, UUID]
+
+EVICTED_FRAME = b'event: evicted\ndata: {"reason":"slow consumer"}\n\n'
+_KEEPALIVE_FRAME = b": keepalive\n\n"
+
+
+def user_topic(user_id: UUID) -> Topic:
+    return ("user", user_id)
+
+
+def project_topic(project_id: UUID) -> Topic:
+    return ("project", project_id)
+
+
+class Subscription:
+    __slots__ = ("topics", "queue")
+
+    def __init__(self, topics: tuple[Topic, ...], size: int) -> None:
+        self.topics = topics
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(size)
+
+
+class EventBroker:
+    def __init__(self, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self._topics: dict[Topic, set[Subscription]] = {}
+        self._subscribers = 0
+        self._seq = itertools.count(1)
+        self.published = self.delivered = self.evicted = 0
+
+    def subscribe(self, *topics: Topic) -> Subscription:
+        sub = Subscription(topics, self.queue_size)
+        for topic in topics:
+            self._topics.setdefault(topic, set()).add(sub)
+        self._subscribers += 1
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        removed = False
+        for topic in sub.topics:
+            subs = self._topics.get(topic)
+            if subs is not None and sub in subs:
+                removed = True
+                subs.discard(sub)
+                if not subs:
+                    del self._topics[topic]
+        self._subscribers -= removed
+
+    def publish(
+        self,
+        event: str,
+        id_: UUID,
+        topics: Iterable[Topic | None],
+        schema: Any = None,
+        data: Any = None,
+        **fields: Any,
+    ) -> None:
+        """
+        Queue ``event`` (e.g. ``"task.updated"``) for the subscribers of
+        ``topics``; ``data`` is serialized as ``schema`` if anyone listens.
+        """
+        self.published += 1
+        targets: set[Subscription] = set()
+        for topic in topics:
+            if topic is not None and topic[1] is not None:
+                targets.update(self._topics.get(topic, ()))
+        if not targets:
+            return
+        payload = {"type": event, "id": id_, **fields}
+        if schema is not None and data is not None:
+            adapter = adapter_for(schema)
+            payload["data"] = adapter.validate_python(data, from_attributes=True)
+        frame = (
+            f"id: {next(self._seq)}\nevent: {event}\ndata: ".encode()
+            + pydantic_core.to_json(payload)
+            + b"\n\n"
+        )
+        for sub in targets:
+            try:
+                sub.queue.put_nowait(frame)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                self._evict(sub)
+
+    def _evict(self, sub: Subscription) -> None:
+        self.unsubscribe(sub)
+        self.evicted += 1
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(EVICTED_FRAME)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "subscribers": self._subscribers,
+            "topics": len(self._topics),
+            "published": self.published,
+            "delivered": self.delivered,
+            "evicted": self.evicted,
+        }
+
+
+async def _frames(
+    broker: EventBroker, sub: Subscription, keepalive: float
+) -> AsyncIterator[bytes]:
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                # a timer handle, not the extra task wait_for() would wrap around get()
+                async with asyncio.timeout(keepalive):
+                    frame = await sub.queue.get()
+            except TimeoutError:
+                yield _KEEPALIVE_FRAME
+                continue
+            yield frame
+            if frame is EVICTED_FRAME:
+                return
+    finally:
+        broker.unsubscribe(sub)
+
+
+def event_stream(
+    *topics: Topic, broker: EventBroker | None = None
+) -> StreamingResponse:
+    """Subscribe now and stream the topics' events until the client leaves."""
+    broker = broker or change_feed
+    sub = broker.subscribe(*topics)
+    return StreamingResponse(
+        _frames(broker, sub, settings.sse_keepalive_seconds),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+change_feed = EventBroker(settings.sse_queue_size)
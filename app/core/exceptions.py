@@ -11,6 +11,8 @@ class ErrorCode(str, Enum):
     FORBIDDEN = "FORBIDDEN"
     BAD_REQUEST = "BAD_REQUEST"
     CONFLICT = "CONFLICT"
+    PRECONDITION_FAILED = "PRECONDITION_FAILED"
+    GONE = "GONE"
     UNAUTHORIZED = "UNAUTHORIZED"
     INTERNAL = "INTERNAL"  # fallback
 
@@ -93,3 +95,23 @@ class ConflictError(TaskTrackerError):
     code = ErrorCode.CONFLICT
     http_status = HTTPStatus.CONFLICT
     message = "Conflict with current state"
+
+
+class PreconditionFailedError(TaskTrackerError):
+    code = ErrorCode.PRECONDITION_FAILED
+    http_status = HTTPStatus.PRECONDITION_FAILED
+    message = "Resource has changed since it was last read"
+
+
+class GoneError(TaskTrackerError):
+    code = ErrorCode.GONE
+    http_status = HTTPStatus.GONE
+    message = "Resource is no longer available"
+
+
+class InvalidCursorError(BadRequestError):
+    message = "Pagination cursor is malformed or expired"
+
+
+class InvalidFieldSelectionError(BadRequestError):
+    message = "Unknown name in ?fields= or ?expand="
@@ -0,0 +1,117 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+from fastapi import Query, Response
+from pydantic import BaseModel, create_model
+
+from app.core.exceptions import InvalidFieldSelectionError
+from app.core.responses import dump_json
+
+
+@dataclass(frozen=True)
+class FieldSelection:
+    """Parsed ``?fields=`` / ``?expand=``; ``fields=None`` means every column."""
+
+    fields: frozenset[str] | None = None
+    expand: frozenset[str] = frozenset()
+
+
+def _parse_csv(raw: str | None, allowed: frozenset[str], param: str) -> frozenset[str]:
+    if not raw:
+        return frozenset()
+    names = frozenset(name.strip() for name in raw.split(",") if name.strip())
+    unknown = names - allowed
+    if unknown:
+        raise InvalidFieldSelectionError(
+            ctx={"param": param, "unknown": sorted(unknown), "allowed": sorted(allowed)}
+        )
+    return names
+
+
+class ExpandableSchema:
+    """
+    Response shape for a resource whose relationships are opt-in.
+
+    ``summary`` holds the plain columns, ``full`` adds the relationship lists.
+    Every field present in ``full`` but not in ``summary`` becomes an
+    ``?expand=`` option; the crud layer only issues the loader options for the
+    expanded names and the rendered JSON only contains what was asked for.
+    """
+
+    def __init__(self, summary: type[BaseModel], full: type[BaseModel]) -> None:
+        self.summary = summary
+        self.full = full
+        self.columns = frozenset(summary.model_fields)
+        self.expansions = frozenset(full.model_fields) - self.columns
+        self._models: dict[frozenset[str], type[BaseModel]] = {frozenset(): summary}
+
+    def model_for(self, expand: frozenset[str]) -> type[BaseModel]:
+        model = self._models.get(expand)
+        if model is None:
+            extra: dict[str, Any] = {
+                name: (self.full.model_fields[name].annotation, ...)
+                for name in sorted(expand)
+            }
+            model = create_model(  # type: ignore[call-overload]
+                f"{self.summary.__name__}[{','.join(sorted(expand))}]",
+                __base__=self.summary,
+                **extra,
+            )
+            self._models[expand] = model
+        return model
+
+    def params(self) -> Callable[..., FieldSelection]:
+        """FastAPI dependency parsing and validating the query parameters."""
+        columns, expansions = self.columns, self.expansions
+
+        def dependency(
+            fields: str | None = Query(
+                default=None,
+                description=f"Comma-separated subset of: {', '.join(sorted(columns))}",
+            ),
+            expand: str | None = Query(
+                default=None,
+                description=f"Relationships to embed: {', '.join(sorted(expansions))}",
+            ),
+        ) -> FieldSelection:
+            return FieldSelection(
+                fields=_parse_csv(fields, columns, "fields") or None,
+                expand=_parse_csv(expand, expansions, "expand"),
+            )
+
+        return dependency
+
+    def _include(self, selection: FieldSelection) -> set[str] | None:
+        if selection.fields is None:
+            return None
+        return {"id", *selection.fields, *selection.expand}
+
+    def render(
+        self, obj: Any, selection: FieldSelection, status_code: int = 200
+    ) -> Response:
+        model = self.model_for(selection.expand)
+        body = model.model_validate(obj).model_dump_json(
+            include=self._include(selection)
+        )
+        return Response(body, status_code=status_code, media_type="application/json")
+
+    def render_many(self, objs: Sequence[Any], selection: FieldSelection) -> Response:
+        model = self.model_for(selection.expand)
+        include = self._include(selection)
+        body = dump_json(
+            list[model],  # type: ignore[valid-type]
+            objs,
+            include=None if include is None else {"__all__": include},
+        )
+        return Response(body, media_type="application/json")
+
+    def render_page(
+        self, items: Sequence[Any], next_cursor: str | None, selection: FieldSelection
+    ) -> Response:
+        listing = self.render_many(items, selection).body
+        body = b'{"items":%s,"next_cursor":%s}' % (
+            listing,
+            json.dumps(next_cursor).encode(),
+        )
+        return Response(body, media_type="application/json")
@@ -0,0 +1,184 @@
+"""
+Minimal in-process metrics: histograms, per-route request/DB tallies and a
+Prometheus text renderer.
+
+Values live in the worker process that recorded them; nothing here is shared
+across workers. Recording is a few dict lookups and integer additions per
+request – no locks, no label objects.
+"""
+
+import bisect
+import re
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any, Sequence
+
+# seconds; fine-grained at the low end where pool waits and queries live
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram, Prometheus style (``le`` upper bounds)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """``(le, observations <= le)`` pairs, ending with ``(inf, count)``."""
+        out, running = [], 0
+        for bound, n in zip((*self.buckets, float("inf")), self._counts):
+            running += n
+            out.append((bound, running))
+        return out
+
+    def snapshot(self) -> dict:
+        return {
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): n
+                for bound, n in self.cumulative()
+            },
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+
+# an expanded IN list – "(?, ?, ?)" / "($1, $2)" – in any paramstyle
+_PARAM = r"(?:\?|\$\d+|%s|%\(\w+\)s|:\w+)"
+_IN_LIST = re.compile(rf"IN \({_PARAM}(?:, {_PARAM})*\)")
+
+
+class RequestStats:
+    """Mutable per-request tally; shared by reference with any child tasks."""
+
+    __slots__ = ("queries", "db_seconds", "selects")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.selects: dict[str, int] = {}  # SELECT shape -> executions
+
+    def note(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        if statement.lstrip()[:6].upper() == "SELECT":
+            if "IN (" in statement:
+                statement = _IN_LIST.sub("IN (...)", statement)
+            self.selects[statement] = self.selects.get(statement, 0) + 1
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar(
+    "current_request", default=None
+)
+
+
+class RouteMetrics:
+    """Request latency, status counts and DB usage keyed by (method, route)."""
+
+    def __init__(self) -> None:
+        self.latency: dict[tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.db_time: dict[tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.queries: dict[tuple[str, str], int] = defaultdict(int)
+        self.statuses: dict[tuple[str, str, int], int] = defaultdict(int)
+
+    def record(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        stats: RequestStats,
+    ) -> None:
+        key = (method, route)
+        self.latency[key].observe(seconds)
+        self.db_time[key].observe(stats.db_seconds)
+        self.queries[key] += stats.queries
+        self.statuses[(method, route, status)] += 1
+
+    def clear(self) -> None:
+        for table in (self.latency, self.db_time, self.queries, self.statuses):
+            table.clear()
+
+
+route_metrics = RouteMetrics()
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _histogram_lines(name: str, hist: Histogram, **labels: Any) -> list[str]:
+    lines = [
+        f"{name}_bucket{_labels(**labels, le='+Inf' if le == float('inf') else le)} {n}"
+        for le, n in hist.cumulative()
+    ]
+    lines.append(f"{name}_sum{_labels(**labels)} {hist.sum}")
+    lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+    return lines
+
+
+def render_prometheus(
+    gauges: dict[str, float] | None = None, counters: dict[str, float] | None = None
+) -> str:
+    """Everything recorded so far in the Prometheus text exposition format."""
+    m = route_metrics
+    out = [
+        "# HELP http_request_duration_seconds Request latency by route.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), hist in sorted(m.latency.items()):
+        out += _histogram_lines(
+            "http_request_duration_seconds", hist, method=method, route=route
+        )
+    out += [
+        "# HELP http_requests_total Responses by route and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route, status), n in sorted(m.statuses.items()):
+        out.append(
+            f"http_requests_total{_labels(method=method, route=route, status=status)} {n}"
+        )
+    out += [
+        "# HELP db_request_duration_seconds Time spent in SQL per request.",
+        "# TYPE db_request_duration_seconds histogram",
+    ]
+    for (method, route), hist in sorted(m.db_time.items()):
+        out += _histogram_lines(
+            "db_request_duration_seconds", hist, method=method, route=route
+        )
+    out += [
+        "# HELP db_queries_total SQL statements executed, by route.",
+        "# TYPE db_queries_total counter",
+    ]
+    for (method, route), n in sorted(m.queries.items()):
+        out.append(f"db_queries_total{_labels(method=method, route=route)} {n}")
+    for name, value in sorted((counters or {}).items()):
+        out += [f"# TYPE {name} counter", f"{name} {value}"]
+    for name, value in sorted((gauges or {}).items()):
+        out += [f"# TYPE {name} gauge", f"{name} {value}"]
+    return "\n".join(out) + "\n"
@@ -0,0 +1,167 @@
+import base64
+import binascii
+import json
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Generic, Sequence, TypeVar
+from uuid import UUID
+
+from fastapi import Query
+from pydantic import BaseModel
+from sqlalchemy import Select, and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import InvalidCursorError
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One slice of a keyset-paginated listing."""
+
+    items: list[T]
+    next_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int
+    cursor: str | None = None
+    sort: str = "created_at"  # column name, "-" prefix for descending
+
+
+def page_params(
+    limit: int = Query(
+        default=settings.page_size_default, ge=1, le=settings.page_size_max
+    ),
+    cursor: str | None = Query(default=None),
+) -> PageParams:
+    """FastAPI dependency collecting ``?limit=&cursor=``."""
+    return PageParams(limit=limit, cursor=cursor)
+
+
+def sortable_page_params(*keys: str) -> Callable[..., PageParams]:
+    """
+    ``page_params`` plus ``?sort=`` restricted to ``keys`` (``-key`` sorts
+    descending); the first key is the default.
+    """
+    pattern = "^-?(" + "|".join(map(re.escape, keys)) + ")$"
+
+    def dependency(
+        limit: int = Query(
+            default=settings.page_size_default, ge=1, le=settings.page_size_max
+        ),
+        cursor: str | None = Query(default=None),
+        sort: str = Query(default=keys[0], pattern=pattern),
+    ) -> PageParams:
+        return PageParams(limit=limit, cursor=cursor, sort=sort)
+
+    return dependency
+
+
+def encode_token(payload: list) -> str:
+    """URL-safe opaque string for a JSON ``payload`` (the cursor wire format)."""
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(cursor: str) -> list:
+    """Inverse of ``encode_token``; raises ``ValueError`` on garbage."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError(str(exc)) from exc
+    if not isinstance(payload, list):
+        raise ValueError("cursor is not a list")
+    return payload
+
+
+def encode_cursor(sort: str, value: Any, id_: UUID) -> str:
+    """
+    Opaque cursor for the row *after which* the next page starts.
+    Clients must treat it as a black box – the format may change.
+    """
+    if isinstance(value, date):
+        value = value.isoformat()
+    return encode_token([sort, value, str(id_)])
+
+
+def decode_cursor(cursor: str, sort: str, column: Any) -> tuple[Any, UUID]:
+    """``(sort value, id)`` of ``cursor``; it must come from a page sorted by ``sort``."""
+    try:
+        cursor_sort, value, id_ = decode_token(cursor)
+        if cursor_sort != sort:
+            raise ValueError(f"cursor was issued for sort={cursor_sort}")
+        if value is not None:
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+        return value, UUID(id_)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError(ctx={"cursor": cursor}) from exc
+
+
+def _seek(column: Any, id_column: Any, value: Any, id_: UUID, desc: bool) -> Any:
+    """
+    Rows strictly after ``(value, id_)`` in page order. NULLs of a nullable sort
+    column come last ascending and first descending – where both PostgreSQL
+    index scan directions put them.
+    """
+    after_id = id_column < id_ if desc else id_column > id_
+    if value is None:
+        tail = and_(column.is_(None), after_id)
+        return or_(column.is_not(None), tail) if desc else tail
+    key = tuple_(column, id_column)
+    after = key < (value, id_) if desc else key > (value, id_)
+    if desc or not column.nullable:
+        return after
+    return or_(after, column.is_(None))
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    model: Any,
+    page: PageParams,
+    as_rows: bool = False,
+) -> tuple[Sequence[Any], str | None]:
+    """
+    Run ``stmt`` as a keyset page ordered by ``(page.sort, id)``.
+
+    ``model`` must expose the sort column and ``id``; the pair is unique, so the
+    order is total and stable even when values collide. The seek predicate is a
+    row-value comparison, which both PostgreSQL and SQLite resolve with a range
+    scan on a ``(<sort column>, id)`` index – page N costs the same as page 1.
+
+    With ``as_rows`` the result rows are returned as-is (for column selects that
+    must include the sort column and ``id``) instead of the first entity.
+    """
+    key = page.sort.lstrip("-")
+    desc = page.sort.startswith("-")
+    column = getattr(model, key)
+    if page.cursor is not None:
+        value, id_ = decode_cursor(page.cursor, page.sort, column)
+        stmt = stmt.where(_seek(column, model.id, value, id_, desc))
+
+    if desc:
+        order = [column.desc(), model.id.desc()]
+        if column.nullable:
+            order[0] = order[0].nulls_first()
+    else:
+        order = [column.asc(), model.id.asc()]
+        if column.nullable:
+            order[0] = order[0].nulls_last()
+    res = await db.execute(stmt.order_by(*order).limit(page.limit + 1))
+    rows = res.all() if as_rows else res.scalars().all()
+
+    # one extra row tells us whether another page exists without a COUNT(*)
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[: page.limit]
+    last = rows[-1]
+    return rows, encode_cursor(page.sort, getattr(last, key), last.id)
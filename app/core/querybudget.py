@@ -0,0 +1,81 @@
+"""
+Per-request SQL budgets and N+1 detection.
+
+Routes declare how many statements they may issue::
+
+    @router.get("/{user_id}")
+    @query_budget(3)
+    async def read_user(...): ...
+
+``MetricsMiddleware`` already tallies every statement of a request (see
+``app.core.metrics.RequestStats``); after the response it calls ``check``,
+which flags
+
+* more statements than the route's budget (``QUERY_BUDGET_DEFAULT`` applies
+  to routes without one; ``None`` means unlimited), and
+* the same SELECT shape – bound parameters and expanded ``IN`` lists
+  collapsed – running more than ``N_PLUS_ONE_THRESHOLD`` times, the
+  signature of a lazy load inside a loop.
+
+``QUERY_BUDGET_MODE`` picks what happens: ``warn`` logs, ``raise`` raises
+``QueryBudgetError`` (the test suite runs in this mode), ``off`` skips the check.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import RequestStats
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class QueryBudgetError(RuntimeError):
+    """A request issued more SQL than its route allows."""
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    max_queries: int
+
+
+def query_budget(max_queries: int) -> Callable[[F], F]:
+    """Declare the statement budget of a route handler."""
+
+    def decorate(fn: F) -> F:
+        fn.__query_budget__ = QueryBudget(max_queries)  # type: ignore[attr-defined]
+        return fn
+
+    return decorate
+
+
+def budget_for(endpoint: Any) -> int | None:
+    budget = getattr(endpoint, "__query_budget__", None)
+    return budget.max_queries if budget is not None else settings.query_budget_default
+
+
+def violations(stats: RequestStats, max_queries: int | None) -> list[str]:
+    problems = []
+    if max_queries is not None and stats.queries > max_queries:
+        problems.append(f"{stats.queries} statements, budget is {max_queries}")
+    threshold = settings.n_plus_one_threshold
+    for shape, count in stats.selects.items():
+        if count > threshold:
+            problems.append(f"N+1: {count}x {' '.join(shape.split())[:200]}")
+    return problems
+
+
+def check(route: str, endpoint: Any, stats: RequestStats) -> None:
+    mode = settings.query_budget_mode
+    if mode == "off":
+        return
+    problems = violations(stats, budget_for(endpoint))
+    if not problems:
+        return
+    message = f"{route}: " + "; ".join(problems)
+    if mode == "raise":
+        raise QueryBudgetError(message)
+    logger.warning("query budget exceeded – %s", message)
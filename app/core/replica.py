@@ -0,0 +1,153 @@
+"""
+Read-replica routing for GET endpoints.
+
+``get_read_db`` hands out a session on the replica unless
+
+* no ``DB_REPLICA_URL`` is configured,
+* the client wrote something within the last ``READ_YOUR_WRITES_SECONDS`` –
+  ``ReadYourWritesMiddleware`` marks such clients with a short-lived cookie,
+  so every worker honours the window without shared state, or
+* the replica failed its last health probe (re-checked at most every
+  ``REPLICA_RECHECK_SECONDS``) or a query on it raised a DBAPI error.
+
+In all those cases the request reads from the primary instead. A failing
+query is not retried: the request that hit it fails, and the fallback starts
+with the next request (until the next successful probe). Replica reads
+never populate the entity cache, so replication lag cannot pin stale rows there.
+"""
+
+import asyncio
+import time
+from http.cookies import SimpleCookie
+from typing import Callable
+
+from fastapi import Request
+from sqlalchemy import text
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, ReplicaSessionLocal
+
+RYW_COOKIE = "rw_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadRouter:
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replica: async_sessionmaker[AsyncSession] | None,
+        recheck_interval: float = 5.0,
+        probe_timeout: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.recheck_interval = recheck_interval
+        self.probe_timeout = probe_timeout
+        self._clock = clock
+        self._healthy = False
+        self._checked_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def has_replica(self) -> bool:
+        return self.replica is not None
+
+    def mark_unhealthy(self) -> None:
+        self._healthy = False
+        self._checked_at = self._clock()
+
+    async def _probe(self) -> bool:
+        assert self.replica is not None
+        try:
+            async with self.replica() as session:
+                await asyncio.wait_for(
+                    session.execute(text("SELECT 1")), self.probe_timeout
+                )
+        except Exception:  # any failure means "don't route reads there"
+            return False
+        return True
+
+    async def replica_healthy(self) -> bool:
+        if self.replica is None:
+            return False
+        if self._due():
+            async with self._lock:
+                if self._due():  # another request may have probed meanwhile
+                    self._healthy = await self._probe()
+                    self._checked_at = self._clock()
+        return self._healthy
+
+    def _due(self) -> bool:
+        return (
+            self._checked_at is None
+            or self._clock() - self._checked_at >= self.recheck_interval
+        )
+
+    async def factory_for(
+        self, request: Request
+    ) -> tuple[async_sessionmaker[AsyncSession], bool]:
+        """Pick the session factory for a read; the flag is True for the replica."""
+        if recently_wrote(request) or not await self.replica_healthy():
+            return self.primary, False
+        assert self.replica is not None
+        return self.replica, True
+
+
+def recently_wrote(request: Request) -> bool:
+    raw = request.cookies.get(RYW_COOKIE)
+    try:
+        return raw is not None and float(raw) > time.time()
+    except ValueError:
+        return False
+
+
+def write_cookie(window: float) -> str:
+    """``Set-Cookie`` value marking a write for the next ``window`` seconds."""
+    cookie: SimpleCookie = SimpleCookie()
+    cookie[RYW_COOKIE] = f"{time.time() + window:.3f}"
+    morsel = cookie[RYW_COOKIE]
+    morsel.update({"max-age": str(max(int(window), 1)), "path": "/"})
+    morsel.update({"httponly": True, "samesite": "lax"})
+    return morsel.OutputString()
+
+
+read_router = ReadRouter(
+    AsyncSessionLocal,
+    ReplicaSessionLocal,
+    recheck_interval=settings.replica_recheck_seconds,
+)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task hop): routes a client's
+    reads to the primary for a while after it writes, by adding the
+    ``RYW_COOKIE`` to successful unsafe requests. Reads, streams and every
+    request without a configured replica pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or not read_router.has_replica
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie", write_cookie(settings.read_your_writes_seconds)
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,80 @@
+"""
+Fast JSON path: ORM rows straight to response bytes.
+
+When a route returns ORM objects and declares ``response_model=``, FastAPI
+validates them into the schema, converts the result back into plain Python
+with ``jsonable_encoder`` and encodes that with the stdlib ``json`` module.
+``json_response`` replaces the last two steps: one ``TypeAdapter`` validation
+(``from_attributes``) followed by pydantic-core's serializer writing bytes
+directly. Routes keep ``response_model`` for the OpenAPI schema; FastAPI
+leaves returned ``Response`` objects untouched.
+
+Large listings can skip ORM objects altogether: select the schema's columns,
+turn the rows into dicts (``row_dicts``) and encode them with ``raw_response``.
+Column types map 1:1 onto the schema fields, so validating them again would
+only cost time.
+
+``benchmarks/bench_json.py`` compares the paths on a 10k-task list.
+"""
+
+from functools import lru_cache
+from typing import Any, Mapping, Sequence
+
+import pydantic_core
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Column, Row
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=None)
+def adapter_for(tp: Any) -> TypeAdapter:
+    """Build each ``TypeAdapter`` once; constructing the schema is the slow part."""
+    return TypeAdapter(tp)
+
+
+def dump_json(tp: Any, data: Any, include: Any = None) -> bytes:
+    adapter = adapter_for(tp)
+    return adapter.dump_json(
+        adapter.validate_python(data, from_attributes=True), include=include
+    )
+
+
+def json_response(
+    tp: Any,
+    data: Any,
+    status_code: int = 200,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """Serialize ``data`` as ``tp`` (e.g. ``list[TaskOut]``) into a Response."""
+    return Response(
+        dump_json(tp, data),
+        status_code=status_code,
+        headers=headers,
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+def schema_columns(table: Any, schema: type[BaseModel]) -> list[Column]:
+    """``table``'s columns named like ``schema``'s fields, in field order."""
+    return [table.c[name] for name in schema.model_fields]
+
+
+def row_dicts(rows: Sequence[Row]) -> list[dict[str, Any]]:
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def raw_response(
+    data: Any, status_code: int = 200, headers: Mapping[str, str] | None = None
+) -> Response:
+    """Encode plain Python data (dicts, lists, UUIDs, datetimes) without validation."""
+    return Response(
+        pydantic_core.to_json(data),
+        status_code=status_code,
+        headers=headers,
+        media_type=JSON_MEDIA_TYPE,
+    )
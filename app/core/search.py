@@ -0,0 +1,109 @@
+"""
+Substring search over a single text column, backed by an index on both
+supported databases:
+
+* PostgreSQL – a ``gin_trgm_ops`` GIN index lets ``ILIKE '%term%'`` use an
+  index scan; results are ranked by ``similarity()``.
+* SQLite – an FTS5 table with the ``trigram`` tokenizer shadows the column and
+  is kept in sync by triggers; results are ranked by FTS5's bm25 ``rank``.
+
+Terms shorter than three characters cannot use a trigram index on either
+backend and fall back to a plain (unranked) ``ILIKE`` scan.
+
+The FTS5 table is keyed by the base table's implicit rowid, which ``VACUUM`` may
+renumber (our primary keys are UUIDs); rebuild after vacuuming with
+``INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')``.
+"""
+
+from sqlalchemy import (
+    DDL,
+    Index,
+    Select,
+    Table,
+    column,
+    event,
+    func,
+    literal_column,
+    select,
+    table,
+    text,
+)
+
+MIN_INDEXED_TERM = 3
+
+
+def _sqlite_fts_ddl(tbl: str, col: str) -> list[str]:
+    fts = f"{tbl}_fts"
+    return [
+        # external-content table: stores only the trigram index, keyed by rowid
+        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+        f"{col}, content='{tbl}', content_rowid='rowid', tokenize='trigram')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {tbl} BEGIN "
+        f"INSERT INTO {fts}(rowid, {col}) VALUES (new.rowid, new.{col}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {tbl} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col}) "
+        f"VALUES ('delete', old.rowid, old.{col}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {col} ON {tbl} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col}) "
+        f"VALUES ('delete', old.rowid, old.{col}); "
+        f"INSERT INTO {fts}(rowid, {col}) VALUES (new.rowid, new.{col}); END",
+    ]
+
+
+def make_searchable(target: Table, column_name: str) -> None:
+    """
+    Attach the search index for ``target.column_name`` to the metadata so that
+    ``create_all`` (tests, dev databases) builds it. Production schemas get the
+    same objects from the Alembic migration.
+    """
+    Index(
+        f"ix_{target.name}_{column_name}_trgm",
+        target.c[column_name],
+        postgresql_using="gin",
+        postgresql_ops={column_name: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+    event.listen(
+        target,
+        "before_create",
+        DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+    )
+    for stmt in _sqlite_fts_ddl(target.name, column_name):
+        event.listen(target, "after_create", DDL(stmt).execute_if(dialect="sqlite"))
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_stmt(
+    dialect: str, model: type, column_name: str, term: str, limit: int
+) -> Select:
+    """Build a relevance-ranked ``SELECT model ... LIMIT limit`` for ``term``."""
+    col = getattr(model, column_name)
+    pk = model.id  # type: ignore[attr-defined]
+    stmt = select(model)
+
+    if len(term) < MIN_INDEXED_TERM:
+        return (
+            stmt.where(col.ilike(f"%{_escape_like(term)}%", escape="\\"))
+            .order_by(col, pk)
+            .limit(limit)
+        )
+
+    if dialect == "sqlite":
+        base = model.__tablename__  # type: ignore[attr-defined]
+        fts = table(f"{base}_fts", column("rowid"), column("rank"))
+        phrase = '"%s"' % term.replace('"', '""')
+        return (
+            stmt.join(fts, fts.c.rowid == literal_column(f"{base}.rowid"))
+            .where(text(f"{fts.name} MATCH :phrase").bindparams(phrase=phrase))
+            .order_by(fts.c.rank, pk)
+            .limit(limit)
+        )
+
+    # PostgreSQL: ILIKE is served by the trigram GIN index
+    return (
+        stmt.where(col.ilike(f"%{_escape_like(term)}%", escape="\\"))
+        .order_by(func.similarity(col, term).desc(), pk)
+        .limit(limit)
+    )
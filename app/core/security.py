@@ -1,7 +1,122 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is deliberately slow (~250 ms at cost 12), so calling it inline in an
+async route stalls every other request on the worker. ``PasswordHasher`` runs
+hash/verify in a thread or process pool behind a semaphore: at most
+``max_concurrency`` jobs are handed to the pool, the rest wait on the loop and
+are counted in ``stats()["queued"]``.
+
+bcrypt releases the GIL, so threads are the default; ``process`` isolates the
+CPU cost completely at the price of pickling and worker start-up.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Literal
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+
+PoolKind = Literal["thread", "process"]
+
+
+@lru_cache
+def _context(rounds: int) -> CryptContext:
+    # any stored hash with a different cost is reported by needs_update()
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+# module-level so they can be pickled into a process pool
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify(password: str, hashed: str, rounds: int) -> tuple[bool, str | None]:
+    return _context(rounds).verify_and_update(password, hashed)
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        rounds: int,
+        pool: PoolKind = "thread",
+        workers: int = 4,
+        max_concurrency: int | None = None,
+    ) -> None:
+        self.rounds = rounds
+        self.pool = pool
+        self.workers = workers
+        self.max_concurrency = max_concurrency or workers
+        self._executor: Executor | None = None
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.pool == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="pwd-hash"
+                )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        self._queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._queued -= 1
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._running -= 1
+            self._completed += 1
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        """
+        Check ``password`` against ``hashed``. The second item is a fresh hash
+        when the stored one was made with a different cost and should be
+        replaced, otherwise ``None``.
+        """
+        return await self._run(_verify, password, hashed, self.rounds)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self._queued,
+            "running": self._running,
+            "completed": self._completed,
+            "max_concurrency": self.max_concurrency,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hasher = PasswordHasher(
+    rounds=settings.password_hash_rounds,
+    pool=settings.password_hash_pool,
+    workers=settings.password_hash_workers,
+    max_concurrency=settings.password_hash_max_concurrency,
+)
+
+
+async def get_password_hash(password: str) -> str:
+    return await hasher.hash(password)
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def verify_password(password: str, hashed: str) -> tuple[bool, str | None]:
+    return await hasher.verify(password, hashed)
@@ -1,19 +1,48 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.api.v1 import router as api_v1
 from app.api.exception_handler import register_exception_handlers
+from app.api.middleware import MetricsMiddleware
 from app.core.config import settings
+from app.core.database import engine, replica_engine, warm_up
+from app.core.replica import ReadYourWritesMiddleware
+from app.core.security import hasher
+from app.tasks.reminders import reminder_scheduler
+from app.tasks.tombstones import tombstone_compactor
 from app.users.routes import router as user_router
 from app.tasks.routes import router as task_router
 from app.projects.routes import router as project_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup = settings.db_pool_warmup
+    await warm_up(engine, settings.db_pool_size if warmup is None else warmup)
+    if settings.reminders_enabled:
+        reminder_scheduler.start()
+    tombstone_compactor.start()
+    yield
+    await tombstone_compactor.stop()
+    await reminder_scheduler.stop()
+    hasher.shutdown()
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Task-Tracker API",
     version="0.1.0",
     docs_url="/docs",
     openapi_url="/openapi.json",
 )
 
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(MetricsMiddleware)  # outermost: times everything below
+
 app.include_router(api_v1, prefix="/api/v1")
 app.include_router(user_router, prefix="/api/v1")
 app.include_router(task_router, prefix="/api/v1")
@@ -0,0 +1,154 @@
+"""
+Denormalized task counters on ``Project`` (``task_count``, ``completed_count``).
+
+The crud paths that insert, delete, (un)complete or (re)assign tasks apply
+their delta with ``apply`` in the same transaction as the task write. The
+UPDATE is relative (``task_count = task_count + n``), so concurrent writers
+serialize on the project row instead of overwriting each other. The delta
+comes from what the task write reports back (``RETURNING``), never from
+Python-side state that may be stale: completing an already complete task, or
+deleting one that is gone, changes nothing. Bulk
+completion changes do not know the previous state of the rows they touch;
+they ``recount`` the affected projects instead.
+
+``reconcile`` rebuilds every project in keyset batches – run
+``python -m app.cli.reconcile_counters`` after imports or manual fixes that
+bypass the crud layer.
+"""
+
+from typing import Any, Collection, Iterable, Mapping
+from uuid import UUID
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.tasks.models import Task
+from .models import Project
+
+Delta = tuple[int, int]  # (tasks, completed)
+
+_RETURNED = (Project.id, Project.task_count, Project.completed_count)
+
+
+def tally(tasks: Iterable[Any], sign: int = 1) -> dict[UUID, Delta]:
+    """Per-project delta for adding (``sign=1``) or removing (``-1``) ``tasks``."""
+    deltas: dict[UUID, Delta] = {}
+    for task in tasks:
+        if task.project_id is None:
+            continue
+        n, done = deltas.get(task.project_id, (0, 0))
+        deltas[task.project_id] = (n + sign, done + sign * bool(task.complete))
+    return deltas
+
+
+def moved(
+    rows: Iterable[Any],
+    source: Mapping[UUID, UUID | None],
+    target: UUID | None,
+) -> dict[UUID, Delta]:
+    """
+    Delta for moving ``rows`` (``id``, ``complete``) from their project in
+    ``source`` (by task id) to ``target``; ``None`` stands for no project.
+    """
+    deltas: dict[UUID, Delta] = {}
+    for row in rows:
+        for project_id, sign in ((source.get(row.id), -1), (target, 1)):
+            if project_id is None:
+                continue
+            n, done = deltas.get(project_id, (0, 0))
+            deltas[project_id] = (n + sign, done + sign * bool(row.complete))
+    return deltas
+
+
+async def apply(db: AsyncSession, deltas: Mapping[UUID, Delta]) -> None:
+    """Add ``deltas`` to the counters of their projects in one UPDATE."""
+    deltas = {pid: d for pid, d in deltas.items() if pid is not None and any(d)}
+    if not deltas:
+        return
+    by_id = {pid: d[0] for pid, d in deltas.items()}
+    done_by_id = {pid: d[1] for pid, d in deltas.items()}
+    res = await db.execute(
+        update(Project)
+        .where(Project.id.in_(deltas))
+        .values(
+            task_count=Project.task_count + case(by_id, value=Project.id, else_=0),
+            completed_count=Project.completed_count
+            + case(done_by_id, value=Project.id, else_=0),
+            updated_at=Project.updated_at,  # counters are not an edit of the project
+        )
+        .returning(*_RETURNED)
+        .execution_options(synchronize_session=False)
+    )
+    _sync_loaded(db, res)
+
+
+def _counted():
+    total = select(func.count()).where(Task.project_id == Project.id)
+    done = total.where(Task.complete.is_(True))
+    return total.scalar_subquery(), done.scalar_subquery()
+
+
+async def recount(db: AsyncSession, project_ids: Collection[UUID | None]) -> None:
+    """Recompute the counters of ``project_ids`` from their tasks."""
+    ids = {pid for pid in project_ids if pid is not None}
+    if not ids:
+        return
+    total, done = _counted()
+    res = await db.execute(
+        update(Project)
+        .where(Project.id.in_(ids))
+        .values(task_count=total, completed_count=done, updated_at=Project.updated_at)
+        .returning(*_RETURNED)
+        .execution_options(synchronize_session=False)
+    )
+    _sync_loaded(db, res)
+
+
+def _sync_loaded(db: AsyncSession, rows: Iterable[Any]) -> None:
+    # the UPDATE bypassed the identity map: copy the new values onto projects
+    # already in the session instead of expiring them (no lazy loads in async)
+    for row in rows:
+        obj = db.identity_map.get(identity_key(Project, row.id))
+        if obj is not None:
+            set_committed_value(obj, "task_count", row.task_count)
+            set_committed_value(obj, "completed_count", row.completed_count)
+
+
+async def reconcile(
+    session_factory: async_sessionmaker[AsyncSession], batch_size: int = 1_000
+) -> tuple[int, int]:
+    """
+    Rebuild the counters of every project, ``batch_size`` projects per
+    transaction. Returns ``(projects checked, projects corrected)``.
+    """
+    total, done = _counted()
+    checked = fixed = 0
+    last: UUID | None = None
+    while True:
+        async with session_factory() as db:
+            stmt = select(Project.id).order_by(Project.id).limit(batch_size)
+            if last is not None:
+                stmt = stmt.where(Project.id > last)
+            ids = (await db.scalars(stmt)).all()
+            if not ids:
+                return checked, fixed
+            res = await db.execute(
+                update(Project)
+                .where(
+                    Project.id.in_(ids),
+                    (Project.task_count != total) | (Project.completed_count != done),
+                )
+                .values(
+                    task_count=total,
+                    completed_count=done,
+                    updated_at=Project.updated_at,
+                )
+                .returning(Project.id)
+                .execution_options(synchronize_session=False)
+            )
+            fixed += len(res.all())
+            await db.commit()
+        checked += len(ids)
+        last = ids[-1]
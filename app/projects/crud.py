@@ -1,13 +1,21 @@
+from datetime import date
 from uuid import UUID
-from typing import Sequence
+from typing import Any, Collection, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update as sql_update
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import etag
+from app.core.cache import entity_cache
+from app.core.events import change_feed, project_topic, user_topic
+from app.core.exceptions import ConflictError
+from app.core.pagination import PageParams, paginate
+from app.core.search import search_stmt
+from . import counters
 from .models import Project
-from .schemas import ProjectCreate, ProjectUpdate
+from .schemas import ProjectCreate, ProjectFilter, ProjectSummary, ProjectUpdate
 from .exceptions import (
     ProjectNotFoundError,
     AlreadyAssignedError,
@@ -18,39 +26,115 @@ from .exceptions import (
 from app.users.models import User
 from app.users.exceptions import UserNotFoundError
 
+from app.tasks import crud as task_crud
 from app.tasks.models import Task
+from app.tasks.schemas import TaskStats
 from app.tasks.exceptions import TaskNotFoundError
 
+# ?expand= name -> relationship, turned into a selectinload only when requested
+_EXPANDABLE = {
+    "tasks": Project.tasks,
+}
 
-async def get(db: AsyncSession, project_id: UUID) -> Project:
-    res_project = await db.execute(
-        select(Project)
-        .where(Project.id == project_id)
-        .options(selectinload(Project.tasks))
+
+def _publish(event: str, project: Project, data: bool = True) -> None:
+    change_feed.publish(
+        event,
+        project.id,
+        (user_topic(project.owner_id), project_topic(project.id)),
+        ProjectSummary if data else None,
+        project,
+        owner_id=project.owner_id,
     )
-    project: Project | None = res_project.scalar_one_or_none()
+
+
+def after_remove(*projects: Any) -> None:
+    """Cache invalidation and ``project.deleted`` events for committed deletions."""
+    entity_cache.invalidate(Project, *(p.id for p in projects))
+    entity_cache.invalidate(User, *{p.owner_id for p in projects})
+    for project in projects:
+        _publish("project.deleted", project, data=False)
+
+
+def _load_options(expand: Collection[str]) -> list:
+    return [selectinload(_EXPANDABLE[name]) for name in sorted(expand)]
+
+
+async def get(
+    db: AsyncSession,
+    project_id: UUID,
+    expand: Collection[str] = (),
+    cached: bool = True,
+    lock: bool = False,
+) -> Project:
+    """``lock`` reads the row ``FOR UPDATE`` (never cached) for an If-Match check."""
+    stmt = select(Project).where(Project.id == project_id)
+    if lock:
+        stmt = stmt.with_for_update()
+    if expand or not cached or lock:
+        res_project = await db.execute(stmt.options(*_load_options(expand)))
+        project: Project | None = res_project.scalar_one_or_none()
+    else:
+        project = await entity_cache.get_or_load(db, Project, project_id, stmt)
     if project is None:
         raise ProjectNotFoundError(ctx={"id": str(project_id)})
     return project
 
 
-async def get_by_name(db: AsyncSession, project_name: str) -> Sequence[Project]:
-    tasks = await db.execute(
-        select(Project)
-        .where(Project.name.ilike(f"%{project_name}%"))
-        .options(selectinload(Project.tasks))
+async def version(
+    db: AsyncSession, project_id: UUID, expand: Collection[str] = ()
+) -> tuple | None:
+    """
+    ETag version: ``updated_at`` and the task counters, plus count/max(updated_at)
+    of expanded tasks.
+    """
+    cols = [Project.updated_at, Project.task_count, Project.completed_count]
+    if "tasks" in expand:
+        cols += etag.child_version_columns(Task, Task.project_id == Project.id)
+    res = await db.execute(select(*cols).where(Project.id == project_id))
+    row = res.one_or_none()
+    return tuple(row) if row is not None else None
+
+
+def version_of(project: Project, expand: Collection[str] = ()) -> tuple:
+    parts = [project.updated_at, project.task_count, project.completed_count]
+    if "tasks" in expand:
+        parts += etag.child_version(project.tasks)
+    return tuple(parts)
+
+
+async def get_page(
+    db: AsyncSession,
+    page: PageParams,
+    expand: Collection[str] = (),
+    flt: ProjectFilter = ProjectFilter(),
+) -> tuple[Sequence[Project], str | None]:
+    stmt = select(Project).where(*task_crud.filter_clauses(Project, flt))
+    return await paginate(db, stmt.options(*_load_options(expand)), Project, page)
+
+
+async def stats(db: AsyncSession, project_id: UUID, today: date) -> TaskStats:
+    stmt = task_crud.stats_stmt(Project, Task.project_id, today).where(
+        Project.id == project_id
     )
-    return tasks.scalars().all()
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        raise ProjectNotFoundError(ctx={"id": str(project_id)})
+    return TaskStats(**row._mapping)
+
+
+async def search(
+    db: AsyncSession, term: str, limit: int, expand: Collection[str] = ()
+) -> Sequence[Project]:
+    """Projects whose name contains ``term``, best match first."""
+    stmt = search_stmt(db.get_bind().dialect.name, Project, "name", term, limit)
+    projects = await db.execute(stmt.options(*_load_options(expand)))
+    return projects.scalars().all()
 
 
 async def create(db: AsyncSession, obj: ProjectCreate) -> Project:
-    res_owner = await db.execute(
-        select(User)
-        .where(User.id == obj.owner_id)
-        .options(selectinload(User.tasks), selectinload(User.projects))
-    )
-    owner: User | None = res_owner.scalar_one_or_none()
-    if owner is None:
+    res_owner = await db.execute(select(User.id).where(User.id == obj.owner_id))
+    if res_owner.scalar_one_or_none() is None:
         raise UserNotFoundError(ctx={"id": str(obj.owner_id)})
 
     db_obj = Project(name=obj.name, description=obj.description, owner_id=obj.owner_id)
@@ -60,7 +144,8 @@ async def create(db: AsyncSession, obj: ProjectCreate) -> Project:
     except IntegrityError:
         await db.rollback()
         raise
-    await db.refresh(db_obj, ["owner", "tasks"])
+    await db.refresh(db_obj)
+    _publish("project.created", db_obj)
     return db_obj
 
 
@@ -71,88 +156,186 @@ async def update(db: AsyncSession, db_obj: Project, obj: ProjectUpdate) -> Proje
         db_obj.description = obj.description
 
     await db.commit()
-    await db.refresh(db_obj, ["owner", "tasks"])
+    await db.refresh(db_obj)
+    entity_cache.invalidate(Project, db_obj.id)
+    entity_cache.invalidate(User, db_obj.owner_id)
+    _publish("project.updated", db_obj)
     return db_obj
 
 
-async def add_task(db: AsyncSession, task_id: UUID, project_id: UUID) -> Project:
-    res_task = await db.execute(select(Task).where(Task.id == task_id))
-    task: Task | None = res_task.scalar_one_or_none()
-    if task is None:
-        raise TaskNotFoundError(ctx={"id": str(task_id)})
+async def _diagnose_assignment(
+    db: AsyncSession, project_id: UUID, task_ids: Sequence[UUID], assign: bool
+) -> None:
+    """
+    Explain why the conditional UPDATE in add_tasks/remove_tasks did not match
+    every requested task. Only runs on the failure path.
+    """
+    res_tasks = await db.execute(
+        select(Task.id, Task.owner_id, Task.project_id).where(Task.id.in_(task_ids))
+    )
+    found = {row.id: row for row in res_tasks}
+    for task_id in task_ids:
+        if task_id not in found:
+            raise TaskNotFoundError(ctx={"id": str(task_id)})
 
-    res_project = await db.execute(
-        select(Project)
-        .where(Project.id == project_id)
-        .options(selectinload(Project.tasks))
+    res_owner = await db.execute(
+        select(Project.owner_id).where(Project.id == project_id)
     )
-    project: Project | None = res_project.scalar_one_or_none()
-    if project is None:
+    project_owner_id = res_owner.scalar_one_or_none()
+    if project_owner_id is None:
         raise ProjectNotFoundError(ctx={"id": str(project_id)})
 
-    if task.project_id == project.id:
-        raise AlreadyAssignedError(
-            ctx={"project_id": str(project_id), "task_id": str(task_id)}
-        )
+    for task_id in task_ids:
+        task = found[task_id]
+        if not assign and task.project_id != project_id:
+            raise NotAssignedError(
+                ctx={"project_id": str(project_id), "task_id": str(task_id)}
+            )
+        if assign and task.project_id == project_id:
+            raise AlreadyAssignedError(
+                ctx={"project_id": str(project_id), "task_id": str(task_id)}
+            )
+        if assign and task.owner_id != project_owner_id:
+            raise OwnerMismatchError(
+                ctx={
+                    "project_owner_id": str(project_owner_id),
+                    "task_owner_id": str(task.owner_id),
+                }
+            )
+
 
-    if project.owner_id != task.owner_id:
-        raise OwnerMismatchError(
-            ctx={
-                "project_owner_id": str(project.owner_id),
-                "task_owner_id": str(task.owner_id),
-            }
+async def _set_project(
+    db: AsyncSession, project_id: UUID, task_ids: Collection[UUID], assign: bool
+) -> None:
+    ids = list(dict.fromkeys(task_ids))  # de-duplicate, keep order
+    if assign:
+        # the project each task leaves, for its counters; locked until commit
+        res_previous = await db.execute(
+            select(Task.id, Task.project_id)
+            .where(Task.id.in_(ids), Task.project_id.is_not(None))
+            .with_for_update()
+        )
+        previous = dict(res_previous.tuples().all())
+    else:
+        previous = {task_id: project_id for task_id in ids}
+    if assign:
+        # same owner as the project and not already in it – checked by the WHERE
+        project_owner = (
+            select(Project.owner_id).where(Project.id == project_id).scalar_subquery()
+        )
+        stmt = (
+            sql_update(Task)
+            .where(
+                Task.id.in_(ids),
+                Task.owner_id == project_owner,
+                Task.project_id.is_distinct_from(project_id),
+            )
+            .values(project_id=project_id)
+        )
+    else:
+        stmt = (
+            sql_update(Task)
+            .where(Task.id.in_(ids), Task.project_id == project_id)
+            .values(project_id=None)
         )
 
-    project.tasks.append(task)
+    stmt = stmt.returning(Task.id, Task.owner_id, Task.complete).execution_options(
+        synchronize_session="fetch"
+    )
+    # all-or-nothing: a partial match rolls back to the savepoint only
+    savepoint = await db.begin_nested()
+    res = await db.execute(stmt)
+    rows = res.all()
+    updated = {row.id for row in rows}
+    if len(updated) != len(ids):
+        await savepoint.rollback()
+        missed = [task_id for task_id in ids if task_id not in updated]
+        await _diagnose_assignment(db, project_id, missed, assign)
+        # rows changed between the UPDATE and the diagnosis – let the client retry
+        raise ConflictError(ctx={"project_id": str(project_id)})
+    await savepoint.commit()
+    target = project_id if assign else None
+    await counters.apply(db, counters.moved(rows, previous, target))
     try:
         await db.commit()
     except IntegrityError:
         await db.rollback()
         raise
+    entity_cache.invalidate(Task, *ids)
+    entity_cache.invalidate(Project, project_id, *previous.values())
+    for row in rows:
+        change_feed.publish(
+            "task.assigned" if assign else "task.unassigned",
+            row.id,
+            (user_topic(row.owner_id), project_topic(project_id)),
+            owner_id=row.owner_id,
+            project_id=project_id if assign else None,
+        )
+        source = previous.get(row.id) if assign else None
+        if source is not None:  # moved: the project it left sees it go
+            change_feed.publish(
+                "task.unassigned",
+                row.id,
+                (project_topic(source),),
+                owner_id=row.owner_id,
+                project_id=project_id,
+            )
+    await _refresh_loaded(db, ids)
 
-    await db.refresh(project)
-    return project
 
+async def _refresh_loaded(db: AsyncSession, task_ids: Collection[UUID]) -> None:
+    """
+    The bulk UPDATE expires server-computed columns (updated_at) and leaves
+    Project.tasks collections stale on objects already in the session. Reload
+    them eagerly: lazy loads are not available under asyncio. A fresh request
+    session holds none of these objects, so this is free on the hot path.
+    """
+    changed = set(task_ids)
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, Task) and obj.id in changed:
+            await db.refresh(obj)
+        elif isinstance(obj, Project):
+            db.expire(obj, ["tasks"])
 
-async def remove_task(db: AsyncSession, task_id: UUID, project_id: UUID) -> Project:
-    res_task = await db.execute(select(Task).where(Task.id == task_id))
-    task: Task | None = res_task.scalar_one_or_none()
-    if task is None:
-        raise TaskNotFoundError(ctx={"id": str(task_id)})
 
-    res_project = await db.execute(
-        select(Project)
-        .where(Project.id == project_id)
-        .options(selectinload(Project.tasks))
-    )
-    project: Project | None = res_project.scalar_one_or_none()
-    if project is None:
-        raise ProjectNotFoundError(ctx={"id": str(project_id)})
+async def add_tasks(
+    db: AsyncSession, task_ids: Collection[UUID], project_id: UUID
+) -> None:
+    """Assign tasks to a project with one conditional UPDATE on tasks.project_id."""
+    await _set_project(db, project_id, task_ids, assign=True)
 
-    if task.project_id != project.id or task.project_id is None:
-        raise NotAssignedError(
-            ctx={"project_id": str(project.id), "task_id": str(task.id)}
-        )
 
-    project.tasks.remove(task)
-    try:
-        await db.commit()
-    except IntegrityError:
-        await db.rollback()
-        raise
+async def remove_tasks(
+    db: AsyncSession, task_ids: Collection[UUID], project_id: UUID
+) -> None:
+    """Detach tasks from a project with one conditional UPDATE on tasks.project_id."""
+    await _set_project(db, project_id, task_ids, assign=False)
+
+
+async def add_task(db: AsyncSession, task_id: UUID, project_id: UUID) -> None:
+    await add_tasks(db, [task_id], project_id)
 
-    await db.refresh(project)
-    return project
+
+async def remove_task(db: AsyncSession, task_id: UUID, project_id: UUID) -> None:
+    await remove_tasks(db, [task_id], project_id)
 
 
 async def remove(db: AsyncSession, project_id: UUID) -> None:
+    # the lock keeps tasks from being assigned until the project is gone
     res_project = await db.execute(
-        select(Project)
+        select(Project.id, Project.owner_id)
         .where(Project.id == project_id)
-        .options(selectinload(Project.tasks))
+        .with_for_update()
     )
-    project: Project | None = res_project.scalar_one_or_none()
+    project = res_project.one_or_none()
     if project is None:
         raise ProjectNotFoundError(ctx={"id": str(project_id)})
-    await db.delete(project)
+    tasks = await task_crud.delete_where(db, Task.project_id == project_id)
+    await db.execute(
+        delete(Project)
+        .where(Project.id == project_id)
+        .execution_options(synchronize_session="fetch")
+    )
     await db.commit()
+    task_crud.after_remove(*tasks)
+    after_remove(project)
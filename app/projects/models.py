@@ -3,11 +3,12 @@ import datetime
 import uuid
 
 from typing import List, TYPE_CHECKING
-from sqlalchemy import DateTime, String, ForeignKey, func
+from sqlalchemy import DateTime, String, ForeignKey, Index, Integer, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
+from app.core.search import make_searchable
 
 if TYPE_CHECKING:
     from app.tasks.models import Task
@@ -16,6 +17,11 @@ if TYPE_CHECKING:
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # keyset pagination orders (?sort=), see app.core.pagination
+        Index("ix_projects_created_at_id", "created_at", "id"),
+        Index("ix_projects_updated_at_id", "updated_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -32,11 +38,24 @@ class Project(Base):
         nullable=False,
     )
 
+    # maintained by app.projects.counters alongside every task write
+    task_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    completed_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     owner_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     owner: Mapped["User"] = relationship(back_populates="projects")
 
     tasks: Mapped[List["Task"]] = relationship(
         back_populates="project", cascade="all", uselist=True
     )
+
+
+make_searchable(Project.__table__, "name")
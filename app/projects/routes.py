@@ -1,62 +1,195 @@
+from datetime import date, datetime
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from sqlalchemy import select
 
-from app.core.deps import get_db
-from .schemas import ProjectOut, ProjectCreate, ProjectUpdate, ProjectAssignTask
-from .models import Project
+from app.core import etag
+from app.core.coalesce import CoalescingRoute, coalesce
+from app.core.config import settings
+from app.core.deps import get_db, get_read_db
+from app.core.events import event_stream, project_topic
+from app.core.fieldsets import FieldSelection
+from app.core.pagination import Page, PageParams, sortable_page_params
+from app.core.querybudget import query_budget
+from app.tasks.schemas import TaskStats
+from .schemas import (
+    ProjectOut,
+    ProjectSummary,
+    ProjectCreate,
+    ProjectFilter,
+    ProjectUpdate,
+    ProjectAssignTask,
+    ProjectAssignTasks,
+    ProjectAssignResult,
+    project_view,
+)
 from . import crud as project_crud
 
-router = APIRouter(prefix="/projects", tags=["tasks"])
+router = APIRouter(prefix="/projects", tags=["tasks"], route_class=CoalescingRoute)
 
 
-@router.post("/", response_model=ProjectOut, status_code=status.HTTP_201_CREATED)
+def project_filter_params(  # ProjectFilter as ?query= parameters
+    owner_id: UUID | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    updated_after: datetime | None = None,
+    updated_before: datetime | None = None,
+) -> ProjectFilter:
+    return ProjectFilter(
+        owner_id=owner_id,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+
+
+@router.post("/", response_model=ProjectSummary, status_code=status.HTTP_201_CREATED)
+@query_budget(3)
 async def create_project(project_in: ProjectCreate, db: AsyncSession = Depends(get_db)):
     return await project_crud.create(db, project_in)
 
 
-@router.get("/", response_model=List[ProjectOut])
-async def list_project(db: AsyncSession = Depends(get_db)):
-    res = await db.execute(select(Project).options(selectinload(Project.tasks)))
-    return res.scalars().all()
+@router.get("/", response_model=Page[ProjectOut])
+@query_budget(3)
+async def list_project(
+    page: PageParams = Depends(sortable_page_params("created_at", "updated_at")),
+    project_filter: ProjectFilter = Depends(project_filter_params),
+    selection: FieldSelection = Depends(project_view.params()),
+    db: AsyncSession = Depends(get_read_db),
+):
+    items, next_cursor = await project_crud.get_page(
+        db, page, selection.expand, project_filter
+    )
+    return project_view.render_page(items, next_cursor, selection)
+
+
+# declared before /{project_id} so "search" is not parsed as an id
+@router.get("/search", response_model=List[ProjectOut])
+@query_budget(1)
+async def search_projects(
+    q: str = Query(min_length=1, max_length=255),
+    limit: int = Query(
+        default=settings.search_limit_default, ge=1, le=settings.search_limit_max
+    ),
+    selection: FieldSelection = Depends(project_view.params()),
+    db: AsyncSession = Depends(get_read_db),
+):
+    projects = await project_crud.search(db, q, limit, selection.expand)
+    return project_view.render_many(projects, selection)
 
 
 @router.get("/{project_id}", response_model=ProjectOut)
-async def get_project(project_id: UUID, db: AsyncSession = Depends(get_db)):
-    return await project_crud.get(db, project_id)
+@query_budget(3)
+@coalesce()
+async def get_project(
+    project_id: UUID,
+    selection: FieldSelection = Depends(project_view.params()),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if if_none_match is not None:
+        version = await project_crud.version(db, project_id, selection.expand)
+        if version is not None:
+            tag = etag.compute("project", project_id, version, selection)
+            if etag.none_match(if_none_match, tag):
+                return etag.not_modified(tag)
+
+    project = await project_crud.get(db, project_id, selection.expand)
+    response = project_view.render(project, selection)
+    response.headers["ETag"] = etag.compute(
+        "project",
+        project_id,
+        project_crud.version_of(project, selection.expand),
+        selection,
+    )
+    return response
+
+
+@router.get("/{project_id}/stats", response_model=TaskStats)
+@query_budget(1)
+async def project_stats(project_id: UUID, db: AsyncSession = Depends(get_read_db)):
+    return await project_crud.stats(db, project_id, date.today())
+
+
+@router.get("/{project_id}/events", response_class=StreamingResponse)
+@query_budget(1)  # 404 check; the stream itself runs no SQL
+async def project_events(project_id: UUID, db: AsyncSession = Depends(get_read_db)):
+    """Server-Sent Events for the project and its tasks (``app.core.events``)."""
+    await project_crud.get(db, project_id)  # 404 before the stream starts
+    return event_stream(project_topic(project_id))
 
 
 @router.get("/name/{project_name}", response_model=List[ProjectOut])
-async def get_project_by_name(project_name: str, db: AsyncSession = Depends(get_db)):
-    return await project_crud.get_by_name(db, project_name)
+@query_budget(1)
+async def get_project_by_name(
+    project_name: str,
+    selection: FieldSelection = Depends(project_view.params()),
+    db: AsyncSession = Depends(get_read_db),
+):
+    projects = await project_crud.search(
+        db, project_name, settings.search_limit_default, selection.expand
+    )
+    return project_view.render_many(projects, selection)
 
 
-@router.patch("/{project_id}", response_model=ProjectOut)
+@router.patch("/{project_id}", response_model=ProjectSummary)
+@query_budget(3)
 async def update_project(
-    project_id: UUID, project_in: ProjectUpdate, db: AsyncSession = Depends(get_db)
+    project_id: UUID,
+    project_in: ProjectUpdate,
+    response: Response,
+    if_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_db),
 ):
-    db_project = await project_crud.get(db, project_id)
-    return await project_crud.update(db, db_project, project_in)
-
-
-@router.patch("/{project_id}/assign/{task_id}", response_model=ProjectOut)
+    db_project = await project_crud.get(db, project_id, lock=True)
+    etag.require_match(
+        if_match,
+        etag.compute("project", project_id, project_crud.version_of(db_project)),
+    )
+    project = await project_crud.update(db, db_project, project_in)
+    response.headers["ETag"] = etag.compute(
+        "project", project_id, project_crud.version_of(project)
+    )
+    return project
+
+
+@router.patch("/{project_id}/assign/{task_id}", response_model=ProjectSummary)
+@query_budget(7)
 async def assing_project(
     assign_obj: ProjectAssignTask, db: AsyncSession = Depends(get_db)
 ):
     if assign_obj.task_assign:
-        return await project_crud.add_task(
+        await project_crud.add_task(
             db=db, task_id=assign_obj.task_id, project_id=assign_obj.project_id
         )
     else:
-        return await project_crud.remove_task(
+        await project_crud.remove_task(
             db=db, task_id=assign_obj.task_id, project_id=assign_obj.project_id
         )
+    return await project_crud.get(db, assign_obj.project_id, cached=False)
+
+
+@router.patch("/{project_id}/assign", response_model=ProjectAssignResult)
+@query_budget(8)
+async def assign_tasks(
+    project_id: UUID, assign_in: ProjectAssignTasks, db: AsyncSession = Depends(get_db)
+):
+    if assign_in.task_assign:
+        await project_crud.add_tasks(db, assign_in.task_ids, project_id)
+    else:
+        await project_crud.remove_tasks(db, assign_in.task_ids, project_id)
+    return ProjectAssignResult(
+        project_id=project_id,
+        task_ids=assign_in.task_ids,
+        task_assign=assign_in.task_assign,
+    )
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(4)  # lock, tasks, tombstones, project
 async def delete_project(project_id: UUID, db: AsyncSession = Depends(get_db)):
     await project_crud.remove(db, project_id)
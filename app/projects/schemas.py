@@ -1,8 +1,11 @@
 from uuid import UUID
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
+from app.core.config import settings
+
+from app.core.fieldsets import ExpandableSchema
 from app.tasks.schemas import TaskOut
 
 
@@ -20,17 +23,49 @@ class ProjectUpdate(BaseModel):
     description: str | None
 
 
+class ProjectFilter(BaseModel):
+    """Row selector for ``GET /projects/``; unset fields do not filter."""
+
+    owner_id: UUID | None = None
+    created_after: datetime | None = Field(default=None, description="exclusive")
+    created_before: datetime | None = Field(default=None, description="exclusive")
+    updated_after: datetime | None = Field(default=None, description="exclusive")
+    updated_before: datetime | None = Field(default=None, description="exclusive")
+
+
 class ProjectAssignTask(BaseModel):
     project_id: UUID
     task_id: UUID
     task_assign: bool
 
 
-class ProjectOut(ProjectBase):
+class ProjectAssignTasks(BaseModel):
+    task_ids: list[UUID] = Field(min_length=1, max_length=settings.bulk_max_items)
+    task_assign: bool
+
+
+class ProjectAssignResult(BaseModel):
+    project_id: UUID
+    task_ids: list[UUID]
+    task_assign: bool
+
+
+class ProjectSummary(ProjectBase):
+    """Project columns only – safe to build from an unloaded ORM object."""
+
     id: UUID
     owner_id: UUID
+    task_count: int
+    completed_count: int
     created_at: datetime
     updated_at: datetime
-    tasks: list["TaskOut"] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectOut(ProjectSummary):
+    tasks: list["TaskOut"] = []
+
+
+# `tasks` is only loaded and rendered when asked for via ?expand=tasks
+project_view = ExpandableSchema(ProjectSummary, ProjectOut)
@@ -1,37 +1,245 @@
+import operator
+from datetime import date, datetime, timedelta, timezone
 from uuid import UUID
-from typing import Sequence
+from typing import Any, Sequence
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from pydantic import BaseModel
+from sqlalchemy import (
+    Row,
+    Select,
+    delete,
+    func,
+    insert,
+    select,
+    tuple_,
+    update as sql_update,
+)
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .models import Task
-from .schemas import TaskCreate, TaskUpdate
-from .exceptions import TaskNotFoundError
+from app.core.cache import entity_cache
+from app.core.config import settings
+from app.core.events import change_feed, project_topic, user_topic
+from app.core.exceptions import InvalidCursorError
+from app.core.pagination import PageParams, decode_token, encode_token, paginate
+from app.core.responses import schema_columns
+from app.core.search import search_stmt
+from . import tombstones
+from .models import Task, TaskTombstone
+from .schemas import TaskBulkChanges, TaskCreate, TaskFilter, TaskOut, TaskUpdate
+from .exceptions import (
+    EmptyTaskChangesError,
+    EmptyTaskFilterError,
+    SyncCursorExpiredError,
+    TaskNotFoundError,
+)
 
+from app.projects import counters
+from app.projects.models import Project
 from app.users.models import User
 from app.users.exceptions import UserNotFoundError
 
 
-async def get(db: AsyncSession, task_id: UUID) -> Task:
-    res_task = await db.execute(
-        select(Task)
-        .where(Task.id == task_id)
-        .options(selectinload(Task.owner), selectinload(Task.project))
-    )
-    task: Task | None = res_task.scalar_one_or_none()
+def _invalidate(*tasks: Task) -> None:
+    """Drop the tasks and their parent project/owner from the entity cache."""
+    entity_cache.invalidate(Task, *(t.id for t in tasks))
+    entity_cache.invalidate(Project, *{t.project_id for t in tasks})
+    entity_cache.invalidate(User, *{t.owner_id for t in tasks})
+
+
+def after_remove(*tasks: Any) -> None:
+    """Cache invalidation and ``task.deleted`` events for committed deletions."""
+    _invalidate(*tasks)
+    _publish("task.deleted", *tasks)
+
+
+def _publish(event: str, *tasks: Any, data: bool = False) -> None:
+    """Announce committed writes on the owner's and the project's change feed."""
+    for t in tasks:
+        change_feed.publish(
+            event,
+            t.id,
+            (user_topic(t.owner_id), project_topic(t.project_id)),
+            TaskOut if data else None,
+            t,
+            owner_id=t.owner_id,
+            project_id=t.project_id,
+        )
+
+
+async def get(
+    db: AsyncSession, task_id: UUID, cached: bool = True, lock: bool = False
+) -> Task:
+    """``lock`` reads the row ``FOR UPDATE`` (never cached) for an If-Match check."""
+    stmt = select(Task).where(Task.id == task_id)
+    if lock:
+        stmt = stmt.with_for_update()
+    if cached and not lock:
+        task: Task | None = await entity_cache.get_or_load(db, Task, task_id, stmt)
+    else:
+        task = (await db.execute(stmt)).scalar_one_or_none()
     if task is None:
         raise TaskNotFoundError(ctx={"id": str(task_id)})
     return task
 
 
-async def get_by_name(db: AsyncSession, task_name: str) -> Sequence[Task]:
-    tasks = await db.execute(
-        select(Task)
-        .where(Task.name.ilike(f"%{task_name}%"))
-        .options(selectinload(Task.owner), selectinload(Task.project))
+async def version(db: AsyncSession, task_id: UUID) -> tuple | None:
+    """``updated_at`` only – the ETag version, without loading the row."""
+    res = await db.execute(select(Task.updated_at).where(Task.id == task_id))
+    row = res.one_or_none()
+    return tuple(row) if row is not None else None
+
+
+def version_of(task: Task) -> tuple:
+    return (task.updated_at,)
+
+
+async def get_page(
+    db: AsyncSession, page: PageParams, flt: TaskFilter = TaskFilter()
+) -> tuple[Sequence[Task], str | None]:
+    stmt = select(Task).where(*filter_clauses(Task, flt))
+    return await paginate(db, stmt, Task, page)
+
+
+async def get_page_rows(
+    db: AsyncSession, page: PageParams, flt: TaskFilter = TaskFilter()
+) -> tuple[Sequence[Row], str | None]:
+    """``get_page`` as plain ``TaskOut``-shaped rows, skipping ORM hydration."""
+    stmt = select(*schema_columns(Task.__table__, TaskOut))
+    return await paginate(
+        db, stmt.where(*filter_clauses(Task, flt)), Task, page, as_rows=True
+    )
+
+
+_MAX_ID = UUID(int=(1 << 128) - 1)
+
+Position = tuple[datetime, UUID]
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands timestamps back naive; they are stored in UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _encode_sync_cursor(updated: Position, deleted: Position) -> str:
+    return encode_token(
+        ["changes", *((p[0].isoformat(), str(p[1])) for p in (updated, deleted))]
+    )
+
+
+def _decode_sync_cursor(cursor: str) -> tuple[Position, Position]:
+    try:
+        kind, *positions = decode_token(cursor)
+        if kind != "changes":
+            raise ValueError(f"not a sync cursor: {kind}")
+        updated, deleted = (
+            (_aware(datetime.fromisoformat(ts)), UUID(id_)) for ts, id_ in positions
+        )
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError(ctx={"cursor": cursor}) from exc
+    return updated, deleted
+
+
+def _advance(
+    rows: Sequence[Row], limit: int, key: Any, position: Position, horizon: Position
+) -> tuple[Sequence[Row], Position, bool]:
+    """The page of ``rows`` (``limit + 1`` fetched) and where the next one starts."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        ts, id_ = key(rows[-1])
+        return rows, (_aware(ts), id_), True
+    # drained up to the horizon; never move back past a later position
+    return rows, max(position, horizon), False
+
+
+async def changes(
+    db: AsyncSession,
+    since: str | None,
+    limit: int,
+    owner_id: UUID | None = None,
+) -> tuple[Sequence[Row], Sequence[UUID], str, bool]:
+    """
+    Tasks changed and task ids deleted after the ``since`` cursor (everything,
+    for a first sync), as ``(rows, deleted ids, next cursor, has more)``.
+    Each side is a keyset range scan on its ``(timestamp, id)`` index, so the
+    cost follows the number of changes, not the number of tasks.
+    """
+    now = datetime.now(timezone.utc)
+    horizon = (now - timedelta(seconds=settings.sync_settle_seconds), _MAX_ID)
+    if since is None:
+        # a first sync has nothing to delete: only later tombstones matter
+        updated, deleted = None, horizon
+    else:
+        updated, deleted = _decode_sync_cursor(since)
+        if deleted[0] < tombstones.retention_cutoff(now):
+            raise SyncCursorExpiredError(ctx={"cursor": since})
+
+    task_stmt = (
+        select(*schema_columns(Task.__table__, TaskOut))
+        .where(Task.updated_at <= horizon[0])
+        .order_by(Task.updated_at, Task.id)
+        .limit(limit + 1)
+    )
+    if updated is not None:
+        task_stmt = task_stmt.where(tuple_(Task.updated_at, Task.id) > updated)
+    tomb_stmt = (
+        select(TaskTombstone.task_id, TaskTombstone.deleted_at)
+        .where(
+            TaskTombstone.deleted_at <= horizon[0],
+            tuple_(TaskTombstone.deleted_at, TaskTombstone.task_id) > deleted,
+        )
+        .order_by(TaskTombstone.deleted_at, TaskTombstone.task_id)
+        .limit(limit + 1)
     )
+    if owner_id is not None:
+        task_stmt = task_stmt.where(Task.owner_id == owner_id)
+        tomb_stmt = tomb_stmt.where(TaskTombstone.owner_id == owner_id)
+
+    rows, updated, more_rows = _advance(
+        (await db.execute(task_stmt)).all(),
+        limit,
+        lambda r: (r.updated_at, r.id),
+        updated or (datetime.min.replace(tzinfo=timezone.utc), _MAX_ID),
+        horizon,
+    )
+    dead, deleted, more_dead = _advance(
+        (await db.execute(tomb_stmt)).all(),
+        limit,
+        lambda r: (r.deleted_at, r.task_id),
+        deleted,
+        horizon,
+    )
+    cursor = _encode_sync_cursor(updated, deleted)
+    return rows, [r.task_id for r in dead], cursor, more_rows or more_dead
+
+
+def stats_stmt(parent: type, foreign_key: Any, today: date) -> Select:
+    """
+    One grouped row of ``TaskStats`` counts for a single ``parent`` (filter on
+    its id); the outer join keeps parents without tasks and leaves no row for
+    a missing parent. ``foreign_key`` is the ``Task`` column pointing at it.
+    """
+    week_end = today + timedelta(days=6 - today.weekday())
+    is_open = Task.complete.is_(False)
+    return (
+        select(
+            func.count(Task.id).label("total"),
+            func.count(Task.id).filter(Task.complete.is_(True)).label("completed"),
+            func.count(Task.id).filter(is_open, Task.deadline < today).label("overdue"),
+            func.count(Task.id)
+            .filter(is_open, Task.deadline.between(today, week_end))
+            .label("due_this_week"),
+        )
+        .select_from(parent)
+        .outerjoin(Task, foreign_key == parent.id)
+        .group_by(parent.id)
+    )
+
+
+async def search(db: AsyncSession, term: str, limit: int) -> Sequence[Task]:
+    """Tasks whose name contains ``term``, best match first."""
+    stmt = search_stmt(db.get_bind().dialect.name, Task, "name", term, limit)
+    tasks = await db.execute(stmt)
     return tasks.scalars().all()
 
 
@@ -49,30 +257,173 @@ async def create(db: AsyncSession, obj: TaskCreate) -> Task:
     )
     db.add(db_obj)
     try:
+        await db.flush()
+        await counters.apply(db, counters.tally([db_obj]))
         await db.commit()
     except IntegrityError:
         await db.rollback()
         raise
     await db.refresh(db_obj)
-    await db.refresh(owner)
+    _invalidate(db_obj)
+    _publish("task.created", db_obj, data=True)
     return db_obj
 
 
+async def create_many(db: AsyncSession, objs: Sequence[TaskCreate]) -> Sequence[Task]:
+    """
+    Insert a batch of tasks in one multi-row ``INSERT ... RETURNING``.
+
+    Owners are validated with a single ``IN`` query over the distinct ids; the
+    whole batch is rejected if any owner is unknown.
+    """
+    owner_ids = {obj.owner_id for obj in objs}
+    res_owners = await db.execute(select(User.id).where(User.id.in_(owner_ids)))
+    missing = owner_ids - set(res_owners.scalars())
+    if missing:
+        raise UserNotFoundError(ctx={"ids": sorted(str(id_) for id_ in missing)})
+
+    try:
+        res_tasks = await db.scalars(
+            insert(Task).returning(Task, sort_by_parameter_order=True),
+            [obj.model_dump() for obj in objs],
+        )
+        tasks = res_tasks.all()
+        await counters.apply(db, counters.tally(tasks))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+    _publish("task.created", *tasks, data=True)
+    return tasks
+
+
 async def update(db: AsyncSession, db_obj: Task, obj: TaskUpdate) -> Task:
     if obj.name is not None:
         db_obj.name = obj.name
     if obj.description is not None:
         db_obj.description = obj.description
-    if obj.complete is not None:
-        db_obj.complete = obj.complete
     if obj.set_deadline is not None:
         db_obj.deadline = obj.deadline if obj.set_deadline else None
+    if obj.complete is not None:
+        # decided in SQL: db_obj may be stale, or raced by another request
+        res = await db.execute(
+            sql_update(Task)
+            .where(Task.id == db_obj.id, Task.complete.is_distinct_from(obj.complete))
+            .values(complete=obj.complete)
+            .returning(Task.project_id)
+            .execution_options(synchronize_session=False)
+        )
+        row = res.one_or_none()
+        if row is not None:
+            delta = 1 if obj.complete else -1
+            await counters.apply(db, {row.project_id: (0, delta)})
 
     await db.commit()
     await db.refresh(db_obj)
+    _invalidate(db_obj)
+    _publish("task.updated", db_obj, data=True)
     return db_obj
 
 
 async def remove(db: AsyncSession, db_obj: Task) -> None:
-    await db.delete(db_obj)
+    task_id = db_obj.id
+    res = await db.execute(
+        delete(Task)
+        .where(Task.id == task_id)
+        .returning(Task.id, Task.project_id, Task.owner_id, Task.complete)
+        .execution_options(synchronize_session="fetch")
+    )
+    row = res.one_or_none()
+    if row is None:  # already deleted by another request
+        raise TaskNotFoundError(ctx={"id": str(task_id)})
+    await counters.apply(db, counters.tally([row], -1))
+    await tombstones.record(db, [row])
+    await db.commit()
+    after_remove(row)
+
+
+_BOUNDS = {"_after": operator.gt, "_before": operator.lt}
+
+
+def filter_clauses(model: Any, flt: BaseModel) -> list:
+    """
+    WHERE clauses for the set fields of ``flt``, shared by the list and bulk
+    endpoints of every resource. ``<name>`` tests equality, ``<name>_after`` /
+    ``<name>_before`` are exclusive bounds; ``<name>`` resolves to the column
+    ``<name>`` or ``<name>_at`` of ``model`` (``created_after`` → ``created_at``).
+    """
+    clauses = []
+    for field, value in flt.model_dump(exclude_none=True).items():
+        name, op = field, operator.eq
+        for suffix, bound in _BOUNDS.items():
+            if field.endswith(suffix):
+                name, op = field.removesuffix(suffix), bound
+        column = getattr(model, name, None)
+        if column is None:
+            column = getattr(model, f"{name}_at")
+        clauses.append(
+            column.is_(value) if isinstance(value, bool) else op(column, value)
+        )
+    return clauses
+
+
+def _filter_clauses(flt: TaskFilter) -> list:
+    if flt.is_empty():  # bulk writes never touch every task
+        raise EmptyTaskFilterError()
+    return filter_clauses(Task, flt)
+
+
+async def update_many(
+    db: AsyncSession, flt: TaskFilter, changes: TaskBulkChanges
+) -> Sequence[UUID]:
+    """Apply ``changes`` to every task matching ``flt`` in one UPDATE."""
+    values: dict = {}
+    if changes.complete is not None:
+        values["complete"] = changes.complete
+    if changes.set_deadline is not None:
+        values["deadline"] = changes.deadline if changes.set_deadline else None
+    if not values:
+        raise EmptyTaskChangesError()
+
+    res = await db.execute(
+        sql_update(Task)
+        .where(*_filter_clauses(flt))
+        .values(**values)
+        .returning(Task.id, Task.project_id, Task.owner_id)
+        .execution_options(synchronize_session="fetch")
+    )
+    rows = res.all()
+    if "complete" in values:  # the previous states are unknown: count again
+        await counters.recount(db, {row.project_id for row in rows})
+    await db.commit()
+    _invalidate(*rows)
+    _publish("task.updated", *rows)
+    return [row.id for row in rows]
+
+
+async def delete_where(db: AsyncSession, *where: Any) -> Sequence[Row]:
+    """
+    Delete and tombstone the tasks matching ``where`` in one
+    ``DELETE ... RETURNING``; the rows are what the caller passes to
+    ``after_remove`` once committed. Project and user removal delete their
+    tasks through here rather than the ``ON DELETE CASCADE``, so the
+    tombstones, the cache and the events all follow the same rows.
+    """
+    res = await db.execute(
+        delete(Task)
+        .where(*where)
+        .returning(Task.id, Task.project_id, Task.owner_id, Task.complete)
+        .execution_options(synchronize_session="fetch")
+    )
+    rows = res.all()
+    await tombstones.record(db, rows)
+    return rows
+
+
+async def remove_many(db: AsyncSession, flt: TaskFilter) -> Sequence[UUID]:
+    """Delete every task matching ``flt`` in one DELETE."""
+    rows = await delete_where(db, *_filter_clauses(flt))
+    await counters.apply(db, counters.tally(rows, -1))
     await db.commit()
+    after_remove(*rows)
+    return [row.id for row in rows]
@@ -9,6 +9,7 @@ from app.core.exceptions import (
     ConflictError,
     BadRequestError,
     ForbiddenError,
+    GoneError,
 )
 
 
@@ -49,6 +50,29 @@ class InvalidDeadlineError(BadRequestError, TaskError):
     message = "Deadline must be today or in the future"
 
 
+# ── Bulk operations ─────────────────────────────────────────────
+class EmptyTaskFilterError(BadRequestError, TaskError):
+    """Bulk update/delete without any criterion would touch every task."""
+
+    message = "Bulk operations require at least one filter"
+
+
+class EmptyTaskChangesError(BadRequestError, TaskError):
+    """Bulk update request that would not modify anything."""
+
+    message = "Bulk update requires at least one change"
+
+
+# ── Delta sync ──────────────────────────────────────────────────
+class SyncCursorExpiredError(GoneError, TaskError):
+    """
+    ``/tasks/changes`` cursor older than the tombstone retention: deletions
+    since then may have been compacted away, so the client must resync.
+    """
+
+    message = "Sync cursor expired, start a full sync"
+
+
 # ── Ownership / permission ──────────────────────────────────────
 class TaskOwnerMismatchError(ForbiddenError, TaskError):
     """Acting user is not the owner (or lacks rights)."""
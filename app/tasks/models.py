@@ -5,9 +5,10 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Date, Boolean, String, DateTime, ForeignKey, func
+from sqlalchemy import Date, Boolean, String, DateTime, ForeignKey, Index, func
 
 from app.core.database import Base
+from app.core.search import make_searchable
 
 if TYPE_CHECKING:
     from app.users.models import User
@@ -16,6 +17,21 @@ if TYPE_CHECKING:
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # keyset pagination orders (?sort=), see app.core.pagination
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_updated_at_id", "updated_at", "id"),
+        # one owner's delta sync (GET /tasks/changes?owner_id=)
+        Index("ix_tasks_owner_id_updated_at_id", "owner_id", "updated_at", "id"),
+        Index("ix_tasks_deadline_id", "deadline", "id"),
+        # User.tasks loads + per-owner filters; leading owner_id also serves
+        # plain `owner_id = ?` / `IN (...)`, so no separate single-column index
+        Index(
+            "ix_tasks_owner_id_complete_deadline", "owner_id", "complete", "deadline"
+        ),
+        # Project.tasks loads + per-project progress counts
+        Index("ix_tasks_project_id_complete", "project_id", "complete"),
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
@@ -32,7 +48,8 @@ class Task(Base):
         DateTime(
             timezone=True,
         ),
-        server_default=func.date_trunc("minutes", func.now()),
+        # untruncated: /tasks/changes reads rows by it (see app.tasks.tombstones)
+        server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
     )
@@ -47,3 +64,50 @@ class Task(Base):
     )
 
     project: Mapped["Project | None"] = relationship(back_populates="tasks")
+
+
+make_searchable(Task.__table__, "name")
+
+
+class ReminderWatermark(Base):
+    """
+    Restart point of the deadline reminder scheduler (``app.tasks.reminders``):
+    every open task up to ``(deadline, task_id)`` has been reminded.
+    """
+
+    __tablename__ = "reminder_watermarks"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    deadline: Mapped[datetime.date] = mapped_column(Date, nullable=False)
+    task_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), onupdate=func.now()
+    )
+
+
+class TaskTombstone(Base):
+    """
+    A deleted task, kept so delta sync (``GET /tasks/changes``) can report the
+    deletion; compacted after ``TOMBSTONE_RETENTION_DAYS``. No foreign keys:
+    it outlives the task, its owner and its project.
+    """
+
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_deleted_at_task_id", "deleted_at", "task_id"),
+        Index(
+            "ix_task_tombstones_owner_id_deleted_at_task_id",
+            "owner_id",
+            "deleted_at",
+            "task_id",
+        ),
+    )
+
+    task_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    owner_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    project_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )
+    deleted_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
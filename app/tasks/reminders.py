@@ -0,0 +1,333 @@
+"""
+Deadline reminders.
+
+``ReminderScheduler`` runs inside the API process (started from the lifespan
+in ``app.main``) and emits a ``Reminder`` for every open task
+``REMINDER_LEAD_DAYS`` before its deadline, at 00:00 UTC of that day.
+
+* Every ``REMINDER_SCAN_INTERVAL_SECONDS`` a scan reads the open tasks whose
+  reminder falls within ``REMINDER_LOOKAHEAD_SECONDS``, in keyset batches of
+  ``REMINDER_BATCH_SIZE`` over the ``(deadline, id)`` index, and pushes them
+  onto a heap ordered by due time (at most ``REMINDER_MAX_QUEUED`` entries).
+* The dispatcher sleeps until the head of the heap is due, re-reads the due
+  tasks in one query – completed, deleted or rescheduled tasks are dropped –
+  hands the rest to the sink and advances the watermark.
+* The watermark, the last ``(deadline, id)`` reminded, is stored in
+  ``reminder_watermarks``; after a restart the scan resumes from it instead of
+  reading the table again. Delivery is at-least-once: a crash between the sink
+  and the watermark write repeats that batch. Scans start at the watermark's
+  deadline, so a task created (or rescheduled) with an earlier deadline is
+  never reminded; one on the watermark's own deadline is still picked up while
+  the process runs, but not across a restart if its id sorts before the
+  watermark.
+
+Sinks implement ``ReminderSink``; ``REMINDER_SINK`` names the class to
+instantiate (``module:attribute``). Instances do not coordinate – two would
+send every reminder twice and race on the watermark row – so the scheduler is
+off by default: set ``REMINDERS_ENABLED=true`` in exactly one process per
+database (e.g. a dedicated single-worker instance).
+"""
+
+import asyncio
+import heapq
+import importlib
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Callable, Protocol, Sequence
+from uuid import UUID
+
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import Histogram
+from .models import ReminderWatermark, Task
+
+logger = logging.getLogger(__name__)
+
+# seconds between a reminder's due time and its delivery
+LAG_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+
+
+@dataclass(frozen=True, order=True)
+class Reminder:
+    due_at: datetime
+    deadline: date
+    task_id: UUID
+    owner_id: UUID = field(compare=False)
+    project_id: UUID | None = field(compare=False)
+    name: str = field(compare=False)
+
+
+class ReminderSink(Protocol):
+    async def emit(self, reminders: Sequence[Reminder]) -> None: ...
+
+
+class LogSink:
+    """Default sink: one log line per reminder."""
+
+    async def emit(self, reminders: Sequence[Reminder]) -> None:
+        for r in reminders:
+            logger.info("task %s (%r) is due on %s", r.task_id, r.name, r.deadline)
+
+
+def load_sink(path: str) -> ReminderSink:
+    """Instantiate the sink class named by ``module:attribute``."""
+    module, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module), attr)()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ReminderScheduler:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        sink: ReminderSink,
+        *,
+        lead_days: int = settings.reminder_lead_days,
+        lookahead_seconds: float = settings.reminder_lookahead_seconds,
+        scan_interval: float = settings.reminder_scan_interval_seconds,
+        batch_size: int = settings.reminder_batch_size,
+        max_queued: int = settings.reminder_max_queued,
+        name: str = "deadline_reminders",
+        clock: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        self.session_factory = session_factory
+        self.sink = sink
+        self.lead_days = lead_days
+        self.lookahead = timedelta(seconds=lookahead_seconds)
+        self.scan_interval = scan_interval
+        self.batch_size = batch_size
+        self.max_queued = max_queued
+        self.name = name
+        self._clock = clock
+
+        self._heap: list[Reminder] = []
+        self._queued: set[UUID] = set()
+        # tasks of the watermark's deadline already reminded by this process,
+        # and the watermark loaded at startup (everything up to it went out)
+        self._sent: set[UUID] = set()
+        self._floor: tuple[date, UUID] | None = None
+        self._watermark: tuple[date, UUID] | None = None
+        self._loaded = False
+        self._wake = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+
+        self.scans = self.scanned = self.sent = self.dropped = self.sink_errors = 0
+        self.last_scan_seconds = 0.0
+        self.lag = Histogram(LAG_BUCKETS)
+        self._started_at: float | None = None
+
+    def due_at(self, deadline: date) -> datetime:
+        return datetime.combine(
+            deadline - timedelta(days=self.lead_days), dt_time(), timezone.utc
+        )
+
+    def _pending(self, deadline: date, task_id: UUID) -> bool:
+        if task_id in self._queued or task_id in self._sent:
+            return False
+        return self._floor is None or (deadline, task_id) > self._floor
+
+    async def _load_watermark(self, db: AsyncSession) -> None:
+        row = await db.get(ReminderWatermark, self.name)
+        if row is not None:
+            self._watermark = self._floor = (row.deadline, row.task_id)
+        self._loaded = True
+
+    async def scan(self) -> int:
+        """Queue the open tasks due within the lookahead; returns how many are new."""
+        start = time.perf_counter()
+        now = self._clock()
+        horizon = (now + self.lookahead).date() + timedelta(days=self.lead_days)
+        added = 0
+        async with self.session_factory() as db:
+            if not self._loaded:
+                await self._load_watermark(db)
+            # first run: nothing before today's reminders
+            lowest = (
+                self._watermark[0]
+                if self._watermark is not None
+                else now.date() + timedelta(days=self.lead_days)
+            )
+            stmt = (
+                select(
+                    Task.id, Task.deadline, Task.owner_id, Task.project_id, Task.name
+                )
+                .where(
+                    Task.complete.is_(False),
+                    Task.deadline >= lowest,
+                    Task.deadline <= horizon,
+                )
+                .order_by(Task.deadline, Task.id)
+                .limit(self.batch_size)
+            )
+            after = None
+            while len(self._heap) < self.max_queued:
+                batch = (
+                    stmt
+                    if after is None
+                    else stmt.where(tuple_(Task.deadline, Task.id) > after)
+                )
+                rows = (await db.execute(batch)).all()
+                self.scanned += len(rows)
+                for row in rows:
+                    if not self._pending(row.deadline, row.id):
+                        continue
+                    heapq.heappush(
+                        self._heap,
+                        Reminder(
+                            self.due_at(row.deadline),
+                            row.deadline,
+                            row.id,
+                            row.owner_id,
+                            row.project_id,
+                            row.name,
+                        ),
+                    )
+                    self._queued.add(row.id)
+                    added += 1
+                if len(rows) < self.batch_size:
+                    break
+                after = (rows[-1].deadline, rows[-1].id)
+        self.scans += 1
+        self.last_scan_seconds = time.perf_counter() - start
+        if added:
+            self._wake.set()
+        return added
+
+    async def dispatch_due(self) -> int:
+        """Emit the reminders whose time has come; returns how many were sent."""
+        now = self._clock()
+        due: list[Reminder] = []
+        while self._heap and self._heap[0].due_at <= now:
+            due.append(heapq.heappop(self._heap))
+            if len(due) == self.batch_size:
+                break
+        if not due:
+            return 0
+
+        async with self.session_factory() as db:
+            res = await db.execute(
+                select(Task.id, Task.deadline).where(
+                    Task.id.in_([r.task_id for r in due]), Task.complete.is_(False)
+                )
+            )
+            current = dict(res.tuples().all())
+            fresh = [r for r in due if current.get(r.task_id) == r.deadline]
+            try:
+                if fresh:
+                    await self.sink.emit(fresh)
+            except Exception:
+                self.sink_errors += 1
+                for reminder in due:  # retried on the next attempt
+                    heapq.heappush(self._heap, reminder)
+                raise
+            # a task created late can sort below the watermark: never go back
+            last = (due[-1].deadline, due[-1].task_id)
+            mark = last if self._watermark is None else max(self._watermark, last)
+            await self._save_watermark(db, *mark)
+            await db.commit()
+
+        self._queued.difference_update(r.task_id for r in due)
+        if self._watermark is None or self._watermark[0] != mark[0]:
+            self._sent.clear()
+        self._sent.update(r.task_id for r in fresh if r.deadline == mark[0])
+        self._watermark = mark
+        for reminder in fresh:
+            self.lag.observe((now - reminder.due_at).total_seconds())
+        self.sent += len(fresh)
+        self.dropped += len(due) - len(fresh)
+        return len(fresh)
+
+    async def _save_watermark(
+        self, db: AsyncSession, deadline: date, task_id: UUID
+    ) -> None:
+        res = await db.execute(
+            update(ReminderWatermark)
+            .where(ReminderWatermark.name == self.name)
+            .values(deadline=deadline, task_id=task_id)
+        )
+        if res.rowcount == 0:
+            db.add(
+                ReminderWatermark(name=self.name, deadline=deadline, task_id=task_id)
+            )
+
+    async def _scan_loop(self) -> None:
+        while True:
+            try:
+                await self.scan()
+            except Exception:
+                logger.exception("deadline reminder scan failed")
+            await asyncio.sleep(self.scan_interval)
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            self._wake.clear()
+            now = self._clock()
+            if self._heap and self._heap[0].due_at <= now:
+                try:
+                    await self.dispatch_due()
+                except Exception:
+                    logger.exception("deadline reminder dispatch failed")
+                    await asyncio.sleep(self.scan_interval)
+                continue
+            timeout = self.scan_interval
+            if self._heap:
+                timeout = min(timeout, (self._heap[0].due_at - now).total_seconds())
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._started_at = time.monotonic()
+        self._workers = [
+            asyncio.create_task(self._scan_loop(), name="reminder-scan"),
+            asyncio.create_task(self._dispatch_loop(), name="reminder-dispatch"),
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def stats(self) -> dict:
+        uptime = (
+            time.monotonic() - self._started_at if self._started_at is not None else 0
+        )
+        head = self._heap[0] if self._heap else None
+        return {
+            "running": bool(self._workers),
+            "queued": len(self._heap),
+            "scans": self.scans,
+            "scanned": self.scanned,
+            "last_scan_seconds": self.last_scan_seconds,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "sink_errors": self.sink_errors,
+            "sent_per_second": self.sent / uptime if uptime else 0.0,
+            "next_due_at": head.due_at.isoformat() if head else None,
+            "lag_seconds": self.lag.snapshot(),
+            "watermark": (
+                {
+                    "deadline": str(self._watermark[0]),
+                    "task_id": str(self._watermark[1]),
+                }
+                if self._watermark is not None
+                else None
+            ),
+        }
+
+
+reminder_scheduler = ReminderScheduler(
+    AsyncSessionLocal, load_sink(settings.reminder_sink)
+)
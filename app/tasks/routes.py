@@ -1,48 +1,185 @@
+from datetime import date, datetime
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from app.core.deps import get_db
-from .schemas import TaskOut, TaskCreate, TaskUpdate
-from .models import Task
+from app.core import etag
+from app.core.coalesce import CoalescingRoute, coalesce
+from app.core.config import settings
+from app.core.deps import get_db, get_read_db
+from app.core.pagination import Page, PageParams, sortable_page_params
+from app.core.querybudget import query_budget
+from app.core.responses import json_response, raw_response, row_dicts
+from .schemas import (
+    TaskChanges,
+    TaskOut,
+    TaskCreate,
+    TaskBulkCreate,
+    TaskBulkResult,
+    TaskBulkUpdate,
+    TaskFilter,
+    TaskUpdate,
+)
 from . import crud as task_crud
 
-router = APIRouter(prefix="/tasks", tags=["tasks"])
+router = APIRouter(prefix="/tasks", tags=["tasks"], route_class=CoalescingRoute)
+
+
+def task_filter_params(  # TaskFilter as ?query= parameters
+    owner_id: UUID | None = None,
+    project_id: UUID | None = None,
+    complete: bool | None = None,
+    deadline_after: date | None = None,
+    deadline_before: date | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    updated_after: datetime | None = None,
+    updated_before: datetime | None = None,
+) -> TaskFilter:
+    return TaskFilter(
+        owner_id=owner_id,
+        project_id=project_id,
+        complete=complete,
+        deadline_after=deadline_after,
+        deadline_before=deadline_before,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
 
 
 @router.post("/", response_model=TaskOut, status_code=status.HTTP_201_CREATED)
+@query_budget(3)
 async def create_task(task_in: TaskCreate, db: AsyncSession = Depends(get_db)):
-    return await task_crud.create(db, task_in)
+    task = await task_crud.create(db, task_in)
+    return json_response(TaskOut, task, status_code=status.HTTP_201_CREATED)
+
+
+@router.post("/bulk", response_model=List[TaskOut], status_code=status.HTTP_201_CREATED)
+@query_budget(4)
+async def create_tasks_bulk(
+    bulk_in: TaskBulkCreate, db: AsyncSession = Depends(get_db)
+):
+    tasks = await task_crud.create_many(db, bulk_in.items)
+    return json_response(List[TaskOut], tasks, status_code=status.HTTP_201_CREATED)
+
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+@query_budget(3)
+async def update_tasks_bulk(
+    bulk_in: TaskBulkUpdate, db: AsyncSession = Depends(get_db)
+):
+    ids = await task_crud.update_many(db, bulk_in.filter, bulk_in.changes)
+    return TaskBulkResult(affected=len(ids), ids=ids if bulk_in.return_ids else None)
+
+
+@router.delete("/bulk", response_model=TaskBulkResult)
+@query_budget(4)
+async def delete_tasks_bulk(
+    task_filter: TaskFilter = Depends(task_filter_params),
+    return_ids: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    ids = await task_crud.remove_many(db, task_filter)
+    return TaskBulkResult(affected=len(ids), ids=ids if return_ids else None)
+
+
+@router.get("/", response_model=Page[TaskOut])
+@query_budget(2)
+async def list_tasks(
+    page: PageParams = Depends(
+        sortable_page_params("created_at", "updated_at", "deadline")
+    ),
+    task_filter: TaskFilter = Depends(task_filter_params),
+    db: AsyncSession = Depends(get_read_db),
+):
+    rows, next_cursor = await task_crud.get_page_rows(db, page, task_filter)
+    return raw_response({"items": row_dicts(rows), "next_cursor": next_cursor})
+
+
+@router.get("/changes", response_model=TaskChanges)
+@query_budget(2)
+async def task_changes(
+    since: str | None = Query(default=None),
+    owner_id: UUID | None = None,
+    limit: int = Query(
+        default=settings.page_size_default, ge=1, le=settings.page_size_max
+    ),
+    db: AsyncSession = Depends(get_db),  # a lagging replica would skip changes
+):
+    """Delta sync; a ``since`` older than the tombstone retention is 410 Gone."""
+    rows, deleted, cursor, more = await task_crud.changes(db, since, limit, owner_id)
+    return raw_response(
+        {
+            "items": row_dicts(rows),
+            "deleted": deleted,
+            "next_cursor": cursor,
+            "has_more": more,
+        }
+    )
 
 
-@router.get("/", response_model=List[TaskOut])
-async def list_tasks(db: AsyncSession = Depends(get_db)):
-    res = await db.execute(select(Task))
-    return res.scalars().all()
+@router.get("/search", response_model=List[TaskOut])
+@query_budget(1)
+async def search_tasks(
+    q: str = Query(min_length=1, max_length=255),
+    limit: int = Query(
+        default=settings.search_limit_default, ge=1, le=settings.search_limit_max
+    ),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return json_response(List[TaskOut], await task_crud.search(db, q, limit))
 
 
 @router.get("/name/{task_name}", response_model=List[TaskOut])
-async def get_task_by_name(task_name: str, db: AsyncSession = Depends(get_db)):
-    return await task_crud.get_by_name(db, task_name)
+@query_budget(1)
+async def get_task_by_name(task_name: str, db: AsyncSession = Depends(get_read_db)):
+    tasks = await task_crud.search(db, task_name, settings.search_limit_default)
+    return json_response(List[TaskOut], tasks)
 
 
 @router.get("/id/{task_id}", response_model=TaskOut)
-async def get_task_by_id(task_id: UUID, db: AsyncSession = Depends(get_db)):
-    return await task_crud.get(db, task_id)
+@query_budget(2)
+@coalesce()
+async def get_task_by_id(
+    task_id: UUID,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if if_none_match is not None:
+        version = await task_crud.version(db, task_id)
+        if version is not None:
+            tag = etag.compute("task", task_id, version)
+            if etag.none_match(if_none_match, tag):
+                return etag.not_modified(tag)
+
+    task = await task_crud.get(db, task_id)
+    tag = etag.compute("task", task_id, task_crud.version_of(task))
+    return json_response(TaskOut, task, headers={"ETag": tag})
 
 
 @router.patch("/id/{task_id}", response_model=TaskOut)
+@query_budget(5)  # load, edit, conditional completion, counters, refresh
 async def update_task(
-    task_id: UUID, task_in: TaskUpdate, db: AsyncSession = Depends(get_db)
+    task_id: UUID,
+    task_in: TaskUpdate,
+    if_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_db),
 ):
-    db_task = await task_crud.get(db, task_id)
-    return await task_crud.update(db, db_task, task_in)
+    db_task = await task_crud.get(db, task_id, lock=True)
+    etag.require_match(
+        if_match, etag.compute("task", task_id, task_crud.version_of(db_task))
+    )
+    task = await task_crud.update(db, db_task, task_in)
+    tag = etag.compute("task", task_id, task_crud.version_of(task))
+    return json_response(TaskOut, task, headers={"ETag": tag})
 
 
 @router.delete("/id/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(4)
 async def delete_task(task_id: UUID, db: AsyncSession = Depends(get_db)):
-    db_task = await task_crud.get(db, task_id)
+    db_task = await task_crud.get(db, task_id, cached=False)
     await task_crud.remove(db, db_task)
@@ -3,6 +3,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.core.config import settings
+
 
 class TaskBase(BaseModel):
     name: str
@@ -14,6 +16,10 @@ class TaskCreate(TaskBase):
     owner_id: UUID
 
 
+class TaskBulkCreate(BaseModel):
+    items: list[TaskCreate] = Field(min_length=1, max_length=settings.bulk_max_items)
+
+
 class TaskUpdate(BaseModel):
     name: str | None = Field(default=None, max_length=255)
     description: str | None = None
@@ -22,11 +28,71 @@ class TaskUpdate(BaseModel):
     deadline: date | None = None
 
 
+class TaskFilter(BaseModel):
+    """Row selector for the list and bulk endpoints; unset fields do not filter."""
+
+    owner_id: UUID | None = None
+    project_id: UUID | None = None
+    complete: bool | None = None
+    deadline_after: date | None = Field(default=None, description="exclusive")
+    deadline_before: date | None = Field(default=None, description="exclusive")
+    created_after: datetime | None = Field(default=None, description="exclusive")
+    created_before: datetime | None = Field(default=None, description="exclusive")
+    updated_after: datetime | None = Field(default=None, description="exclusive")
+    updated_before: datetime | None = Field(default=None, description="exclusive")
+
+    def is_empty(self) -> bool:
+        return not self.model_dump(exclude_none=True)
+
+
+class TaskBulkChanges(BaseModel):
+    complete: bool | None = None
+    set_deadline: bool | None = None
+    deadline: date | None = None
+
+
+class TaskBulkUpdate(BaseModel):
+    filter: TaskFilter
+    changes: TaskBulkChanges
+    return_ids: bool = False
+
+
+class TaskBulkResult(BaseModel):
+    affected: int
+    ids: list[UUID] | None = None
+
+
 class TaskOut(TaskBase):
     id: UUID
     complete: bool
     created_at: datetime
     updated_at: datetime
     owner_id: UUID
+    project_id: UUID | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TaskStats(BaseModel):
+    """
+    Task counts of a user or project. ``overdue`` and ``due_this_week`` only
+    count open tasks; the week ends on Sunday.
+    """
+
+    total: int
+    completed: int
+    overdue: int
+    due_this_week: int
+
+
+class TaskChanges(BaseModel):
+    """
+    One page of ``GET /tasks/changes``: tasks created or updated and ids of
+    tasks deleted since the cursor. Pass ``next_cursor`` as ``?since=`` – right
+    away while ``has_more``, on the next sync otherwise.
+    """
+
+    items: list[TaskOut]
+    deleted: list[UUID]
+    next_cursor: str
+    has_more: bool
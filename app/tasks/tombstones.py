@@ -0,0 +1,149 @@
+"""
+Deletion tombstones for delta sync (``GET /tasks/changes``).
+
+Every path that deletes tasks records them in ``task_tombstones`` in the same
+transaction, from the rows its ``DELETE ... RETURNING`` reports: project and
+user removal delete their tasks explicitly (``tasks.crud.delete_where``)
+instead of leaving them to the database cascade. A task that already has a
+tombstone gets it re-stamped instead of a key conflict.
+
+A sync cursor is a pair of keyset positions, ``(updated_at, id)`` over tasks
+and ``(deleted_at, task_id)`` over tombstones, so each sync reads only what
+changed since the last one through the matching indexes. Rows newer than
+``SYNC_SETTLE_SECONDS`` are left for the next sync: ``now()`` is taken when a
+transaction starts, so a write still in flight can commit a timestamp older
+than one already handed out.
+
+``TombstoneCompactor`` deletes tombstones older than
+``TOMBSTONE_RETENTION_DAYS`` every ``TOMBSTONE_COMPACT_INTERVAL_SECONDS``;
+cursors older than that are rejected with 410 and the client resyncs. It is
+idempotent, so running it in every process is harmless.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from .models import TaskTombstone
+
+logger = logging.getLogger(__name__)
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _upsert(db: AsyncSession, stmt: Any) -> Any:
+    """``stmt`` re-stamping the tombstones that already exist for its tasks."""
+    return stmt.on_conflict_do_update(
+        index_elements=[TaskTombstone.task_id],
+        set_={
+            "owner_id": stmt.excluded.owner_id,
+            "project_id": stmt.excluded.project_id,
+            "deleted_at": func.now(),
+        },
+    )
+
+
+def _insert(db: AsyncSession) -> Any:
+    return _INSERTS[db.get_bind().dialect.name](TaskTombstone)
+
+
+async def record(db: AsyncSession, tasks: Iterable[Any]) -> None:
+    """Tombstone ``tasks`` (anything with ``id``/``owner_id``/``project_id``)."""
+    values = [
+        {"task_id": t.id, "owner_id": t.owner_id, "project_id": t.project_id}
+        for t in tasks
+    ]
+    if values:
+        await db.execute(_upsert(db, _insert(db)), values)
+
+
+def retention_cutoff(now: datetime | None = None) -> datetime:
+    """Oldest sync position still covered by the stored tombstones."""
+    now = now or datetime.now(timezone.utc)
+    return now - timedelta(days=settings.tombstone_retention_days)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TombstoneCompactor:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        interval: float = settings.tombstone_compact_interval_seconds,
+        batch_size: int = settings.tombstone_compact_batch_size,
+        clock: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self._clock = clock
+        self._worker: asyncio.Task | None = None
+
+        self.runs = self.compacted = 0
+        self.last_run_seconds = 0.0
+
+    async def compact(self) -> int:
+        """Delete the expired tombstones in batches; returns how many."""
+        start = time.perf_counter()
+        cutoff = retention_cutoff(self._clock())
+        expired = (
+            select(TaskTombstone.task_id)
+            .where(TaskTombstone.deleted_at < cutoff)
+            .limit(self.batch_size)
+        )
+        removed = 0
+        async with self.session_factory() as db:
+            while True:  # short transactions: writers are never held up long
+                res = await db.execute(
+                    delete(TaskTombstone).where(TaskTombstone.task_id.in_(expired))
+                )
+                await db.commit()
+                removed += res.rowcount
+                if res.rowcount < self.batch_size:
+                    break
+        self.runs += 1
+        self.compacted += removed
+        self.last_run_seconds = time.perf_counter() - start
+        return removed
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.compact()
+            except Exception:
+                logger.exception("tombstone compaction failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(
+                self._loop(), name="tombstone-compaction"
+            )
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._worker is not None,
+            "runs": self.runs,
+            "compacted": self.compacted,
+            "last_run_seconds": self.last_run_seconds,
+        }
+
+
+tombstone_compactor = TombstoneCompactor(AsyncSessionLocal)
@@ -1,28 +1,102 @@
+from datetime import date
 from uuid import UUID
+from typing import Collection, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import delete, or_, select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash
+from app.core import etag
+from app.core.cache import entity_cache
+from app.core.pagination import PageParams, paginate
+from app.core.security import get_password_hash, verify_password
+from app.projects import counters, crud as project_crud
+from app.projects.models import Project
+from app.tasks import crud as task_crud
+from app.tasks.models import Task
+from app.tasks.schemas import TaskStats
 from .models import User
-from .schemas import UserCreate, UserUpdate
-from .exceptions import EmailAlreadyExistsError, UserNotFoundError
+from .schemas import UserCreate, UserFilter, UserUpdate
+from .exceptions import (
+    EmailAlreadyExistsError,
+    InvalidCredentialsError,
+    UserNotFoundError,
+)
 
+# ?expand= name -> relationship, turned into a selectinload only when requested
+_EXPANDABLE = {
+    "projects": User.projects,
+    "tasks": User.tasks,
+}
 
-async def get(db: AsyncSession, user_id: UUID) -> User:
-    res_user = await db.execute(
-        select(User)
-        .where(User.id == user_id)
-        .options(selectinload(User.tasks), selectinload(User.projects))
-    )
-    user: User | None = res_user.scalar_one_or_none()
+
+def _load_options(expand: Collection[str]) -> list:
+    return [selectinload(_EXPANDABLE[name]) for name in sorted(expand)]
+
+
+async def get(
+    db: AsyncSession,
+    user_id: UUID,
+    expand: Collection[str] = (),
+    cached: bool = True,
+    lock: bool = False,
+) -> User:
+    """``lock`` reads the row ``FOR UPDATE`` (never cached) for an If-Match check."""
+    stmt = select(User).where(User.id == user_id)
+    if lock:
+        stmt = stmt.with_for_update()
+    if expand or not cached or lock:
+        res_user = await db.execute(stmt.options(*_load_options(expand)))
+        user: User | None = res_user.scalar_one_or_none()
+    else:
+        user = await entity_cache.get_or_load(db, User, user_id, stmt)
     if user is None:
         raise UserNotFoundError(ctx={"id": str(user_id)})
     return user
 
 
+async def version(
+    db: AsyncSession, user_id: UUID, expand: Collection[str] = ()
+) -> tuple | None:
+    """ETag version: ``updated_at`` plus count/max(updated_at) per expansion."""
+    cols = [User.updated_at]
+    if "projects" in expand:
+        cols += etag.child_version_columns(Project, Project.owner_id == User.id)
+    if "tasks" in expand:
+        cols += etag.child_version_columns(Task, Task.owner_id == User.id)
+    res = await db.execute(select(*cols).where(User.id == user_id))
+    row = res.one_or_none()
+    return tuple(row) if row is not None else None
+
+
+def version_of(user: User, expand: Collection[str] = ()) -> tuple:
+    parts = [user.updated_at]
+    if "projects" in expand:
+        parts += etag.child_version(user.projects)
+    if "tasks" in expand:
+        parts += etag.child_version(user.tasks)
+    return tuple(parts)
+
+
+async def get_page(
+    db: AsyncSession,
+    page: PageParams,
+    expand: Collection[str] = (),
+    flt: UserFilter = UserFilter(),
+) -> tuple[Sequence[User], str | None]:
+    stmt = select(User).where(*task_crud.filter_clauses(User, flt))
+    return await paginate(db, stmt.options(*_load_options(expand)), User, page)
+
+
+async def stats(db: AsyncSession, user_id: UUID, today: date) -> TaskStats:
+    stmt = task_crud.stats_stmt(User, Task.owner_id, today).where(User.id == user_id)
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        raise UserNotFoundError(ctx={"id": str(user_id)})
+    return TaskStats(**row._mapping)
+
+
 async def get_by_email(db: AsyncSession, email: str) -> User:
     res_user = await db.execute(
         select(User)
@@ -35,6 +109,26 @@ async def get_by_email(db: AsyncSession, email: str) -> User:
     return user
 
 
+async def authenticate(db: AsyncSession, email: str, password: str) -> User:
+    """
+    Check the credentials; a hash made with an outdated cost factor is
+    replaced by the one computed during verification.
+    """
+    res_user = await db.execute(select(User).where(User.email == email))
+    user: User | None = res_user.scalar_one_or_none()
+    if user is None:
+        raise InvalidCredentialsError()
+
+    valid, new_hash = await verify_password(password, user.hashed_pass)
+    if not valid:
+        raise InvalidCredentialsError()
+    if new_hash is not None:
+        user.hashed_pass = new_hash
+        await db.commit()
+        entity_cache.invalidate(User, user.id)
+    return user
+
+
 async def create(db: AsyncSession, obj: UserCreate) -> User:
 
     res_user = await db.execute(select(User).where(User.email == obj.email))
@@ -45,7 +139,7 @@ async def create(db: AsyncSession, obj: UserCreate) -> User:
     db_obj = User(
         email=obj.email,
         full_name=obj.full_name,
-        hashed_pass=get_password_hash(obj.password),
+        hashed_pass=await get_password_hash(obj.password),
     )
     db.add(db_obj)
     try:
@@ -63,19 +157,49 @@ async def update(db: AsyncSession, db_obj: User, obj: UserUpdate) -> User:
     if obj.email is not None:
         db_obj.email = obj.email
     if obj.password is not None:
-        db_obj.hashed_pass = get_password_hash(str(obj.password))
+        db_obj.hashed_pass = await get_password_hash(str(obj.password))
     if obj.is_active is not None:
         db_obj.is_active = obj.is_active
 
     await db.commit()
-    result = await db.execute(
-        select(User)
-        .where(User.id == db_obj.id)
-        .options(selectinload(User.projects), selectinload(User.tasks))
-    )
-    return result.scalar_one()
+    await db.refresh(db_obj)
+    entity_cache.invalidate(User, db_obj.id)
+    return db_obj
 
 
 async def remove(db: AsyncSession, db_obj: User) -> None:
-    await db.delete(db_obj)
+    """
+    Delete the user, their projects and every task that goes with them: their
+    own tasks and the tasks in their projects, whoever owns those.
+    """
+    user_id = db_obj.id
+    # locked, so no task is assigned to them until they are gone
+    res_projects = await db.execute(
+        select(Project.id, Project.owner_id)
+        .where(Project.owner_id == user_id)
+        .with_for_update()
+    )
+    projects = res_projects.all()
+    project_ids = {p.id for p in projects}
+    tasks = await task_crud.delete_where(
+        db, or_(Task.owner_id == user_id, Task.project_id.in_(project_ids))
+    )
+    # their tasks in other users' projects leave those projects' counters
+    await counters.apply(
+        db,
+        counters.tally([t for t in tasks if t.project_id not in project_ids], -1),
+    )
+    await db.execute(
+        delete(Project)
+        .where(Project.owner_id == user_id)
+        .execution_options(synchronize_session="fetch")
+    )
+    await db.execute(
+        delete(User)
+        .where(User.id == user_id)
+        .execution_options(synchronize_session="fetch")
+    )
     await db.commit()
+    entity_cache.invalidate(User, user_id)
+    task_crud.after_remove(*tasks)
+    project_crud.after_remove(*projects)
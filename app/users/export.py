@@ -0,0 +1,77 @@
+from typing import AsyncIterator
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.projects.models import Project
+from app.projects.schemas import ProjectSummary
+from app.tasks.models import Task
+from app.tasks.schemas import TaskOut
+from .models import User
+from .schemas import UserSummary
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _line(kind: str, item: BaseModel) -> bytes:
+    return b'{"type":"%s","data":%s}\n' % (
+        kind.encode(),
+        item.model_dump_json().encode(),
+    )
+
+
+async def _stream_rows(
+    session: AsyncSession,
+    stmt: Select,
+    kind: str,
+    schema: type[BaseModel],
+    batch_size: int,
+) -> AsyncIterator[bytes]:
+    # server-side cursor; only `batch_size` ORM rows are alive at any time
+    result = await session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        yield b"".join(_line(kind, schema.model_validate(row)) for row in rows)
+
+
+async def export_ndjson(
+    session_factory: async_sessionmaker[AsyncSession],
+    user_id: UUID,
+    batch_size: int = settings.export_batch_size,
+) -> AsyncIterator[bytes]:
+    """
+    Dump a user account as NDJSON: one ``user`` record, then every ``project``,
+    then every ``task`` (tasks carry ``project_id`` for re-linking).
+
+    Records are read through server-side cursors and flushed one batch at a
+    time, so memory stays flat regardless of account size.
+    """
+    async with session_factory() as session:
+        user = await session.get(User, user_id)
+        if user is None:  # deleted between the route's check and now
+            return
+        yield _line("user", UserSummary.model_validate(user))
+
+        async for chunk in _stream_rows(
+            session,
+            select(Project)
+            .where(Project.owner_id == user_id)
+            .order_by(Project.created_at, Project.id),
+            "project",
+            ProjectSummary,
+            batch_size,
+        ):
+            yield chunk
+
+        async for chunk in _stream_rows(
+            session,
+            select(Task)
+            .where(Task.owner_id == user_id)
+            .order_by(Task.created_at, Task.id),
+            "task",
+            TaskOut,
+            batch_size,
+        ):
+            yield chunk
@@ -1,46 +1,145 @@
-from typing import List
+from datetime import date, datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Header, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.deps import get_db  # your session dependency
+from app.core import etag
+from app.core.coalesce import CoalescingRoute, coalesce
+from app.core.deps import get_db, get_read_db, get_read_session_factory
+from app.core.events import event_stream, user_topic
+from app.core.fieldsets import FieldSelection
+from app.core.pagination import Page, PageParams, sortable_page_params
+from app.core.querybudget import query_budget
+from app.tasks.schemas import TaskStats
 from . import crud as user_crud
-from .schemas import UserCreate, UserOut, UserUpdate
-from .models import User
+from .schemas import (
+    UserCreate,
+    UserFilter,
+    UserOut,
+    UserSummary,
+    UserUpdate,
+    user_view,
+)
+from .export import NDJSON_MEDIA_TYPE, export_ndjson
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=CoalescingRoute)
 
 
-@router.post("/", response_model=UserOut, status_code=status.HTTP_201_CREATED)
+def user_filter_params(  # UserFilter as ?query= parameters
+    is_active: bool | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    updated_after: datetime | None = None,
+    updated_before: datetime | None = None,
+) -> UserFilter:
+    return UserFilter(
+        is_active=is_active,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+    )
+
+
+@router.post("/", response_model=UserSummary, status_code=status.HTTP_201_CREATED)
+@query_budget(3)
 async def create_user(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     return await user_crud.create(db, user_in)
 
 
-@router.get("/", response_model=List[UserOut])
-async def list_users(db: AsyncSession = Depends(get_db)):
-    res = await db.execute(
-        select(User).options(selectinload(User.tasks), selectinload(User.projects))
+@router.get("/", response_model=Page[UserOut])
+@query_budget(3)
+async def list_users(
+    page: PageParams = Depends(sortable_page_params("created_at", "updated_at")),
+    user_filter: UserFilter = Depends(user_filter_params),
+    selection: FieldSelection = Depends(user_view.params()),
+    db: AsyncSession = Depends(get_read_db),
+):
+    items, next_cursor = await user_crud.get_page(
+        db, page, selection.expand, user_filter
     )
-    return res.scalars().all()
+    return user_view.render_page(items, next_cursor, selection)
 
 
 @router.get("/{user_id}", response_model=UserOut)
-async def read_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
-    return await user_crud.get(db, user_id)
+@query_budget(3)  # user + expanded projects + tasks
+@coalesce()
+async def read_user(
+    user_id: UUID,
+    selection: FieldSelection = Depends(user_view.params()),
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    if if_none_match is not None:
+        version = await user_crud.version(db, user_id, selection.expand)
+        if version is not None:
+            tag = etag.compute("user", user_id, version, selection)
+            if etag.none_match(if_none_match, tag):
+                return etag.not_modified(tag)
+
+    user = await user_crud.get(db, user_id, selection.expand)
+    response = user_view.render(user, selection)
+    response.headers["ETag"] = etag.compute(
+        "user", user_id, user_crud.version_of(user, selection.expand), selection
+    )
+    return response
+
 
+@router.get("/{user_id}/stats", response_model=TaskStats)
+@query_budget(1)
+async def user_stats(user_id: UUID, db: AsyncSession = Depends(get_read_db)):
+    return await user_crud.stats(db, user_id, date.today())
 
-@router.patch("/{user_id}", response_model=UserOut)
+
+@router.get("/{user_id}/events", response_class=StreamingResponse)
+@query_budget(1)  # 404 check; the stream itself runs no SQL
+async def user_events(user_id: UUID, db: AsyncSession = Depends(get_read_db)):
+    """Server-Sent Events for the user's projects and tasks (``app.core.events``)."""
+    await user_crud.get(db, user_id)  # 404 before the stream starts
+    return event_stream(user_topic(user_id))
+
+
+@router.get("/{user_id}/export", response_class=StreamingResponse)
+@query_budget(4)  # 404 check + the three streamed queries
+async def export_user(
+    user_id: UUID,
+    db: AsyncSession = Depends(get_read_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_read_session_factory
+    ),
+):
+    await user_crud.get(db, user_id)  # 404 before the stream starts
+    return StreamingResponse(
+        export_ndjson(session_factory, user_id),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="user-{user_id}.ndjson"'
+        },
+    )
+
+
+@router.patch("/{user_id}", response_model=UserSummary)
+@query_budget(3)
 async def update_user(
-    user_id: UUID, upd: UserUpdate, db: AsyncSession = Depends(get_db)
+    user_id: UUID,
+    upd: UserUpdate,
+    response: Response,
+    if_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_db),
 ):
-    db_user = await user_crud.get(db, user_id)
-    return await user_crud.update(db, db_user, upd)
+    db_user = await user_crud.get(db, user_id, lock=True)
+    etag.require_match(
+        if_match, etag.compute("user", user_id, user_crud.version_of(db_user))
+    )
+    user = await user_crud.update(db, db_user, upd)
+    response.headers["ETag"] = etag.compute("user", user_id, user_crud.version_of(user))
+    return user
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(7)  # user, projects, tasks, tombstones, counters, two deletes
 async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
-    db_user = await user_crud.get(db, user_id)
+    db_user = await user_crud.get(db, user_id, lock=True)
     await user_crud.remove(db, db_user)
@@ -2,8 +2,9 @@ from datetime import datetime
 from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from app.core.fieldsets import ExpandableSchema
 from app.tasks.schemas import TaskOut
-from app.projects.schemas import ProjectOut
+from app.projects.schemas import ProjectSummary
 
 
 class UserBase(BaseModel):
@@ -16,6 +17,16 @@ class UserCreate(UserBase):
     password: str = Field(min_length=8)
 
 
+class UserFilter(BaseModel):
+    """Row selector for ``GET /users/``; unset fields do not filter."""
+
+    is_active: bool | None = None
+    created_after: datetime | None = Field(default=None, description="exclusive")
+    created_before: datetime | None = Field(default=None, description="exclusive")
+    updated_after: datetime | None = Field(default=None, description="exclusive")
+    updated_before: datetime | None = Field(default=None, description="exclusive")
+
+
 class UserUpdate(BaseModel):
     full_name: str | None = None
     email: EmailStr | None = None
@@ -23,11 +34,20 @@ class UserUpdate(BaseModel):
     is_active: bool | None = None
 
 
-class UserOut(UserBase):
+class UserSummary(UserBase):
+    """User columns only – safe to build from an unloaded ORM object."""
+
     id: UUID
     created_at: datetime
     updated_at: datetime
-    projects: list[ProjectOut] = []
-    tasks: list[TaskOut] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class UserOut(UserSummary):
+    projects: list[ProjectSummary] = []
+    tasks: list[TaskOut] = []
+
+
+# `projects` / `tasks` are only loaded and rendered when asked for via ?expand=
+user_view = ExpandableSchema(UserSummary, UserOut)
@@ -0,0 +1,689 @@
+"""
+Latency, throughput and allocations of every API route on a seeded dataset.
+
+    python -m benchmarks.bench_endpoints [--users 100] [--tasks 1000]
+        [--requests 200] [--concurrency 1] [--only REGEX]
+        [--db-url URL] [--out FILE] [--compare BASELINE.json]
+
+The dataset is generated with the ``tests/factories.py`` factories (values
+only – rows go in with multi-row INSERTs) into a throwaway SQLite file, or
+into ``--db-url`` (use a scratch database: rows are added, never removed).
+Every route is then driven in-process through ``httpx.ASGITransport`` with
+the full middleware stack; each request gets its own session, as in
+production. Per route the report has p50/p95/p99 latency, throughput and,
+from a separate ``tracemalloc`` pass (tracing slows everything down), the
+mean peak allocation per request.
+
+Results are written as JSON (``benchmarks/results/endpoints-<commit>.json``
+by default); ``--compare`` prints the change against an earlier file.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import random
+import re
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Sequence
+from uuid import UUID
+
+import factory.random
+import httpx
+from fastapi.routing import APIRoute
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.cli.load_dataset import seeded_uuid
+from app.core.cache import entity_cache
+from app.core.database import Base, build_engine
+from app.core.deps import (
+    get_db,
+    get_read_db,
+    get_read_session_factory,
+    get_session_factory,
+)
+from app.core.security import hasher
+from app.main import app as fastapi_app
+from app.projects import counters
+from app.projects.models import Project
+from app.tasks import crud as task_crud
+from app.tasks.models import Task
+from app.users.models import User
+from tests.conftest import _sqlite_server_defaults
+from tests.factories import ProjectFactory, TaskFactory, UserFactory
+
+PREFIX = "/api/v1"
+RESULTS_DIR = Path(__file__).parent / "results"
+INSERT_CHUNK = 2_000
+
+
+# ── dataset ─────────────────────────────────────────────────────────────────
+@dataclass
+class Dataset:
+    users: list[UUID] = field(default_factory=list)
+    projects: list[tuple[UUID, UUID]] = field(default_factory=list)  # id, owner
+    tasks: list[tuple[UUID, UUID]] = field(default_factory=list)  # id, owner
+
+
+def _values(factory_cls, **overrides) -> dict[str, Any]:
+    """Column values from a factory, without building related objects."""
+    stub = factory_cls.stub(owner=None, **overrides)
+    return {k: v for k, v in vars(stub).items() if k not in ("owner", "project")}
+
+
+class Seeder:
+    """Multi-row inserts of factory-generated rows; deterministic per ``seed``."""
+
+    def __init__(self, session_factory: async_sessionmaker, seed: int) -> None:
+        self.session_factory = session_factory
+        self.rng = random.Random(seed)
+        factory.random.reseed_random(seed)  # Faker values
+
+    async def _insert(self, model, rows: list[dict]) -> list[UUID]:
+        for row in rows:
+            row["id"] = seeded_uuid(self.rng)
+        async with self.session_factory() as session:
+            for start in range(0, len(rows), INSERT_CHUNK):
+                await session.execute(insert(model), rows[start : start + INSERT_CHUNK])
+            await session.commit()
+        return [row["id"] for row in rows]
+
+    async def users(self, n: int) -> list[UUID]:
+        return await self._insert(User, [_values(UserFactory) for _ in range(n)])
+
+    async def projects(self, owners: Sequence[UUID]) -> list[tuple[UUID, UUID]]:
+        rows = [_values(ProjectFactory, owner_id=owner) for owner in owners]
+        return list(zip(await self._insert(Project, rows), owners))
+
+    async def tasks(
+        self,
+        owners: Sequence[UUID],
+        projects: Sequence[tuple[UUID, UUID]] = (),
+        project_ratio: float = 0.0,
+    ) -> list[tuple[UUID, UUID]]:
+        """One task per entry in ``owners``; some go into one of the owner's projects."""
+        by_owner: dict[UUID, list[UUID]] = {}
+        for project_id, owner in projects:
+            by_owner.setdefault(owner, []).append(project_id)
+        today = datetime.date.today()
+        rows = []
+        for owner in owners:
+            candidates = by_owner.get(owner)
+            project_id = (
+                self.rng.choice(candidates)
+                if candidates and self.rng.random() < project_ratio
+                else None
+            )
+            deadline = (
+                today + datetime.timedelta(days=self.rng.randint(-30, 90))
+                if self.rng.random() < 0.8
+                else None
+            )
+            rows.append(
+                _values(
+                    TaskFactory,
+                    owner_id=owner,
+                    project_id=project_id,
+                    deadline=deadline,
+                    complete=self.rng.random() < 0.4,
+                )
+            )
+        return list(zip(await self._insert(Task, rows), owners))
+
+
+async def seed(seeder: Seeder, users: int, projects_per_user: int, tasks: int):
+    data = Dataset()
+    data.users = await seeder.users(users)
+    data.projects = await seeder.projects(
+        [owner for owner in data.users for _ in range(projects_per_user)]
+    )
+    owners = [seeder.rng.choice(data.users) for _ in range(tasks)]
+    data.tasks = await seeder.tasks(owners, data.projects, project_ratio=0.7)
+    await counters.reconcile(seeder.session_factory)  # rows bypassed the crud layer
+    return data
+
+
+# ── cases ───────────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Call:
+    method: str
+    url: str
+    json: Any = None
+
+
+@dataclass
+class Case:
+    method: str
+    route: str  # path template below PREFIX, as in the router
+    calls: Callable[[Dataset, Seeder, int], Any]  # async -> list[Call]
+    variant: str = ""
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}{self.variant}"
+
+
+def _cycle(items: Sequence, n: int) -> list:
+    return [items[i % len(items)] for i in range(n)]
+
+
+def reads(method: str, route: str, make: Callable, variant: str = "") -> Case:
+    """A case whose ``n`` calls only need the seeded data."""
+
+    async def calls(data: Dataset, seeder: Seeder, n: int) -> list[Call]:
+        return [make(data, i) for i in range(n)]
+
+    return Case(method, route, calls, variant)
+
+
+def _task_body(owner: UUID, i: int) -> dict:
+    return {
+        "name": f"Bench task {i}",
+        "description": "created by the benchmark",
+        "deadline": "2030-01-01",
+        "owner_id": str(owner),
+    }
+
+
+async def _changes_since_now(data, seeder, n):
+    # a client that synced moments ago: the cost of an (empty) delta
+    now = (datetime.datetime.now(datetime.timezone.utc), task_crud._MAX_ID)
+    since = task_crud._encode_sync_cursor(now, now)
+    return [
+        Call("GET", f"/tasks/changes?owner_id={owner}&since={since}")
+        for owner in _cycle(data.users, n)
+    ]
+
+
+async def _delete_tasks(data, seeder, n):
+    victims = await seeder.tasks(_cycle(data.users, n))
+    return [Call("DELETE", f"/tasks/id/{id_}") for id_, _ in victims]
+
+
+async def _delete_tasks_bulk(data, seeder, n):
+    owners = await seeder.users(n)
+    await seeder.tasks([owner for owner in owners for _ in range(10)])
+    return [Call("DELETE", f"/tasks/bulk?owner_id={owner}") for owner in owners]
+
+
+async def _assign_task(data, seeder, n):
+    projects = _cycle(data.projects, n)
+    victims = await seeder.tasks([owner for _, owner in projects])
+    return [
+        Call(
+            "PATCH",
+            f"/projects/{project_id}/assign/{task_id}",
+            {
+                "project_id": str(project_id),
+                "task_id": str(task_id),
+                "task_assign": True,
+            },
+        )
+        for (project_id, _), (task_id, _) in zip(projects, victims)
+    ]
+
+
+async def _assign_tasks(data, seeder, n):
+    projects = _cycle(data.projects, n)
+    victims = await seeder.tasks([owner for _, owner in projects for _ in range(10)])
+    return [
+        Call(
+            "PATCH",
+            f"/projects/{project_id}/assign",
+            {
+                "task_ids": [str(t) for t, _ in victims[i * 10 : i * 10 + 10]],
+                "task_assign": True,
+            },
+        )
+        for i, (project_id, _) in enumerate(projects)
+    ]
+
+
+async def _delete_projects(data, seeder, n):
+    victims = await seeder.projects(_cycle(data.users, n))
+    return [Call("DELETE", f"/projects/{id_}") for id_, _ in victims]
+
+
+async def _delete_users(data, seeder, n):
+    victims = await seeder.users(n)
+    return [Call("DELETE", f"/users/{id_}") for id_ in victims]
+
+
+def _task(data: Dataset, i: int) -> UUID:
+    return data.tasks[i % len(data.tasks)][0]
+
+
+def _project(data: Dataset, i: int) -> UUID:
+    return data.projects[i % len(data.projects)][0]
+
+
+def _user(data: Dataset, i: int) -> UUID:
+    return data.users[i % len(data.users)]
+
+
+# reads first, then writes, then deletes: earlier cases see the seeded data
+CASES = [
+    reads("GET", "/health", lambda d, i: Call("GET", "/health")),
+    reads("GET", "/health/cache", lambda d, i: Call("GET", "/health/cache")),
+    reads("GET", "/health/pool", lambda d, i: Call("GET", "/health/pool")),
+    reads("GET", "/health/reminders", lambda d, i: Call("GET", "/health/reminders")),
+    reads("GET", "/health/events", lambda d, i: Call("GET", "/health/events")),
+    reads("GET", "/health/coalescing", lambda d, i: Call("GET", "/health/coalescing")),
+    reads("GET", "/metrics", lambda d, i: Call("GET", "/metrics")),
+    reads("GET", "/tasks/", lambda d, i: Call("GET", "/tasks/?limit=50")),
+    reads(
+        "GET",
+        "/tasks/",
+        lambda d, i: Call(
+            "GET",
+            f"/tasks/?limit=50&owner_id={_user(d, i)}&complete=false&sort=deadline",
+        ),
+        variant="?owner_id=&complete=false&sort=deadline",
+    ),
+    reads(
+        "GET",
+        "/tasks/",
+        lambda d, i: Call("GET", "/tasks/?limit=50&sort=-updated_at"),
+        variant="?sort=-updated_at",
+    ),
+    reads(
+        "GET",
+        "/tasks/changes",
+        lambda d, i: Call("GET", f"/tasks/changes?owner_id={_user(d, i)}"),
+        variant="?owner_id= (first sync)",
+    ),
+    Case("GET", "/tasks/changes", _changes_since_now, "?owner_id=&since="),
+    reads(
+        "GET", "/tasks/search", lambda d, i: Call("GET", f"/tasks/search?q=Task {i}")
+    ),
+    reads(
+        "GET",
+        "/tasks/name/{task_name}",
+        lambda d, i: Call("GET", f"/tasks/name/Task {i}"),
+    ),
+    reads(
+        "GET",
+        "/tasks/id/{task_id}",
+        lambda d, i: Call("GET", f"/tasks/id/{_task(d, i)}"),
+    ),
+    reads("GET", "/projects/", lambda d, i: Call("GET", "/projects/?limit=50")),
+    reads(
+        "GET",
+        "/projects/",
+        lambda d, i: Call("GET", "/projects/?limit=50&expand=tasks"),
+        variant="?expand=tasks",
+    ),
+    reads(
+        "GET",
+        "/projects/search",
+        lambda d, i: Call("GET", f"/projects/search?q=Project {i}"),
+    ),
+    reads(
+        "GET",
+        "/projects/name/{project_name}",
+        lambda d, i: Call("GET", f"/projects/name/Project {i}"),
+    ),
+    reads(
+        "GET",
+        "/projects/{project_id}",
+        lambda d, i: Call("GET", f"/projects/{_project(d, i)}"),
+    ),
+    reads(
+        "GET",
+        "/projects/{project_id}",
+        lambda d, i: Call("GET", f"/projects/{_project(d, i)}?expand=tasks"),
+        variant="?expand=tasks",
+    ),
+    reads(  # a spike on one project: concurrent calls coalesce
+        "GET",
+        "/projects/{project_id}",
+        lambda d, i: Call("GET", f"/projects/{_project(d, 0)}?expand=tasks"),
+        variant="?expand=tasks (same id)",
+    ),
+    reads(
+        "GET",
+        "/projects/{project_id}/stats",
+        lambda d, i: Call("GET", f"/projects/{_project(d, i)}/stats"),
+    ),
+    reads("GET", "/users/", lambda d, i: Call("GET", "/users/?limit=50")),
+    reads("GET", "/users/{user_id}", lambda d, i: Call("GET", f"/users/{_user(d, i)}")),
+    reads(
+        "GET",
+        "/users/{user_id}",
+        lambda d, i: Call("GET", f"/users/{_user(d, i)}?expand=projects,tasks"),
+        variant="?expand=projects,tasks",
+    ),
+    reads(
+        "GET",
+        "/users/{user_id}/stats",
+        lambda d, i: Call("GET", f"/users/{_user(d, i)}/stats"),
+    ),
+    reads(
+        "GET",
+        "/users/{user_id}/export",
+        lambda d, i: Call("GET", f"/users/{_user(d, i)}/export"),
+    ),
+    reads(
+        "POST",
+        "/tasks/",
+        lambda d, i: Call("POST", "/tasks/", _task_body(_user(d, i), i)),
+    ),
+    reads(
+        "POST",
+        "/tasks/bulk",
+        lambda d, i: Call(
+            "POST",
+            "/tasks/bulk",
+            {"items": [_task_body(_user(d, i), j) for j in range(50)]},
+        ),
+    ),
+    reads(
+        "PATCH",
+        "/tasks/id/{task_id}",
+        lambda d, i: Call(
+            "PATCH", f"/tasks/id/{_task(d, i)}", {"complete": bool(i % 2)}
+        ),
+    ),
+    reads(
+        "PATCH",
+        "/tasks/bulk",
+        lambda d, i: Call(
+            "PATCH",
+            "/tasks/bulk",
+            {
+                "filter": {"owner_id": str(_user(d, i))},
+                "changes": {"complete": bool(i % 2)},
+            },
+        ),
+    ),
+    reads(
+        "POST",
+        "/projects/",
+        lambda d, i: Call(
+            "POST",
+            "/projects/",
+            {
+                "name": f"Bench project {i}",
+                "description": "",
+                "owner_id": str(_user(d, i)),
+            },
+        ),
+    ),
+    reads(
+        "PATCH",
+        "/projects/{project_id}",
+        lambda d, i: Call(
+            "PATCH",
+            f"/projects/{_project(d, i)}",
+            {"name": f"Renamed project {i}", "description": None},
+        ),
+    ),
+    Case("PATCH", "/projects/{project_id}/assign/{task_id}", _assign_task),
+    Case("PATCH", "/projects/{project_id}/assign", _assign_tasks),
+    reads(
+        "POST",
+        "/users/",
+        lambda d, i: Call(
+            "POST",
+            "/users/",
+            {
+                "email": f"bench-{i}-{time.time_ns()}@example.com",
+                "password": "benchmark",
+            },
+        ),
+    ),
+    reads(
+        "PATCH",
+        "/users/{user_id}",
+        lambda d, i: Call("PATCH", f"/users/{_user(d, i)}", {"full_name": f"User {i}"}),
+    ),
+    Case("DELETE", "/tasks/id/{task_id}", _delete_tasks),
+    Case("DELETE", "/tasks/bulk", _delete_tasks_bulk),
+    Case("DELETE", "/projects/{project_id}", _delete_projects),
+    Case("DELETE", "/users/{user_id}", _delete_users),
+]
+
+
+# SSE streams never complete; benchmarks/bench_events.py measures the feed
+ENDLESS_ROUTES = {
+    ("GET", "/users/{user_id}/events"),
+    ("GET", "/projects/{project_id}/events"),
+}
+
+
+def uncovered_routes() -> list[str]:
+    """API routes no case drives – add a case when adding a route."""
+    covered = {(case.method, case.route) for case in CASES} | ENDLESS_ROUTES
+    return sorted(
+        f"{method} {route.path.removeprefix(PREFIX)}"
+        for route in fastapi_app.routes
+        if isinstance(route, APIRoute) and route.path.startswith(PREFIX)
+        for method in route.methods
+        if (method, route.path.removeprefix(PREFIX)) not in covered
+    )
+
+
+# ── measurement ─────────────────────────────────────────────────────────────
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+async def _send(client: httpx.AsyncClient, call: Call) -> httpx.Response:
+    return await client.request(call.method, PREFIX + call.url, json=call.json)
+
+
+async def timed_pass(
+    client: httpx.AsyncClient, calls: Sequence[Call], concurrency: int
+) -> tuple[list[float], int, float]:
+    """(latencies, error count, wall seconds) of sending ``calls``."""
+    latencies: list[float] = []
+    errors = 0
+    pending = iter(calls)
+
+    async def worker() -> None:
+        nonlocal errors
+        for call in pending:  # shared iterator: workers take turns
+            start = time.perf_counter()
+            r = await _send(client, call)
+            latencies.append(time.perf_counter() - start)
+            errors += r.status_code >= 400
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+async def allocation_pass(
+    client: httpx.AsyncClient, calls: Sequence[Call]
+) -> tuple[float, float]:
+    """(mean peak, mean retained) bytes allocated per request."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        for call in calls:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            await _send(client, call)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    return statistics.fmean(peaks), retained / len(calls)
+
+
+async def run_case(client, case: Case, data, seeder, args) -> dict:
+    n_alloc = args.alloc_requests
+    calls = await case.calls(data, seeder, args.warmup + args.requests + n_alloc)
+    warmup, timed, alloc = (
+        calls[: args.warmup],
+        calls[args.warmup : args.warmup + args.requests],
+        calls[args.warmup + args.requests :],
+    )
+    for call in warmup:
+        await _send(client, call)
+    latencies, errors, wall = await timed_pass(client, timed, args.concurrency)
+    peak, retained = await allocation_pass(client, alloc) if alloc else (0.0, 0.0)
+    ms = sorted(s * 1000 for s in latencies)
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+        "mean_ms": statistics.fmean(ms),
+        "throughput_rps": len(ms) / wall,
+        "alloc_peak_kib": peak / 1024,
+        "alloc_retained_kib": retained / 1024,
+    }
+
+
+# ── plumbing ────────────────────────────────────────────────────────────────
+def _commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def use_engine(engine: AsyncEngine) -> async_sessionmaker:
+    """Point the app's session dependencies at ``engine`` (one session per request)."""
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def session():
+        async with session_factory() as s:
+            yield s
+
+    fastapi_app.dependency_overrides[get_db] = session
+    fastapi_app.dependency_overrides[get_read_db] = session
+    fastapi_app.dependency_overrides[get_session_factory] = lambda: session_factory
+    fastapi_app.dependency_overrides[get_read_session_factory] = lambda: session_factory
+    return session_factory
+
+
+@asynccontextmanager
+async def database(db_url: str | None):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(db_url or f"sqlite+aiosqlite:///{tmp}/bench.db")
+        sqlite = engine.dialect.name == "sqlite"
+        try:
+            if sqlite:
+                with _sqlite_server_defaults():
+                    async with engine.begin() as conn:
+                        await conn.run_sync(Base.metadata.create_all)
+            else:
+                async with engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+            yield engine
+        finally:
+            await engine.dispose()
+
+
+def compare(baseline: dict, current: dict) -> None:
+    print(f"\nvs {baseline['meta'].get('commit') or 'baseline'}")
+    print(f"{'route':<48} {'p50':>8} {'p95':>8} {'rps':>8}")
+    for name, now in current["results"].items():
+        then = baseline["results"].get(name)
+        if then is None:
+            continue
+        print(
+            f"{name:<48} "
+            f"{now['p50_ms'] / then['p50_ms'] - 1:>+8.0%} "
+            f"{now['p95_ms'] / then['p95_ms'] - 1:>+8.0%} "
+            f"{now['throughput_rps'] / then['throughput_rps'] - 1:>+8.0%}"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--projects-per-user", type=int, default=5)
+    parser.add_argument("--tasks", type=int, default=1_000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--alloc-requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", help="regex on the case name")
+    parser.add_argument("--no-cache", action="store_true", help="disable entity cache")
+    parser.add_argument("--db-url", help="scratch database (default: temp SQLite)")
+    parser.add_argument("--out", type=Path)
+    parser.add_argument("--compare", type=Path, help="earlier results file")
+    args = parser.parse_args()
+
+    for route in uncovered_routes():
+        print(f"warning: no benchmark case for {route}")
+    cases = [c for c in CASES if not args.only or re.search(args.only, c.name)]
+    entity_cache.enabled = not args.no_cache
+
+    async with database(args.db_url) as engine:
+        seeder = Seeder(use_engine(engine), args.seed)
+        start = time.perf_counter()
+        data = await seed(seeder, args.users, args.projects_per_user, args.tasks)
+        print(
+            f"seeded {len(data.users)} users, {len(data.projects)} projects, "
+            f"{len(data.tasks)} tasks in {time.perf_counter() - start:.1f}s"
+        )
+
+        results = {}
+        transport = httpx.ASGITransport(app=fastapi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+            for case in cases:
+                entity_cache.clear()
+                results[case.name] = r = await run_case(c, case, data, seeder, args)
+                print(
+                    f"{case.name:<48} p50 {r['p50_ms']:7.2f}  p95 {r['p95_ms']:7.2f}  "
+                    f"p99 {r['p99_ms']:7.2f} ms  {r['throughput_rps']:8.0f} req/s  "
+                    f"{r['alloc_peak_kib']:8.1f} KiB"
+                    + (f"  {r['errors']} errors" if r["errors"] else "")
+                )
+        dialect = engine.dialect.name
+    hasher.shutdown()
+    fastapi_app.dependency_overrides.clear()
+
+    commit = _commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "database": dialect,
+            "dataset": {
+                "users": args.users,
+                "projects": len(data.projects),
+                "tasks": args.tasks,
+                "seed": args.seed,
+            },
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "entity_cache": not args.no_cache,
+        },
+        "results": results,
+    }
+    out = args.out or RESULTS_DIR / f"endpoints-{commit or 'local'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"results written to {out}")
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Cost of the SSE change feed (``app.core.events``) with many idle subscribers.
+
+    python -m benchmarks.bench_events [--subscribers 10000] [--events 10000]
+
+* memory per idle subscriber – queue, subscription and the parked stream
+  coroutine waiting for its next frame
+* publish time for an event nobody listens to, one with a single subscriber
+  and one fanned out to ``--fanout`` subscribers of the same project
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+
+from app.core.events import EventBroker, _frames, project_topic, user_topic
+
+
+async def idle_subscribers(broker: EventBroker, n: int) -> list[asyncio.Task]:
+    async def consume(sub):
+        async for _ in _frames(broker, sub, keepalive=3600):
+            pass
+
+    tasks = [
+        asyncio.create_task(consume(broker.subscribe(user_topic(uuid.uuid4()))))
+        for _ in range(n)
+    ]
+    await asyncio.sleep(0)  # let every stream park on its queue
+    return tasks
+
+
+def publish_time(broker: EventBroker, topic, events: int) -> float:
+    start = time.perf_counter()
+    for _ in range(events):
+        broker.publish("task.updated", uuid.uuid4(), (topic,), owner_id=topic[1])
+    return (time.perf_counter() - start) / events
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--fanout", type=int, default=100)
+    args = parser.parse_args()
+
+    broker = EventBroker(queue_size=args.events + 1)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = await idle_subscribers(broker, args.subscribers)
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / args.subscribers
+    tracemalloc.stop()
+
+    single = user_topic(uuid.uuid4())
+    broker.subscribe(single)
+    shared = project_topic(uuid.uuid4())
+    for _ in range(args.fanout):
+        broker.subscribe(shared)
+
+    print(f"{args.subscribers:,} idle subscribers")
+    print(f"  memory per subscriber: {per_subscriber / 1024:8.2f} KiB")
+    for label, topic in (
+        ("no subscriber", user_topic(uuid.uuid4())),
+        ("1 subscriber", single),
+        (f"{args.fanout} subscribers", shared),
+    ):
+        seconds = publish_time(broker, topic, args.events)
+        print(f"  publish, {label:>16}: {seconds * 1e6:8.2f} µs/event")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
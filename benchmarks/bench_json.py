@@ -0,0 +1,110 @@
+"""
+Time a 10k-task listing (fetch + serialize) on each response path.
+
+    python -m benchmarks.bench_json [--rows 10000] [--repeat 5]
+
+* ``response_model`` – ORM entities, FastAPI validation + ``jsonable_encoder``
+  + stdlib ``json`` (what a route returning ORM objects does)
+* ``TypeAdapter``    – ORM entities, ``app.core.responses.json_response``
+* ``column rows``    – ``tasks.crud.get_page_rows`` + ``raw_response``
+"""
+
+import argparse
+import asyncio
+import datetime
+import statistics
+import time
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.main  # noqa: F401  – configures every mapper
+from app.core.database import Base
+from app.core.pagination import PageParams
+from app.core.responses import json_response, raw_response, row_dicts
+from app.tasks import crud as task_crud
+from app.tasks.models import Task
+from app.tasks.schemas import TaskOut
+from app.users.models import User
+from tests.conftest import _sqlite_server_defaults
+
+
+async def seed(rows: int) -> async_sessionmaker:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    with _sqlite_server_defaults():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        owner = User(email="bench@example.com", full_name="Bench", hashed_pass="x")
+        session.add(owner)
+        await session.flush()
+        await session.execute(
+            insert(Task),
+            [
+                {
+                    "name": f"Task {i}",
+                    "description": "Lorem ipsum dolor sit amet, consectetur",
+                    "deadline": datetime.date(2030, 1, 1)
+                    + datetime.timedelta(days=i % 365),
+                    "complete": bool(i % 3),
+                    "owner_id": owner.id,
+                }
+                for i in range(rows)
+            ],
+        )
+        await session.commit()
+    return factory
+
+
+async def response_model(session, rows: int) -> bytes:
+    tasks = (await session.scalars(select(Task).limit(rows))).all()
+    field = create_model_field("Response", List[TaskOut], mode="serialization")
+    content = await serialize_response(field=field, response_content=tasks)
+    return JSONResponse(content).body
+
+
+async def type_adapter(session, rows: int) -> bytes:
+    tasks = (await session.scalars(select(Task).limit(rows))).all()
+    return json_response(List[TaskOut], tasks).body
+
+
+async def column_rows(session, rows: int) -> bytes:
+    items, _ = await task_crud.get_page_rows(session, PageParams(limit=rows))
+    return raw_response(row_dicts(items)).body
+
+
+async def timed(factory, fn, rows: int, repeat: int) -> float:
+    runs = []
+    for i in range(repeat + 1):
+        async with factory() as session:  # fresh identity map every run
+            start = time.perf_counter()
+            await fn(session, rows)
+            if i:  # the first run builds schemas and adapters
+                runs.append(time.perf_counter() - start)
+    return statistics.median(runs)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    factory = await seed(args.rows)
+    results = {
+        fn.__name__: await timed(factory, fn, args.rows, args.repeat)
+        for fn in (response_model, type_adapter, column_rows)
+    }
+    baseline = results["response_model"]
+    print(f"{args.rows} tasks, median of {args.repeat} runs")
+    for name, seconds in results.items():
+        print(f"{name:>15}: {seconds * 1000:8.1f} ms  {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,14 @@
 # tests/conftest.py
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, Iterator
 
 import httpx
+import pytest
 import pytest_asyncio
 from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.schema import DefaultClause
+from sqlalchemy.sql import functions
 from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
@@ -13,16 +17,31 @@ from sqlalchemy.ext.asyncio import (
 )
 from app.core.database import Base  # ← your declarative base
 from app.main import app as fastapi_app
-from app.core.deps import get_db  # ← dependency that returns AsyncSession
+from tests.query_plans import count_statements
+from app.core.cache import entity_cache
+from app.core.config import settings
+from app.core.database import instrument
+from app.core.deps import (
+    get_db,
+    get_read_db,
+    get_read_session_factory,
+    get_session_factory,
+)
 
 TEST_DB_URL = "sqlite+aiosqlite:///:memory:"
 
 
-# ── create a fresh in-memory DB for every *test function* ───────────────────
-@pytest_asyncio.fixture()
-async def async_session() -> AsyncGenerator[AsyncSession, None]:
-    engine = create_async_engine(TEST_DB_URL, echo=False)
+@compiles(functions.now, "sqlite")
+def _sqlite_now(element, compiler, **kw):
+    # the client-side `default=`/`onupdate=func.now()` timestamps; see
+    # _sqlite_server_defaults for why CURRENT_TIMESTAMP does not do
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
 
+
+@contextmanager
+def _sqlite_server_defaults() -> Iterator[None]:
+    """Temporarily swap Postgres-only server defaults for SQLite equivalents."""
+    patched = []
     for table in Base.metadata.sorted_tables:
         for col in table.columns:
             default = col.server_default
@@ -35,14 +54,62 @@ async def async_session() -> AsyncGenerator[AsyncSession, None]:
                 else default.arg.compile(compile_kwargs={"literal_binds": True})  # type: ignore[attr-defined]
             )
 
-            if "date_trunc" in default_sql.lower():
-                col.server_default = DefaultClause(text("CURRENT_TIMESTAMP"))
+            # CURRENT_TIMESTAMP only has 1 s resolution and a different text
+            # layout than the values SQLAlchemy binds, so equality on stored
+            # timestamps (keyset cursors) would never match. Mirror Postgres'
+            # microsecond precision in SQLAlchemy's own storage format instead.
+            if "date_trunc" in default_sql.lower() or "now()" in default_sql.lower():
+                patched.append((col, default))
+                col.server_default = DefaultClause(
+                    text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))")
+                )
+    try:
+        yield
+    finally:  # keep the metadata valid for the Postgres fixtures
+        for col, default in patched:
+            col.server_default = default
+
+
+# ── create a fresh in-memory DB for every *test function* ───────────────────
+@pytest_asyncio.fixture()
+async def async_session() -> AsyncGenerator[AsyncSession, None]:
+    engine = create_async_engine(TEST_DB_URL, echo=False)
 
     # Build tables
+    with _sqlite_server_defaults():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    instrument(engine)  # per-request statement tally, as on the app engines
+
+    # Yield a session bound to this engine
+    SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with SessionLocal() as session:
+        yield session
+
+    await engine.dispose()
+
+
+# ── real PostgreSQL for backend-specific tests (skipped without Docker) ────
+@pytest.fixture(scope="session")
+def postgres_url() -> Iterator[str]:
+    pg = pytest.importorskip("testcontainers.postgres")
+    try:
+        container = pg.PostgresContainer("postgres:16-alpine", driver="asyncpg")
+        container.start()
+    except Exception as exc:  # no Docker daemon in this environment
+        pytest.skip(f"PostgreSQL container unavailable: {exc}")
+    yield container.get_connection_url()
+    container.stop()
+
+
+@pytest_asyncio.fixture()
+async def pg_session(postgres_url) -> AsyncGenerator[AsyncSession, None]:
+    engine = create_async_engine(postgres_url, echo=False)
     async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
 
-    # Yield a session bound to this engine
     SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
     async with SessionLocal() as session:
         yield session
@@ -53,11 +120,50 @@ async def async_session() -> AsyncGenerator[AsyncSession, None]:
 # ── override FastAPI dependency so endpoints use the *same* session ─────────
 @pytest_asyncio.fixture(autouse=True)
 def _override_get_db(async_session):
+    @asynccontextmanager
+    async def _shared_session():
+        yield async_session  # never closed here – the fixture owns it
+
     fastapi_app.dependency_overrides[get_db] = lambda: async_session
+    fastapi_app.dependency_overrides[get_read_db] = lambda: async_session
+    fastapi_app.dependency_overrides[get_session_factory] = lambda: _shared_session
+    fastapi_app.dependency_overrides[get_read_session_factory] = lambda: _shared_session
     yield
     fastapi_app.dependency_overrides.clear()
 
 
+# ── the entity cache is process-wide; start every test cold ────────────────
+@pytest.fixture(autouse=True)
+def _clear_entity_cache():
+    entity_cache.clear()
+    yield
+    entity_cache.clear()
+
+
+# ── route query budgets fail the test instead of logging ───────────────────
+@pytest.fixture(autouse=True)
+def _strict_query_budgets(monkeypatch):
+    monkeypatch.setattr(settings, "query_budget_mode", "raise")
+
+
+@pytest.fixture
+def max_queries(async_session):
+    """
+    ``with max_queries(n): ...`` fails if the block runs more than ``n`` SQL
+    statements on the test database – e.g. around a single ``client`` call.
+    """
+
+    @contextmanager
+    def _budget(limit: int) -> Iterator[list[str]]:
+        with count_statements(async_session) as statements:
+            yield statements
+        assert (
+            len(statements) <= limit
+        ), f"{len(statements)} statements, budget is {limit}:\n" + "\n".join(statements)
+
+    return _budget
+
+
 # ── lightweight async client for hitting endpoints ──────────────────────────
 @pytest_asyncio.fixture()
 async def client():
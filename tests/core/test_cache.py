@@ -0,0 +1,122 @@
+import pytest
+from sqlalchemy import select
+
+from app.core.cache import EntityCache, LRUTTLCache, entity_cache
+from app.projects import crud as project_crud
+from app.tasks import crud as task_crud
+from app.tasks.models import Task
+from app.tasks.schemas import TaskUpdate
+from app.users import crud as user_crud
+from tests.factories import ProjectFactory, TaskFactory
+from tests.query_plans import capture_statements
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = LRUTTLCache(max_entries=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.stats() == {
+        "size": 1,
+        "max_entries": 2,
+        "hits": 2,
+        "misses": 2,
+        "evictions": 1,
+        "expirations": 1,
+    }
+
+
+async def _cold_task(session):
+    project = await ProjectFactory.create_async(session=session)
+    task = await TaskFactory.create_async(
+        session=session, owner=project.owner, project=project
+    )
+    await session.commit()
+    ids = task.id, project.id, project.owner_id
+    session.expunge_all()  # behave like a fresh request session
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_get_is_read_through(async_session):
+    task_id, _, _ = await _cold_task(async_session)
+
+    await task_crud.get(async_session, task_id)
+    async_session.expunge_all()
+    with capture_statements(async_session) as statements:
+        task = await task_crud.get(async_session, task_id)
+
+    assert statements == []
+    assert task.id == task_id
+    assert entity_cache.stats()["hits"] == 1
+
+    # writers load from the database, never from a possibly stale snapshot
+    async_session.expunge_all()
+    with capture_statements(async_session) as statements:
+        await task_crud.get(async_session, task_id, cached=False)
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_task_write_invalidates_task_and_parents(async_session):
+    task_id, project_id, owner_id = await _cold_task(async_session)
+    task = await task_crud.get(async_session, task_id)
+    await project_crud.get(async_session, project_id)
+    await user_crud.get(async_session, owner_id)
+    assert entity_cache.stats()["size"] == 3
+
+    await task_crud.update(async_session, task, TaskUpdate(complete=True))
+    assert entity_cache.stats()["size"] == 0
+
+    async_session.expunge_all()
+    task = await task_crud.get(async_session, task_id)
+    assert task.complete is True
+
+    await task_crud.remove(async_session, task)
+    assert entity_cache.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_assignment_and_owner_delete_invalidate(async_session):
+    task_id, project_id, owner_id = await _cold_task(async_session)
+    await project_crud.remove_task(async_session, task_id, project_id)
+
+    async_session.expunge_all()
+    assert (await task_crud.get(async_session, task_id)).project_id is None
+
+    owner = await user_crud.get(async_session, owner_id)
+    await project_crud.get(async_session, project_id)
+    await user_crud.remove(async_session, owner)
+    assert entity_cache.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_read_racing_a_write_is_not_cached(async_session, monkeypatch):
+    task_id, _, _ = await _cold_task(async_session)
+    cache = EntityCache(LRUTTLCache(max_entries=10, ttl=60))
+    real_execute = async_session.execute
+
+    async def _racing_execute(*args, **kwargs):
+        cache.invalidate(Task, task_id)  # a writer commits mid-read
+        return await real_execute(*args, **kwargs)
+
+    monkeypatch.setattr(async_session, "execute", _racing_execute)
+    stmt = select(Task).where(Task.id == task_id)
+    assert await cache.get_or_load(async_session, Task, task_id, stmt) is not None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from app.core.coalesce import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_run():
+    flight, gate, runs = SingleFlight(), asyncio.Event(), []
+
+    async def load(key):
+        runs.append(key)
+        await gate.wait()
+        return {"key": key}
+
+    calls = [
+        asyncio.create_task(flight.do(key, lambda k=key: load(k), "GET /x"))
+        for key in ("a", "a", "a", "b")
+    ]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*calls)
+
+    assert runs == ["a", "b"]
+    assert [shared for _, shared in results] == [False, True, True, False]
+    assert results[0][0] is results[1][0] is results[2][0]
+    stats = flight.stats()
+    assert (stats["leaders"], stats["collapsed"], stats["in_flight"]) == (2, 2, 0)
+    assert stats["routes"] == {"GET /x": {"leaders": 2, "collapsed": 2}}
+
+    # finished flights are not reused
+    _, shared = await flight.do("a", lambda: load("a"))
+    assert shared is False and runs == ["a", "b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_a_cancelled_leader_keeps_the_run():
+    flight, gate = SingleFlight(), asyncio.Event()
+
+    async def boom():
+        await gate.wait()
+        raise LookupError("missing")
+
+    leader = asyncio.create_task(flight.do("k", boom))
+    follower = asyncio.create_task(flight.do("k", boom))
+    await asyncio.sleep(0)
+    leader.cancel()  # e.g. its client disconnected
+    await asyncio.sleep(0)
+    gate.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    with pytest.raises(LookupError):
+        await follower
+    assert flight.stats()["in_flight"] == 0
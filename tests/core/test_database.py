@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError, TimeoutError as PoolTimeoutError
+
+from app.core import database
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value)
+
+    assert hist.snapshot() == {
+        "buckets": {"0.1": 2, "1.0": 3, "+Inf": 4},
+        "count": 4,
+        "sum": pytest.approx(3.65),
+    }
+
+
+@pytest.mark.asyncio
+async def test_pool_settings_warmup_and_stats(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 2)
+    monkeypatch.setattr(settings, "db_max_overflow", 1)
+    monkeypatch.setattr(settings, "db_pool_timeout", 0.05)
+    engine = database.build_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    try:
+        await database.warm_up(engine, 2)
+        stats = database.pool_stats(engine)
+        assert (stats["size"], stats["checked_in"], stats["checked_out"]) == (2, 2, 0)
+
+        held = [await engine.connect().start() for _ in range(3)]
+        stats = database.pool_stats(engine)
+        assert stats["checked_out"] == 3
+        assert stats["overflow"] == 1
+
+        with pytest.raises(PoolTimeoutError):
+            await engine.connect().start()
+        await asyncio.gather(*(conn.close() for conn in held))
+
+        waits = database.pool_stats(engine)["wait_seconds"]
+        assert waits["count"] == 6  # 2 warm-up + 3 held + 1 timed out
+        assert waits["sum"] >= 0.05
+    finally:
+        await engine.dispose()
+
+
+def test_engine_options_from_settings(monkeypatch):
+    captured = {}
+    monkeypatch.setattr(
+        database, "create_async_engine", lambda url, **kw: captured.update(kw)
+    )
+    monkeypatch.setattr(database, "instrument", lambda engine: None)
+    monkeypatch.setattr(settings, "db_statement_cache_size", 0)
+    monkeypatch.setattr(settings, "db_pool_pre_ping", True)
+
+    database.build_engine("postgresql+asyncpg://u:p@localhost/db")
+    assert captured["connect_args"] == {"prepared_statement_cache_size": 0}
+    assert captured["pool_pre_ping"] is True
+    assert captured["pool_size"] == settings.db_pool_size
+
+    captured.clear()
+    database.build_engine("sqlite+aiosqlite:///:memory:")
+    assert "pool_size" not in captured and "connect_args" not in captured
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_leave_no_timing_state(tmp_path):
+    engine = database.build_engine(f"sqlite+aiosqlite:///{tmp_path / 'errors.db'}")
+    try:
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+            await conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+            for _ in range(3):
+                with pytest.raises(IntegrityError):
+                    await conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+            await conn.exec_driver_sql("SELECT 1")
+            assert "query_start" not in (await conn.get_raw_connection()).info
+    finally:
+        await engine.dispose()
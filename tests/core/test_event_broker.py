@@ -0,0 +1,112 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.events import (
+    EVICTED_FRAME,
+    EventBroker,
+    _frames,
+    project_topic,
+    user_topic,
+)
+
+
+def _drain(sub) -> list[bytes]:
+    frames = []
+    while not sub.queue.empty():
+        frames.append(sub.queue.get_nowait())
+    return frames
+
+
+def test_publish_reaches_only_subscribers_of_the_topics():
+    broker = EventBroker(queue_size=10)
+    user, project = uuid.uuid4(), uuid.uuid4()
+    by_user = broker.subscribe(user_topic(user))
+    by_project = broker.subscribe(project_topic(project))
+    other = broker.subscribe(user_topic(uuid.uuid4()))
+
+    task_id = uuid.uuid4()
+    broker.publish(
+        "task.created",
+        task_id,
+        (user_topic(user), project_topic(project)),
+        owner_id=user,
+    )
+    broker.publish("task.deleted", uuid.uuid4(), (user_topic(user), None))
+
+    frame, deleted = _drain(by_user)
+    assert frame.startswith(b"id: 1\nevent: task.created\ndata: {")
+    assert str(task_id).encode() in frame and frame.endswith(b"\n\n")
+    assert b"event: task.deleted" in deleted
+    assert _drain(by_project) == [frame]  # encoded once, shared
+    assert _drain(other) == []
+    assert broker.stats()["delivered"] == 3
+
+
+def test_data_is_only_serialized_when_someone_listens():
+    class Exploding:
+        def __getattr__(self, name):
+            raise AssertionError("serialized without subscribers")
+
+    broker = EventBroker(queue_size=10)
+    broker.publish(
+        "task.updated", uuid.uuid4(), (user_topic(uuid.uuid4()),), dict, Exploding()
+    )
+    assert broker.stats() == {
+        "subscribers": 0,
+        "topics": 0,
+        "published": 1,
+        "delivered": 0,
+        "evicted": 0,
+    }
+
+
+def test_slow_consumer_is_evicted_and_its_backlog_dropped():
+    broker = EventBroker(queue_size=2)
+    topic = user_topic(uuid.uuid4())
+    slow = broker.subscribe(topic)
+    for _ in range(3):
+        broker.publish("task.updated", uuid.uuid4(), (topic,))
+
+    assert _drain(slow) == [EVICTED_FRAME]
+    assert broker.stats()["subscribers"] == 0
+    assert broker.stats()["evicted"] == 1
+
+    broker.publish("task.updated", uuid.uuid4(), (topic,))
+    assert _drain(slow) == []
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_keepalives_and_ends_after_eviction():
+    broker = EventBroker(queue_size=1)
+    topic = project_topic(uuid.uuid4())
+    sub = broker.subscribe(topic)
+    stream = _frames(broker, sub, keepalive=0.01)
+
+    assert (await anext(stream)).startswith(b"retry:")
+    assert await anext(stream) == b": keepalive\n\n"
+
+    broker.publish("project.updated", uuid.uuid4(), (topic,))
+    assert b"event: project.updated" in await anext(stream)
+
+    for _ in range(2):
+        broker.publish("project.updated", uuid.uuid4(), (topic,))
+    assert await anext(stream) == EVICTED_FRAME
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+
+
+@pytest.mark.asyncio
+async def test_closed_stream_unsubscribes():
+    broker = EventBroker(queue_size=4)
+    sub = broker.subscribe(user_topic(uuid.uuid4()))
+    stream = _frames(broker, sub, keepalive=60)
+    await anext(stream)
+    pending = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+    pending.cancel()  # the client went away
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    await stream.aclose()
+    assert broker.stats()["subscribers"] == 0
@@ -0,0 +1,65 @@
+import pytest
+
+from app.core import querybudget
+from app.core.config import settings
+from app.core.metrics import RequestStats
+from app.core.querybudget import QueryBudgetError, query_budget
+
+SELECT_TASK = "SELECT tasks.id FROM tasks WHERE tasks.owner_id = ?"
+
+
+@query_budget(2)
+async def endpoint():  # pragma: no cover - never called
+    pass
+
+
+def _stats(*statements: str) -> RequestStats:
+    stats = RequestStats()
+    for statement in statements:
+        stats.note(statement, 0.001)
+    return stats
+
+
+def test_within_budget_passes():
+    querybudget.check("GET /x", endpoint, _stats(SELECT_TASK, "UPDATE tasks SET x=?"))
+
+
+def test_over_budget_raises():
+    with pytest.raises(QueryBudgetError, match="3 statements, budget is 2"):
+        querybudget.check("GET /x", endpoint, _stats(*["UPDATE t SET x=?"] * 3))
+
+
+def test_repeated_select_shape_is_flagged_as_n_plus_one(monkeypatch):
+    monkeypatch.setattr(settings, "n_plus_one_threshold", 3)
+    # IN lists of different lengths are the same shape
+    stats = _stats(
+        *[SELECT_TASK] * 3,
+        "SELECT a FROM b WHERE a IN (?)",
+        "SELECT a FROM b WHERE a IN (?, ?)"
+    )
+    assert querybudget.violations(stats, None) == []
+
+    stats.note(SELECT_TASK, 0.001)
+    (problem,) = querybudget.violations(stats, None)
+    assert problem.startswith("N+1: 4x SELECT tasks.id FROM tasks")
+
+
+def test_unbudgeted_routes_use_the_default(monkeypatch):
+    async def plain():  # pragma: no cover
+        pass
+
+    assert querybudget.budget_for(plain) is None
+    monkeypatch.setattr(settings, "query_budget_default", 1)
+    assert querybudget.budget_for(plain) == 1
+    assert querybudget.budget_for(endpoint) == 2
+
+
+def test_warn_mode_logs(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "query_budget_mode", "warn")
+    querybudget.check("GET /x", endpoint, _stats(*["UPDATE t SET x=?"] * 3))
+    assert "GET /x: 3 statements, budget is 2" in caplog.text
+
+    caplog.clear()
+    monkeypatch.setattr(settings, "query_budget_mode", "off")
+    querybudget.check("GET /x", endpoint, _stats(*["UPDATE t SET x=?"] * 3))
+    assert caplog.text == ""
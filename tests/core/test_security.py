@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.security import PasswordHasher
+from app.users import crud as user_crud
+from app.users.exceptions import InvalidCredentialsError
+from tests.factories import UserFactory
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_the_loop():
+    hasher = PasswordHasher(rounds=12, workers=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    hashed = await hasher.hash("correct-horse")
+    elapsed = time.perf_counter() - start
+    task.cancel()
+    hasher.shutdown()
+
+    assert hashed.startswith("$2b$12$")
+    # the loop kept running while bcrypt was busy in the pool
+    assert ticks >= elapsed / 0.01 / 2
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_and_queue_depth():
+    hasher = PasswordHasher(rounds=10, workers=4, max_concurrency=1)
+    jobs = [asyncio.create_task(hasher.hash(f"pw-{i}")) for i in range(3)]
+    await asyncio.sleep(0)  # let every job reach the semaphore
+
+    assert hasher.stats()["running"] == 1
+    assert hasher.stats()["queued"] == 2
+
+    await asyncio.gather(*jobs)
+    assert hasher.stats() == {
+        "queued": 0,
+        "running": 0,
+        "completed": 3,
+        "max_concurrency": 1,
+    }
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_verify_flags_outdated_cost():
+    old = PasswordHasher(rounds=4)
+    new = PasswordHasher(rounds=5)
+    hashed = await old.hash("correct-horse")
+
+    assert await old.verify("correct-horse", hashed) == (True, None)
+    assert await new.verify("wrong-horse", hashed) == (False, None)
+    valid, rehashed = await new.verify("correct-horse", hashed)
+    assert valid and rehashed.startswith("$2b$05$")
+    old.shutdown()
+    new.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_rehashes_on_cost_change(async_session, monkeypatch):
+    monkeypatch.setattr("app.core.security.hasher", PasswordHasher(rounds=4))
+    user = await UserFactory.create_async(session=async_session)
+    user.hashed_pass = await PasswordHasher(rounds=5).hash("correct-horse")
+    await async_session.flush()
+
+    with pytest.raises(InvalidCredentialsError):
+        await user_crud.authenticate(async_session, user.email, "wrong-horse")
+    with pytest.raises(InvalidCredentialsError):
+        await user_crud.authenticate(async_session, "nobody@example.com", "x")
+
+    authed = await user_crud.authenticate(async_session, user.email, "correct-horse")
+    assert authed.id == user.id
+    assert authed.hashed_pass.startswith("$2b$04$")
@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.projects import counters
+from app.projects.models import Project
+from app.tasks import crud as task_crud
+from app.tasks.exceptions import TaskNotFoundError
+from app.tasks.schemas import TaskUpdate
+from tests.factories import ProjectFactory, TaskFactory
+
+
+@pytest.mark.asyncio
+async def test_reconcile_rebuilds_drifted_counters_in_batches(async_session):
+    projects = [
+        await ProjectFactory.create_async(session=async_session) for _ in range(5)
+    ]
+    for i, project in enumerate(projects):
+        for j in range(i):
+            await TaskFactory.create_async(
+                session=async_session,
+                owner=project.owner,
+                project=project,
+                complete=j % 2 == 0,
+            )
+    # factories bypass the crud layer: every project with tasks has drifted
+    await async_session.execute(
+        update(Project).where(Project.id == projects[0].id).values(task_count=7)
+    )
+    await async_session.commit()
+    expected = {p.id: (i, (i + 1) // 2) for i, p in enumerate(projects)}
+
+    factory = async_sessionmaker(async_session.bind, expire_on_commit=False)
+    assert await counters.reconcile(factory, batch_size=2) == (5, 5)
+    assert await counters.reconcile(factory, batch_size=2) == (5, 0)
+
+    res = await async_session.execute(
+        select(Project.id, Project.task_count, Project.completed_count)
+    )
+    got = {row.id: (row.task_count, row.completed_count) for row in res}
+    assert got == expected
+
+
+@pytest.mark.asyncio
+async def test_apply_updates_projects_loaded_in_the_session(async_session):
+    project = await ProjectFactory.create_async(session=async_session)
+    other = await ProjectFactory.create_async(session=async_session)
+    updated_at = project.updated_at
+
+    await counters.apply(async_session, {project.id: (3, 1), other.id: (1, 0)})
+    await counters.apply(async_session, {project.id: (-1, 1), None: (5, 5)})
+
+    assert (project.task_count, project.completed_count) == (2, 2)
+    assert (other.task_count, other.completed_count) == (1, 0)
+    assert project.updated_at == updated_at
+
+
+@pytest.mark.asyncio
+async def test_stale_task_writes_count_only_rows_they_change(async_session):
+    project = await ProjectFactory.create_async(session=async_session)
+    task = await TaskFactory.create_async(
+        session=async_session, owner=project.owner, project=project
+    )
+    await counters.recount(async_session, {project.id})
+    await async_session.commit()
+
+    async def counted():
+        await async_session.refresh(project)
+        return project.task_count, project.completed_count
+
+    await task_crud.update(async_session, task, TaskUpdate(complete=True))
+    assert await counted() == (1, 1)
+    # a copy loaded before that write, e.g. by a concurrent request
+    set_committed_value(task, "complete", False)
+    await task_crud.update(async_session, task, TaskUpdate(complete=True))
+    assert await counted() == (1, 1)
+
+    await task_crud.remove(async_session, task)
+    assert await counted() == (0, 0)
+    with pytest.raises(TaskNotFoundError):
+        await task_crud.remove(async_session, task)
+    assert await counted() == (0, 0)
@@ -0,0 +1,106 @@
+import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.core.pagination import PageParams
+from app.projects import crud as project_crud
+from app.projects.schemas import ProjectFilter
+from app.tasks import crud as task_crud
+from app.tasks.models import Task
+from app.tasks.schemas import TaskFilter
+from app.users import crud as user_crud
+from tests.factories import ProjectFactory, TaskFactory, UserFactory
+from tests.query_plans import capture_statements, full_scans
+
+
+async def _seed(session):
+    user = await UserFactory.create_async(session=session)
+    project = await ProjectFactory.create_async(session=session, owner=user)
+    tasks = [
+        await TaskFactory.create_async(
+            session=session,
+            owner=user,
+            project=project if i % 2 else None,
+            deadline=datetime.date(2030, 1, 1 + i),
+        )
+        for i in range(3)
+    ]
+    return user, project, tasks[0]
+
+
+async def _hot_queries(session, user, project, task):
+    """The crud reads every request path leans on."""
+    await user_crud.get(session, user.id, expand={"projects", "tasks"})
+    await project_crud.get(session, project.id, expand={"tasks"})
+    await task_crud.get(session, task.id)
+    await user_crud.stats(session, user.id, datetime.date(2030, 1, 2))
+    await project_crud.stats(session, project.id, datetime.date(2030, 1, 2))
+
+    _, cursor = await task_crud.get_page(session, PageParams(limit=1))
+    await task_crud.get_page(session, PageParams(limit=1, cursor=cursor))
+    await user_crud.get_page(session, PageParams(limit=10))
+    await project_crud.get_page(session, PageParams(limit=10))
+
+    # ?sort= orders, including a cursor on each side of the NULL deadlines
+    for sort in ("updated_at", "-updated_at", "deadline", "-deadline"):
+        _, cursor = await task_crud.get_page(session, PageParams(limit=2, sort=sort))
+        await task_crud.get_page(session, PageParams(2, cursor, sort))
+    await task_crud.get_page(
+        session,
+        PageParams(limit=10, sort="-deadline"),
+        TaskFilter(owner_id=user.id, complete=False),
+    )
+    await project_crud.get_page(
+        session, PageParams(limit=10, sort="-updated_at"), flt=ProjectFilter()
+    )
+
+    # delta sync: everything, then one owner's changes since a cursor
+    _, _, cursor, _ = await task_crud.changes(session, None, 2)
+    await task_crud.changes(session, cursor, 2)
+    await task_crud.changes(session, cursor, 2, owner_id=user.id)
+
+    # open work for one owner, due soonest – the (owner_id, complete, deadline) shape
+    await session.execute(
+        select(Task)
+        .where(
+            Task.owner_id == user.id,
+            Task.complete.is_(False),
+            Task.deadline < datetime.date(2030, 1, 3),
+        )
+        .order_by(Task.deadline)
+    )
+
+
+@pytest.mark.asyncio
+async def test_hot_queries_use_indexes_sqlite(async_session):
+    seeded = await _seed(async_session)
+    async_session.expunge_all()  # force the crud code to hit the database
+
+    with capture_statements(async_session) as statements:
+        await _hot_queries(async_session, *seeded)
+
+    assert len(statements) >= 8
+    assert await full_scans(async_session, statements) == []
+
+
+@pytest.mark.asyncio
+async def test_hot_queries_use_indexes_postgres(pg_session):
+    seeded = await _seed(pg_session)
+    pg_session.expunge_all()
+
+    with capture_statements(pg_session) as statements:
+        await _hot_queries(pg_session, *seeded)
+
+    assert await full_scans(pg_session, statements) == []
+
+
+@pytest.mark.asyncio
+async def test_harness_flags_unindexed_filter(async_session):
+    await _seed(async_session)
+
+    with capture_statements(async_session) as statements:
+        await async_session.execute(select(Task).where(Task.description == "x"))
+
+    (offender,) = await full_scans(async_session, statements)
+    assert offender.startswith("tasks:")
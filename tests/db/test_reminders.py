@@ -0,0 +1,206 @@
+import asyncio
+import datetime
+import uuid
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.tasks.models import ReminderWatermark, Task
+from app.tasks.reminders import ReminderScheduler
+from tests.factories import TaskFactory
+
+TODAY = datetime.date(2030, 1, 10)
+
+
+class ListSink:
+    def __init__(self) -> None:
+        self.received = []
+        self.fail = False
+
+    async def emit(self, reminders):
+        if self.fail:
+            raise RuntimeError("sink down")
+        self.received.extend(reminders)
+
+
+class Clock:
+    def __init__(self, now: datetime.datetime) -> None:
+        self.now = now
+
+    def __call__(self) -> datetime.datetime:
+        return self.now
+
+
+def _scheduler(session, sink, clock, **kwargs):
+    factory = async_sessionmaker(session.bind, expire_on_commit=False)
+    kwargs = {"lead_days": 1, "lookahead_seconds": 3600, "batch_size": 2, **kwargs}
+    return ReminderScheduler(factory, sink, clock=clock, **kwargs)
+
+
+def _at(day: datetime.date, hour: int = 0) -> datetime.datetime:
+    return datetime.datetime.combine(
+        day, datetime.time(hour), tzinfo=datetime.timezone.utc
+    )
+
+
+async def _task(session, deadline, **kwargs):
+    task = await TaskFactory.create_async(session=session, deadline=deadline, **kwargs)
+    await session.commit()  # the scheduler reads through its own sessions
+    return task
+
+
+@pytest.mark.asyncio
+async def test_reminders_go_out_once_lead_days_before_the_deadline(async_session):
+    tomorrow = TODAY + datetime.timedelta(days=1)
+    due = [await _task(async_session, tomorrow) for _ in range(3)]
+    await _task(async_session, tomorrow, complete=True)
+    later = await _task(async_session, TODAY + datetime.timedelta(days=5))
+    await _task(async_session, TODAY - datetime.timedelta(days=3))  # long overdue
+    sink, clock = ListSink(), Clock(_at(TODAY, 8))
+    scheduler = _scheduler(async_session, sink, clock)
+
+    assert await scheduler.scan() == 3  # batches of 2, only the reminders due now
+    assert await scheduler.scan() == 0  # already queued
+    assert await scheduler.dispatch_due() == 2
+    assert await scheduler.dispatch_due() == 1
+    assert await scheduler.dispatch_due() == 0
+    assert {r.task_id for r in sink.received} == {t.id for t in due}
+    assert later.id not in {r.task_id for r in sink.received}
+
+    stats = scheduler.stats()
+    assert (stats["sent"], stats["queued"], stats["dropped"]) == (3, 0, 0)
+    assert stats["lag_seconds"]["count"] == 3
+    assert stats["lag_seconds"]["sum"] == pytest.approx(3 * 8 * 3600)
+    last = max(due, key=lambda t: t.id)
+    assert stats["watermark"] == {"deadline": str(tomorrow), "task_id": str(last.id)}
+
+    await scheduler.scan()  # nothing is reminded twice
+    assert await scheduler.dispatch_due() == 0
+
+    # the reminder for a day that already went out still catches new tasks
+    late = await _task(async_session, tomorrow)
+    assert await scheduler.scan() == 1
+    assert await scheduler.dispatch_due() == 1
+    assert sink.received[-1].task_id == late.id
+
+
+@pytest.mark.asyncio
+async def test_restart_resumes_from_the_stored_watermark(async_session):
+    tomorrow = TODAY + datetime.timedelta(days=1)
+    tasks = [await _task(async_session, tomorrow) for _ in range(4)]
+    await _task(async_session, TODAY - datetime.timedelta(days=1))
+    clock = Clock(_at(TODAY))
+    first = _scheduler(async_session, ListSink(), clock)
+    await first.scan()
+    await first.dispatch_due()  # two of four, then "crash"
+
+    (stored,) = (await async_session.execute(select(ReminderWatermark))).scalars()
+    sent = {r.task_id for r in first.sink.received}
+    assert stored.deadline == tomorrow and stored.task_id == max(sent)
+
+    second = _scheduler(async_session, ListSink(), clock)
+    await second.scan()
+    while await second.dispatch_due():
+        pass
+    resent = {r.task_id for r in second.sink.received}
+    assert resent == {t.id for t in tasks} - sent
+
+    # a later restart reads from the watermark's deadline on, not older tasks
+    clock.now = _at(TODAY + datetime.timedelta(days=1))
+    third = _scheduler(async_session, ListSink(), clock)
+    assert await third.scan() == 0
+    assert third.stats()["scanned"] == len(tasks)
+
+
+@pytest.mark.asyncio
+async def test_completed_and_rescheduled_tasks_are_dropped(async_session):
+    tomorrow = TODAY + datetime.timedelta(days=1)
+    done, moved, kept = [await _task(async_session, tomorrow) for _ in range(3)]
+    scheduler = _scheduler(async_session, ListSink(), Clock(_at(TODAY)), batch_size=10)
+    await scheduler.scan()
+
+    await async_session.execute(
+        update(Task).where(Task.id == done.id).values(complete=True)
+    )
+    await async_session.execute(
+        update(Task)
+        .where(Task.id == moved.id)
+        .values(deadline=TODAY + datetime.timedelta(days=2))
+    )
+    await async_session.commit()
+
+    assert await scheduler.dispatch_due() == 1
+    assert [r.task_id for r in scheduler.sink.received] == [kept.id]
+    assert scheduler.stats()["dropped"] == 2
+
+    # the moved task is reminded again on its new date
+    scheduler._clock.now = _at(TODAY + datetime.timedelta(days=1))
+    assert await scheduler.scan() == 1
+    assert await scheduler.dispatch_due() == 1
+    assert scheduler.sink.received[-1].task_id == moved.id
+
+
+@pytest.mark.asyncio
+async def test_failed_sink_keeps_reminders_queued(async_session):
+    task = await _task(async_session, TODAY + datetime.timedelta(days=1))
+    sink = ListSink()
+    scheduler = _scheduler(async_session, sink, Clock(_at(TODAY)))
+    await scheduler.scan()
+
+    sink.fail = True
+    with pytest.raises(RuntimeError):
+        await scheduler.dispatch_due()
+    assert scheduler.stats()["queued"] == 1
+    assert scheduler.stats()["sink_errors"] == 1
+    assert (await async_session.execute(select(ReminderWatermark))).first() is None
+
+    sink.fail = False
+    assert await scheduler.dispatch_due() == 1
+    assert sink.received[0].task_id == task.id
+
+
+@pytest.mark.asyncio
+async def test_started_scheduler_delivers_in_the_background(async_session):
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    task = await _task(async_session, today + datetime.timedelta(days=1))
+    factory = async_sessionmaker(async_session.bind, expire_on_commit=False)
+    sink = ListSink()
+    scheduler = ReminderScheduler(factory, sink, lead_days=1, scan_interval=0.01)
+
+    scheduler.start()
+    try:
+        for _ in range(200):
+            if sink.received:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await scheduler.stop()
+
+    assert [r.task_id for r in sink.received] == [task.id]
+    assert scheduler.stats()["running"] is False
+
+
+@pytest.mark.asyncio
+async def test_late_task_with_a_low_id_does_not_move_the_watermark_back(
+    async_session,
+):
+    tomorrow = TODAY + datetime.timedelta(days=1)
+    high = await _task(async_session, tomorrow, id=uuid.UUID(int=(1 << 128) - 1))
+    clock = Clock(_at(TODAY))
+    scheduler = _scheduler(async_session, ListSink(), clock)
+    await scheduler.scan()
+    assert await scheduler.dispatch_due() == 1
+
+    low = await _task(async_session, tomorrow, id=uuid.UUID(int=0x1A))
+    assert await scheduler.scan() == 1
+    assert await scheduler.dispatch_due() == 1
+    assert [r.task_id for r in scheduler.sink.received] == [high.id, low.id]
+
+    (stored,) = (await async_session.execute(select(ReminderWatermark))).scalars()
+    assert (stored.deadline, stored.task_id) == (tomorrow, high.id)
+    assert scheduler.stats()["watermark"]["task_id"] == str(high.id)
+
+    # nothing between the two is reminded again after a restart
+    restarted = _scheduler(async_session, ListSink(), clock)
+    assert await restarted.scan() == 0
@@ -0,0 +1,100 @@
+import datetime
+import uuid
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.projects import crud as project_crud
+from app.projects.models import Project
+from app.tasks.models import Task, TaskTombstone
+from app.tasks import tombstones
+from app.tasks.tombstones import TombstoneCompactor
+from app.users import crud as user_crud
+from tests.factories import ProjectFactory, TaskFactory, UserFactory
+
+
+async def _tombstoned(session) -> set:
+    res = await session.execute(select(TaskTombstone.task_id))
+    return set(res.scalars())
+
+
+@pytest.mark.asyncio
+async def test_user_removal_tombstones_every_cascaded_task(async_session):
+    user = await UserFactory.create_async(session=async_session)
+    project = await ProjectFactory.create_async(session=async_session, owner=user)
+    own = await TaskFactory.create_async(session=async_session, owner=user)
+    # someone else's task in the user's project goes with the project
+    guest = await TaskFactory.create_async(session=async_session, project=project)
+    survivor = await TaskFactory.create_async(session=async_session)
+
+    await user_crud.remove(async_session, user)
+
+    assert await _tombstoned(async_session) == {own.id, guest.id}
+    stone = await async_session.get(TaskTombstone, guest.id)
+    assert (stone.owner_id, stone.project_id) == (guest.owner_id, project.id)
+    assert survivor.id not in await _tombstoned(async_session)
+
+
+@pytest.mark.asyncio
+async def test_project_removal_tombstones_tasks_assigned_after_the_load(
+    async_session,
+):
+    project = await ProjectFactory.create_async(session=async_session)
+    known = await TaskFactory.create_async(
+        session=async_session, owner=project.owner, project=project
+    )
+    late = await TaskFactory.create_async(session=async_session, owner=project.owner)
+    await async_session.commit()
+    loaded = await async_session.get(Project, project.id)
+    await async_session.refresh(loaded, ["tasks"])  # holds only `known`
+
+    await async_session.execute(  # e.g. a concurrent assignment
+        update(Task)
+        .where(Task.id == late.id)
+        .values(project_id=project.id)
+        .execution_options(synchronize_session=False)
+    )
+    await project_crud.remove(async_session, project.id)
+
+    assert await _tombstoned(async_session) == {known.id, late.id}
+
+
+@pytest.mark.asyncio
+async def test_recording_an_existing_tombstone_restamps_it(async_session):
+    task = await TaskFactory.create_async(session=async_session)
+    await tombstones.record(async_session, [task])
+    await async_session.commit()
+    await async_session.execute(
+        update(TaskTombstone).values(deleted_at=datetime.datetime(2000, 1, 1))
+    )
+
+    await tombstones.record(async_session, [task])
+    await async_session.commit()
+
+    (stone,) = (await async_session.execute(select(TaskTombstone))).scalars()
+    await async_session.refresh(stone)
+    assert stone.deleted_at.year > 2000
+
+
+@pytest.mark.asyncio
+async def test_compaction_drops_expired_tombstones_in_batches(async_session):
+    now = datetime.datetime(2030, 6, 1, tzinfo=datetime.timezone.utc)
+    old, recent = now - datetime.timedelta(days=45), now - datetime.timedelta(days=1)
+    owner = await UserFactory.create_async(session=async_session)
+    stones = [
+        TaskTombstone(
+            task_id=uuid.uuid4(), owner_id=owner.id, deleted_at=old if i < 3 else recent
+        )
+        for i in range(5)
+    ]
+    async_session.add_all(stones)
+    await async_session.commit()
+
+    factory = async_sessionmaker(async_session.bind, expire_on_commit=False)
+    compactor = TombstoneCompactor(factory, batch_size=2, clock=lambda: now)
+    assert await compactor.compact() == 3
+    assert await compactor.compact() == 0
+    assert await _tombstoned(async_session) == {s.task_id for s in stones[3:]}
+    assert compactor.stats()["compacted"] == 3
+    assert compactor.stats()["runs"] == 2
@@ -0,0 +1,146 @@
+import datetime
+
+import pytest
+from sqlalchemy import update
+
+from app.tasks.models import Task
+from app.users.models import User
+from tests.factories import ProjectFactory, TaskFactory, UserFactory
+from tests.query_plans import capture_statements
+
+
+@pytest.mark.asyncio
+async def test_task_conditional_get(client, async_session):
+    task = await TaskFactory.create_async(session=async_session)
+    url = f"/api/v1/tasks/id/{task.id}"
+
+    r = await client.get(url)
+    assert r.status_code == 200, r.text
+    tag = r.headers["etag"]
+
+    with capture_statements(async_session) as statements:
+        r = await client.get(url, headers={"If-None-Match": tag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == tag
+    # answered from the version query alone
+    ((sql, _),) = statements
+    assert "updated_at" in sql and "tasks.name" not in sql
+
+    r = await client.get(url, headers={"If-None-Match": f'"other", W/{tag}'})
+    assert r.status_code == 304
+
+    r = await client.patch(url, json={"name": "renamed"})
+    assert r.status_code == 200, r.text
+    assert r.headers["etag"] != tag
+
+    r = await client.get(url, headers={"If-None-Match": tag})
+    assert r.status_code == 200
+    assert r.json()["name"] == "renamed"
+
+
+@pytest.mark.asyncio
+async def test_patch_if_match(client, async_session):
+    task = await TaskFactory.create_async(session=async_session)
+    url = f"/api/v1/tasks/id/{task.id}"
+    tag = (await client.get(url)).headers["etag"]
+
+    r = await client.patch(url, json={"name": "a"}, headers={"If-Match": '"stale"'})
+    assert r.status_code == 412, r.text
+    assert r.json()["code"] == "PRECONDITION_FAILED"
+
+    r = await client.patch(url, json={"name": "b"}, headers={"If-Match": tag})
+    assert r.status_code == 200, r.text
+
+    # the tag the client holds is now outdated
+    r = await client.patch(url, json={"name": "c"}, headers={"If-Match": tag})
+    assert r.status_code == 412, r.text
+
+
+@pytest.mark.asyncio
+async def test_if_match_is_checked_against_the_database(client, async_session):
+    task = await TaskFactory.create_async(session=async_session)
+    user = task.owner
+    tags = {
+        url: (await client.get(url)).headers["etag"]  # cached from here on
+        for url in (f"/api/v1/tasks/id/{task.id}", f"/api/v1/users/{user.id}")
+    }
+    # edits by another worker, whose invalidations never reach this one
+    later = datetime.timedelta(seconds=1)
+    for model, row in ((Task, task), (User, user)):
+        await async_session.execute(
+            update(model)
+            .where(model.id == row.id)
+            .values(updated_at=row.updated_at + later)
+            .execution_options(synchronize_session=False)
+        )
+    async_session.expunge_all()
+
+    r = await client.patch(
+        f"/api/v1/tasks/id/{task.id}",
+        json={"name": "mine"},
+        headers={"If-Match": tags[f"/api/v1/tasks/id/{task.id}"]},
+    )
+    assert r.status_code == 412, r.text
+    r = await client.patch(
+        f"/api/v1/users/{user.id}",
+        json={"full_name": "Mine"},
+        headers={"If-Match": tags[f"/api/v1/users/{user.id}"]},
+    )
+    assert r.status_code == 412, r.text
+
+
+@pytest.mark.asyncio
+async def test_project_etag_tracks_expanded_tasks(client, async_session):
+    project = await ProjectFactory.create_async(session=async_session)
+    task = await TaskFactory.create_async(
+        session=async_session, owner=project.owner, project=project
+    )
+    url = f"/api/v1/projects/{project.id}"
+
+    plain = (await client.get(url)).headers["etag"]
+    expanded = (await client.get(url, params={"expand": "tasks"})).headers["etag"]
+    sparse = (await client.get(url, params={"fields": "name"})).headers["etag"]
+    assert len({plain, expanded, sparse}) == 3
+
+    r = await client.get(
+        url, params={"expand": "tasks"}, headers={"If-None-Match": expanded}
+    )
+    assert r.status_code == 304
+
+    r = await client.patch(f"/api/v1/tasks/id/{task.id}", json={"complete": True})
+    assert r.status_code == 200, r.text
+
+    r = await client.get(
+        url, params={"expand": "tasks"}, headers={"If-None-Match": expanded}
+    )
+    assert r.status_code == 200
+    assert r.json()["tasks"][0]["complete"] is True
+    # the plain representation carries the task counters, so it changed too
+    r = await client.get(url, headers={"If-None-Match": plain})
+    assert r.status_code == 200
+    assert r.json()["completed_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_user_conditional_get_and_if_match(client, async_session):
+    user = await UserFactory.create_async(session=async_session)
+    url = f"/api/v1/users/{user.id}"
+
+    tag = (await client.get(url)).headers["etag"]
+    r = await client.get(url, headers={"If-None-Match": tag})
+    assert r.status_code == 304
+
+    r = await client.patch(url, json={"full_name": "X"}, headers={"If-Match": '"x"'})
+    assert r.status_code == 412
+    r = await client.patch(url, json={"full_name": "X"}, headers={"If-Match": tag})
+    assert r.status_code == 200, r.text
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_unknown_id_is_404(client):
+    r = await client.get(
+        "/api/v1/tasks/id/00000000-0000-0000-0000-000000000000",
+        headers={"If-None-Match": "*"},
+    )
+    assert r.status_code == 404
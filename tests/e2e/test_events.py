@@ -0,0 +1,146 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from app.core.events import change_feed, project_topic, user_topic
+from app.projects import counters
+from tests.factories import ProjectFactory, TaskFactory, UserFactory
+
+
+async def _open(client, url: str) -> asyncio.Task:
+    """Start streaming ``url`` and wait until its subscription is registered."""
+    before = change_feed.stats()["subscribers"]
+    stream = asyncio.create_task(client.get(url))
+    for _ in range(100):
+        if change_feed.stats()["subscribers"] > before:
+            return stream
+        await asyncio.sleep(0.01)
+    stream.cancel()
+    raise AssertionError(f"{url} never subscribed")
+
+
+async def _close(stream: asyncio.Task, topic) -> list[tuple[str, dict]]:
+    """Overflow the subscriber's queue so the stream ends, then parse it."""
+    for _ in range(100):  # eviction drops whatever the stream has not taken yet
+        if all(sub.queue.empty() for sub in change_feed._topics.get(topic, ())):
+            break
+        await asyncio.sleep(0.01)
+    for _ in range(change_feed.queue_size + 1):
+        change_feed.publish("noise", uuid.uuid4(), (topic,))
+    response = await asyncio.wait_for(stream, 5)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = []
+    for frame in response.text.split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines() if ": " in line)
+        if lines.get("event") not in (None, "noise"):
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_events_of_unknown_user_or_project_404(client):
+    for path in ("users", "projects"):
+        r = await client.get(f"/api/v1/{path}/{uuid.uuid4()}/events")
+        assert r.status_code == 404, r.text
+    assert change_feed.stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_task_writes_reach_owner_and_project_streams(client, async_session):
+    user = await UserFactory.create_async(session=async_session)
+    project = await ProjectFactory.create_async(session=async_session, owner=user)
+    other = await ProjectFactory.create_async(session=async_session, owner=user)
+    by_user = await _open(client, f"/api/v1/users/{user.id}/events")
+    by_project = await _open(client, f"/api/v1/projects/{project.id}/events")
+
+    r = await client.post(
+        "/api/v1/tasks/",
+        json={
+            "name": "Ship it",
+            "description": "",
+            "deadline": None,
+            "owner_id": str(user.id),
+        },
+    )
+    assert r.status_code == 201, r.text
+    task_id = r.json()["id"]
+    r = await client.patch(
+        f"/api/v1/projects/{project.id}/assign/{task_id}",
+        json={"project_id": str(project.id), "task_id": task_id, "task_assign": True},
+    )
+    assert r.status_code == 200, r.text
+    r = await client.patch(  # moves it out of the watched project
+        f"/api/v1/projects/{other.id}/assign",
+        json={"task_ids": [task_id], "task_assign": True},
+    )
+    assert r.status_code == 200, r.text
+    r = await client.delete(f"/api/v1/tasks/id/{task_id}")
+    assert r.status_code == 204, r.text
+
+    user_events = await _close(by_user, user_topic(user.id))
+    assert [e for e, _ in user_events] == [
+        "task.created",
+        "task.assigned",
+        "task.assigned",
+        "task.deleted",
+        "evicted",
+    ]
+    created = user_events[0][1]
+    assert created["id"] == task_id and created["data"]["name"] == "Ship it"
+
+    project_events = await _close(by_project, project_topic(project.id))
+    assert [e for e, _ in project_events] == [
+        "task.assigned",
+        "task.unassigned",
+        "evicted",
+    ]
+    assert project_events[1][1]["project_id"] == str(other.id)
+    assert change_feed.stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_user_removal_announces_every_cascaded_deletion(client, async_session):
+    user = await UserFactory.create_async(session=async_session)
+    guest = await UserFactory.create_async(session=async_session)
+    project = await ProjectFactory.create_async(session=async_session, owner=user)
+    elsewhere = await ProjectFactory.create_async(session=async_session, owner=guest)
+    own = await TaskFactory.create_async(
+        session=async_session, owner=user, project=project
+    )
+    hosted = await TaskFactory.create_async(
+        session=async_session, owner=guest, project=project
+    )
+    away = await TaskFactory.create_async(
+        session=async_session, owner=user, project=elsewhere
+    )
+    await counters.recount(async_session, {elsewhere.id})
+    by_guest = await _open(client, f"/api/v1/users/{guest.id}/events")
+    by_project = await _open(client, f"/api/v1/projects/{project.id}/events")
+    by_elsewhere = await _open(client, f"/api/v1/projects/{elsewhere.id}/events")
+
+    r = await client.delete(f"/api/v1/users/{user.id}")
+    assert r.status_code == 204, r.text
+
+    guest_events = await _close(by_guest, user_topic(guest.id))
+    assert [(e, d["id"]) for e, d in guest_events[:-1]] == [
+        ("task.deleted", str(hosted.id))
+    ]
+    project_events = await _close(by_project, project_topic(project.id))
+    assert sorted((e, d["id"]) for e, d in project_events[:-1]) == sorted(
+        [
+            ("task.deleted", str(own.id)),
+            ("task.deleted", str(hosted.id)),
+            ("project.deleted", str(project.id)),
+        ]
+    )
+    elsewhere_events = await _close(by_elsewhere, project_topic(elsewhere.id))
+    assert [(e, d["id"]) for e, d in elsewhere_events[:-1]] == [
+        ("task.deleted", str(away.id))
+    ]
+
+    r = await client.get(f"/api/v1/projects/{elsewhere.id}")
+    assert r.json()["task_count"] == 0
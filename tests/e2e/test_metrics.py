@@ -0,0 +1,55 @@
+import re
+from uuid import uuid4
+
+import pytest
+
+from app.core.metrics import route_metrics
+from tests.factories import TaskFactory
+
+ROUTE = 'method="GET",route="/api/v1/tasks/id/{task_id}"'
+
+
+def _sample(text: str, name: str, labels: str) -> float:
+    match = re.search(rf"^{name}\{{{re.escape(labels)}\}} (\S+)$", text, re.M)
+    assert match, f"{name}{{{labels}}} missing"
+    return float(match.group(1))
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client, async_session):
+    route_metrics.clear()
+    task = await TaskFactory.create_async(session=async_session)
+
+    for _ in range(2):
+        assert (await client.get(f"/api/v1/tasks/id/{task.id}")).status_code == 200
+    assert (await client.get(f"/api/v1/tasks/id/{uuid4()}")).status_code == 404
+    assert (await client.get("/api/v1/nope")).status_code == 404
+
+    r = await client.get("/api/v1/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = r.text
+
+    assert _sample(text, "http_requests_total", f'{ROUTE},status="200"') == 2
+    assert _sample(text, "http_requests_total", f'{ROUTE},status="404"') == 1
+    assert (
+        _sample(
+            text,
+            "http_requests_total",
+            'method="GET",route="unmatched",status="404"',
+        )
+        == 1
+    )
+    assert _sample(text, "http_request_duration_seconds_count", ROUTE) == 3
+    assert (
+        _sample(text, "http_request_duration_seconds_bucket", f'{ROUTE},le="+Inf"') == 3
+    )
+    # one lookup per request, attributed through the cursor hooks
+    assert _sample(text, "db_queries_total", ROUTE) == 3
+    assert _sample(text, "db_request_duration_seconds_sum", ROUTE) > 0
+    assert "# TYPE entity_cache_hits_total counter" in text
+    assert "# TYPE reminders_sent_total counter" in text
+
+    r = await client.get("/api/v1/health/reminders")
+    assert r.status_code == 200
+    assert {"queued", "sent", "lag_seconds", "watermark"} <= r.json().keys()
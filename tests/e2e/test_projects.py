@@ -1,8 +1,13 @@
+import asyncio
+import datetime
 import pytest
 import time
-from uuid import UUID
+from uuid import UUID, uuid4
+from app.core.coalesce import single_flight
+from app.core.replica import RYW_COOKIE
+from app.projects import crud as project_crud
 from tests.e2e.helper_functions import parse_iso
-from tests.factories import ProjectFactory, UserFactory
+from tests.factories import ProjectFactory, TaskFactory, UserFactory
 
 
 @pytest.mark.asyncio
@@ -33,7 +38,7 @@ async def test_get_all_tasks(client, async_session):
     response = await client.get("/api/v1/projects/")
     assert response.status_code == 200, response.text
 
-    payload = response.json()
+    payload = response.json()["items"]
     assert len(payload) == 3
 
     returned_by_id = {UUID(item["id"]): item for item in payload}
@@ -46,6 +51,35 @@ async def test_get_all_tasks(client, async_session):
         assert row["description"] == project.description
 
 
+@pytest.mark.asyncio
+async def test_list_projects_filters_by_owner_and_sorts(client, async_session):
+    owner = await UserFactory.create_async(session=async_session)
+    mine = [
+        await ProjectFactory.create_async(session=async_session, owner=owner)
+        for _ in range(3)
+    ]
+    await ProjectFactory.create_async(session=async_session)
+
+    r = await client.get(
+        "/api/v1/projects/",
+        params={"owner_id": str(owner.id), "sort": "-updated_at", "limit": 2},
+    )
+    assert r.status_code == 200, r.text
+    page = r.json()
+    ordered = sorted(mine, key=lambda p: (p.updated_at, p.id.hex), reverse=True)
+    assert [item["id"] for item in page["items"]] == [str(p.id) for p in ordered[:2]]
+
+    r = await client.get(
+        "/api/v1/projects/",
+        params={
+            "owner_id": str(owner.id),
+            "sort": "-updated_at",
+            "cursor": page["next_cursor"],
+        },
+    )
+    assert [item["id"] for item in r.json()["items"]] == [str(ordered[2].id)]
+
+
 @pytest.mark.asyncio
 async def test_post_project(client, async_session):
     user = await UserFactory.create_async(session=async_session)
@@ -106,3 +140,275 @@ async def test_delete_project(client, async_session):
 
     r = await client.get(f"/api/v1/projects/{project.id}")
     assert r.status_code == 404, r.text
+
+
+@pytest.mark.asyncio
+async def test_get_project_expand_tasks(client, async_session):
+    project = await ProjectFactory.create_async(session=async_session)
+    task = await TaskFactory.create_async(
+        session=async_session, owner=project.owner, project=project
+    )
+
+    r = await client.get(f"/api/v1/projects/{project.id}")
+    assert r.status_code == 200, r.text
+    assert "tasks" not in r.json()
+
+    r = await client.get(
+        f"/api/v1/projects/{project.id}", params={"expand": "tasks", "fields": "name"}
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert set(body) == {"id", "name", "tasks"}
+    assert [t["id"] for t in body["tasks"]] == [str(task.id)]
+
+
+@pytest.mark.asyncio
+async def test_assign_many_tasks(client, async_session):
+    project = await ProjectFactory.create_async(session=async_session)
+    tasks = [
+        await TaskFactory.create_async(session=async_session, owner=project.owner)
+        for _ in range(3)
+    ]
+    ids = [str(t.id) for t in tasks]
+
+    r = await client.patch(
+        f"/api/v1/projects/{project.id}/assign",
+        json={"task_ids": ids, "task_assign": True},
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()["task_ids"] == ids
+
+    r = await client.get(f"/api/v1/projects/{project.id}", params={"expand": "tasks"})
+    assert {t["id"] for t in r.json()["tasks"]} == set(ids)
+
+    r = await client.patch(
+        f"/api/v1/projects/{project.id}/assign",
+        json={"task_ids": ids[:2], "task_assign": False},
+    )
+    assert r.status_code == 200, r.text
+    r = await client.get(f"/api/v1/projects/{project.id}", params={"expand": "tasks"})
+    assert [t["id"] for t in r.json()["tasks"]] == ids[2:]
+
+
+@pytest.mark.asyncio
+async def test_assign_single_task_route(client, async_session):
+    project = await ProjectFactory.create_async(session=async_session)
+    task = await TaskFactory.create_async(session=async_session, owner=project.owner)
+    body = {"project_id": str(project.id), "task_id": str(task.id)}
+
+    r = await client.patch(
+        f"/api/v1/projects/{project.id}/assign/{task.id}",
+        json={**body, "task_assign": True},
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()["id"] == str(project.id)
+
+    r = await client.patch(
+        f"/api/v1/projects/{project.id}/assign/{task.id}",
+        json={**body, "task_assign": True},
+    )
+    assert r.status_code == 409, r.text
+
+    r = await client.patch(
+        f"/api/v1/projects/{project.id}/assign/{task.id}",
+        json={**body, "task_assign": False},
+    )
+    assert r.status_code == 200, r.text
+
+    r = await client.patch(
+        f"/api/v1/projects/{project.id}/assign/{task.id}",
+        json={**body, "task_assign": False},
+    )
+    assert r.status_code == 409, r.text
+
+
+@pytest.mark.asyncio
+async def test_assign_is_all_or_nothing(client, async_session):
+    project = await ProjectFactory.create_async(session=async_session)
+    own = await TaskFactory.create_async(session=async_session, owner=project.owner)
+    foreign = await TaskFactory.create_async(session=async_session)
+    url = f"/api/v1/projects/{project.id}/assign"
+    own_id, foreign_id = str(own.id), str(foreign.id)
+
+    r = await client.patch(
+        url, json={"task_ids": [own_id, foreign_id], "task_assign": True}
+    )
+    assert r.status_code == 403, r.text
+
+    r = await client.patch(
+        url, json={"task_ids": [own_id, str(uuid4())], "task_assign": True}
+    )
+    assert r.status_code == 404, r.text
+
+    await async_session.refresh(own)
+    assert own.project_id is None
+
+
+@pytest.mark.asyncio
+async def test_assign_unknown_project(client, async_session):
+    task = await TaskFactory.create_async(session=async_session)
+
+    r = await client.patch(
+        f"/api/v1/projects/{uuid4()}/assign",
+        json={"task_ids": [str(task.id)], "task_assign": True},
+    )
+    assert r.status_code == 404, r.text
+
+
+@pytest.mark.asyncio
+async def test_project_stats(client, async_session, max_queries):
+    project = await ProjectFactory.create_async(session=async_session)
+    today = datetime.date.today()
+    for deadline, complete in [
+        (today - datetime.timedelta(days=1), False),
+        (today, False),
+        (today, True),
+    ]:
+        await TaskFactory.create_async(
+            session=async_session,
+            owner=project.owner,
+            project=project,
+            deadline=deadline,
+            complete=complete,
+        )
+    await TaskFactory.create_async(session=async_session, owner=project.owner)
+
+    with max_queries(1):
+        r = await client.get(f"/api/v1/projects/{project.id}/stats")
+    assert r.status_code == 200, r.text
+    assert r.json() == {"total": 3, "completed": 1, "overdue": 1, "due_this_week": 1}
+
+    r = await client.get(f"/api/v1/projects/{uuid4()}/stats")
+    assert r.status_code == 404, r.text
+
+
+@pytest.mark.asyncio
+async def test_task_counters_follow_every_task_write(client, async_session):
+    project = await ProjectFactory.create_async(session=async_session)
+    other = await ProjectFactory.create_async(
+        session=async_session, owner=project.owner
+    )
+    url = f"/api/v1/projects/{project.id}"
+
+    async def counters():
+        body = (await client.get(url)).json()
+        stats = (await client.get(f"{url}/stats")).json()
+        assert (body["task_count"], body["completed_count"]) == (
+            stats["total"],
+            stats["completed"],
+        )
+        return body["task_count"], body["completed_count"]
+
+    ids = []
+    for i in range(3):
+        r = await client.post(
+            "/api/v1/tasks/",
+            json={
+                "name": f"Counted {i}",
+                "description": None,
+                "deadline": None,
+                "owner_id": str(project.owner_id),
+            },
+        )
+        ids.append(r.json()["id"])
+    assert await counters() == (0, 0)
+
+    r = await client.patch(f"{url}/assign", json={"task_ids": ids, "task_assign": True})
+    assert r.status_code == 200, r.text
+    assert await counters() == (3, 0)
+
+    for _ in range(2):  # completing twice counts once
+        r = await client.patch(f"/api/v1/tasks/id/{ids[0]}", json={"complete": True})
+        assert r.status_code == 200, r.text
+    assert await counters() == (3, 1)
+
+    r = await client.patch(
+        "/api/v1/tasks/bulk",
+        json={"filter": {"project_id": str(project.id)}, "changes": {"complete": True}},
+    )
+    assert r.json()["affected"] == 3
+    assert await counters() == (3, 3)
+
+    r = await client.patch(
+        f"{url}/assign/{ids[2]}",
+        json={"project_id": str(project.id), "task_id": ids[2], "task_assign": False},
+    )
+    assert r.status_code == 200, r.text
+    assert (r.json()["task_count"], r.json()["completed_count"]) == (2, 2)
+    assert await counters() == (2, 2)
+
+    r = await client.patch(
+        f"/api/v1/tasks/id/{ids[1]}", json={"name": "Reopened", "complete": False}
+    )
+    assert r.status_code == 200, r.text
+    assert await counters() == (2, 1)
+
+    # moving a task to another project updates both
+    r = await client.patch(
+        f"/api/v1/projects/{other.id}/assign",
+        json={"task_ids": [ids[0]], "task_assign": True},
+    )
+    assert r.status_code == 200, r.text
+    assert await counters() == (1, 0)
+    r = await client.get(f"/api/v1/projects/{other.id}")
+    assert (r.json()["task_count"], r.json()["completed_count"]) == (1, 1)
+    r = await client.patch(
+        f"{url}/assign", json={"task_ids": [ids[0]], "task_assign": True}
+    )
+    assert r.status_code == 200, r.text
+    assert await counters() == (2, 1)
+    r = await client.get(f"/api/v1/projects/{other.id}/stats")
+    assert r.json()["total"] == 0
+    r = await client.get(f"/api/v1/projects/{other.id}")
+    assert (r.json()["task_count"], r.json()["completed_count"]) == (0, 0)
+
+    assert (await client.delete(f"/api/v1/tasks/id/{ids[0]}")).status_code == 204
+    assert await counters() == (1, 0)
+
+    r = await client.delete(
+        "/api/v1/tasks/bulk", params={"project_id": str(project.id)}
+    )
+    assert r.json()["affected"] == 1
+    assert await counters() == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_are_coalesced(
+    client, async_session, monkeypatch, max_queries
+):
+    project = await ProjectFactory.create_async(session=async_session)
+    await TaskFactory.create_async(
+        session=async_session, owner=project.owner, project=project
+    )
+    gate, get = asyncio.Event(), project_crud.get
+
+    async def slow_get(*args, **kwargs):
+        await gate.wait()  # hold the leader until every request has arrived
+        return await get(*args, **kwargs)
+
+    monkeypatch.setattr(project_crud, "get", slow_get)
+    before = single_flight.stats()["collapsed"]
+    url = f"/api/v1/projects/{project.id}?expand=tasks"
+
+    # one project + tasks load for the ten, one for the cookie holder
+    with max_queries(4):
+        calls = [asyncio.create_task(client.get(url)) for _ in range(10)]
+        # a client inside its read-your-writes window reads on its own
+        own = asyncio.create_task(
+            client.get(url, headers={"cookie": f"{RYW_COOKIE}={time.time() + 60:.3f}"})
+        )
+        for _ in range(100):
+            if single_flight.stats()["collapsed"] - before == 9:
+                break
+            await asyncio.sleep(0.01)
+        gate.set()
+        responses = await asyncio.gather(*calls)
+    assert (await own).status_code == 200
+
+    assert single_flight.stats()["collapsed"] - before == 9
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.content for r in responses}) == 1
+    assert len({r.headers["etag"] for r in responses}) == 1
+    assert len(responses[0].json()["tasks"]) == 1
+    routes = single_flight.stats()["routes"]
+    assert routes["GET /api/v1/projects/{project_id}"]["collapsed"] >= 9
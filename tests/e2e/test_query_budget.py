@@ -0,0 +1,46 @@
+import pytest
+
+from app.core.querybudget import QueryBudget, QueryBudgetError
+from app.tasks import routes as task_routes
+from tests.factories import TaskFactory, UserFactory
+
+
+@pytest.mark.asyncio
+async def test_read_task_query_budget(client, async_session, max_queries):
+    task = await TaskFactory.create_async(session=async_session)
+
+    with max_queries(2):
+        r = await client.get(f"/api/v1/tasks/id/{task.id}")
+    assert r.status_code == 200
+
+    with max_queries(1):  # entity cache hit: only the ETag version lookup
+        r = await client.get(f"/api/v1/tasks/id/{task.id}")
+    assert r.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_create_task_query_budget(client, async_session, max_queries):
+    owner = await UserFactory.create_async(session=async_session)
+
+    with max_queries(3):
+        r = await client.post(
+            "/api/v1/tasks/",
+            json={
+                "name": "Budgeted",
+                "description": "three statements",
+                "deadline": "2030-01-01",
+                "owner_id": str(owner.id),
+            },
+        )
+    assert r.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_route_over_its_budget_fails_the_request(
+    client, async_session, monkeypatch
+):
+    task = await TaskFactory.create_async(session=async_session)
+    monkeypatch.setattr(task_routes.get_task_by_id, "__query_budget__", QueryBudget(0))
+
+    with pytest.raises(QueryBudgetError, match=r"GET /api/v1/tasks/id/\{task_id\}"):
+        await client.get(f"/api/v1/tasks/id/{task.id}")
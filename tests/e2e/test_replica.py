@@ -0,0 +1,147 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core import replica
+from app.core.cache import entity_cache
+from app.core.database import Base
+from app.core.deps import get_db, get_read_db, get_read_session_factory
+from app.main import app as fastapi_app
+from tests.conftest import _sqlite_server_defaults
+from tests.factories import UserFactory
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def _sqlite_file_db(path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    with _sqlite_server_defaults():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+@pytest_asyncio.fixture
+async def two_dbs(tmp_path, monkeypatch):
+    """Primary and replica as two SQLite files; nothing replicates between them."""
+    primary = await _sqlite_file_db(tmp_path / "primary.db")
+    secondary = await _sqlite_file_db(tmp_path / "replica.db")
+    primary_factory = async_sessionmaker(primary, expire_on_commit=False)
+    replica_factory = async_sessionmaker(secondary, expire_on_commit=False)
+
+    async def _primary_db():
+        async with primary_factory() as session:
+            yield session
+
+    clock = FakeClock()
+    router = replica.ReadRouter(
+        primary_factory, replica_factory, recheck_interval=10, clock=clock
+    )
+    monkeypatch.setattr(replica, "read_router", router)
+    fastapi_app.dependency_overrides[get_db] = _primary_db
+    del fastapi_app.dependency_overrides[get_read_db]
+    del fastapi_app.dependency_overrides[get_read_session_factory]
+
+    yield primary_factory, replica_factory, router, clock
+    await primary.dispose()
+    await secondary.dispose()
+
+
+async def _seed_user(factory, **kwargs):
+    async with factory() as session:
+        user = await UserFactory.create_async(session=session, **kwargs)
+        await session.commit()
+        return user
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_until_own_write(client, two_dbs):
+    primary, secondary, _, _ = two_dbs
+    user = await _seed_user(primary, full_name="primary copy")
+    await _seed_user(secondary, id=user.id, email=user.email, full_name="replica copy")
+    url = f"/api/v1/users/{user.id}"
+
+    r = await client.get(url)
+    assert r.json()["full_name"] == "replica copy"
+    assert replica.RYW_COOKIE not in r.cookies
+    assert entity_cache.stats()["size"] == 0  # replica rows are never cached
+
+    r = await client.patch(url, json={"full_name": "renamed"})
+    assert r.status_code == 200, r.text
+    assert replica.RYW_COOKIE in r.cookies
+    assert "httponly" in r.headers["set-cookie"].lower()
+
+    # within the read-your-writes window the client sees its own write
+    r = await client.get(url)
+    assert r.json()["full_name"] == "renamed"
+
+    client.cookies.clear()  # window over
+    entity_cache.clear()  # the primary read above was cached
+    r = await client.get(url)
+    assert r.json()["full_name"] == "replica copy"
+
+
+@pytest.mark.asyncio
+async def test_writes_without_a_replica_set_no_cookie(client, async_session):
+    user = await UserFactory.create_async(session=async_session)
+
+    r = await client.patch(f"/api/v1/users/{user.id}", json={"full_name": "x"})
+    assert r.status_code == 200, r.text
+    assert "set-cookie" not in r.headers
+
+
+@pytest.mark.asyncio
+async def test_failed_write_does_not_pin_primary(client, two_dbs):
+    r = await client.patch(
+        "/api/v1/users/00000000-0000-0000-0000-000000000000", json={"full_name": "x"}
+    )
+    assert r.status_code == 404
+    assert replica.RYW_COOKIE not in r.cookies
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_replica_falls_back_to_primary(client, two_dbs, tmp_path):
+    primary, _, router, clock = two_dbs
+    user = await _seed_user(primary)
+    url = f"/api/v1/users/{user.id}"
+
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/db.sqlite")
+    healthy_replica = router.replica
+    router.replica = async_sessionmaker(broken)
+    router.mark_unhealthy()
+    clock.now += 10  # probe is due
+
+    r = await client.get(url)
+    assert r.status_code == 200, r.text  # served by the primary
+    assert await router.replica_healthy() is False
+
+    # the replica recovers; the next probe after the interval routes back to it
+    router.replica = healthy_replica
+    assert await router.replica_healthy() is False  # not re-probed yet
+    clock.now += 10
+    assert await router.replica_healthy() is True
+    entity_cache.clear()
+    r = await client.get(url)
+    assert r.status_code == 404  # the replica never got this row
+    await broken.dispose()
+
+
+@pytest.mark.asyncio
+async def test_replica_errors_mark_it_unhealthy(client, two_dbs):
+    _, secondary, router, _ = two_dbs
+    async with secondary() as session:
+        await session.run_sync(lambda s: Base.metadata.tables["users"].drop(s.bind))
+
+    with pytest.raises(OperationalError):  # not retried
+        await client.get("/api/v1/users/")
+    assert await router.replica_healthy() is False
+    # the fallback starts with the next request
+    r = await client.get("/api/v1/users/")
+    assert r.status_code == 200, r.text
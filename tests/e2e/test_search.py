@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import text
+
+from app.tasks import crud as task_crud
+from tests.factories import ProjectFactory, TaskFactory, UserFactory
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_substring_ranked(client, async_session):
+    for name in ["Buy groceries", "Groceries", "Clean garage"]:
+        await TaskFactory.create_async(session=async_session, name=name)
+
+    r = await client.get("/api/v1/tasks/search", params={"q": "grocer"})
+    assert r.status_code == 200, r.text
+    names = [t["name"] for t in r.json()]
+    assert sorted(names) == ["Buy groceries", "Groceries"]
+    assert names[0] == "Groceries"  # tighter match ranks first
+
+    r = await client.get("/api/v1/tasks/search", params={"q": "grocer", "limit": 1})
+    assert len(r.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_writes(client, async_session):
+    task = await TaskFactory.create_async(session=async_session, name="Write report")
+
+    r = await client.patch(f"/api/v1/tasks/id/{task.id}", json={"name": "Send invoice"})
+    assert r.status_code == 200, r.text
+
+    r = await client.get("/api/v1/tasks/search", params={"q": "report"})
+    assert r.json() == []
+    r = await client.get("/api/v1/tasks/search", params={"q": "invoice"})
+    assert [t["id"] for t in r.json()] == [str(task.id)]
+
+    r = await client.delete(f"/api/v1/tasks/id/{task.id}")
+    assert r.status_code == 204, r.text
+    r = await client.get("/api/v1/tasks/search", params={"q": "invoice"})
+    assert r.json() == []
+
+
+@pytest.mark.asyncio
+async def test_search_short_and_wildcard_terms(client, async_session):
+    await TaskFactory.create_async(session=async_session, name="Fix garage door")
+
+    r = await client.get("/api/v1/tasks/search", params={"q": "ga"})
+    assert [t["name"] for t in r.json()] == ["Fix garage door"]
+
+    r = await client.get("/api/v1/tasks/search", params={"q": "%"})
+    assert r.json() == []
+
+
+@pytest.mark.asyncio
+async def test_search_projects(client, async_session):
+    await ProjectFactory.create_async(session=async_session, name="Website relaunch")
+    await ProjectFactory.create_async(session=async_session, name="Office move")
+
+    r = await client.get("/api/v1/projects/search", params={"q": "launch"})
+    assert r.status_code == 200, r.text
+    assert [p["name"] for p in r.json()] == ["Website relaunch"]
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_postgres_trigram(pg_session):
+    owner = await UserFactory.create_async(session=pg_session)
+    for name in ["the big grocery run", "grocery store", "grocer", "laundry"]:
+        await TaskFactory.create_async(session=pg_session, name=name, owner=owner)
+
+    found = await task_crud.search(pg_session, "grocer", limit=10)
+    assert [t.name for t in found][0] == "grocer"
+    assert {t.name for t in found} == {"the big grocery run", "grocery store", "grocer"}
+
+    # the trigram index must be able to serve the predicate
+    await pg_session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = await pg_session.execute(
+        text("EXPLAIN SELECT id FROM tasks WHERE name ILIKE '%grocer%'")
+    )
+    assert "ix_tasks_name_trgm" in "\n".join(row[0] for row in plan)
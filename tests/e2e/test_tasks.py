@@ -1,8 +1,14 @@
+import asyncio
+import json
 import pytest
 import time
-from uuid import UUID
+from datetime import date
+from uuid import UUID, uuid4
+from sqlalchemy import delete, event
+from app.core.config import settings
+from app.tasks.models import Task
 from tests.e2e.helper_functions import parse_iso
-from tests.factories import TaskFactory, UserFactory
+from tests.factories import ProjectFactory, TaskFactory, UserFactory
 
 
 @pytest.mark.asyncio
@@ -31,7 +37,7 @@ async def test_get_all_tasks(client, async_session):
     response = await client.get("/api/v1/tasks/")
     assert response.status_code == 200, response.text
 
-    payload = response.json()
+    payload = response.json()["items"]
     assert len(payload) == 3
 
     returned_by_id = {UUID(item["id"]): item for item in payload}
@@ -115,3 +121,369 @@ async def test_delete_task(client, async_session):
 
     r = await client.get(f"/api/v1/tasks/id/{task.id}")
     assert r.status_code == 404, r.text
+
+
+@pytest.mark.asyncio
+async def test_writes_ignore_a_stale_cached_task(client, async_session):
+    task = await TaskFactory.create_async(session=async_session)
+    r = await client.get(f"/api/v1/tasks/id/{task.id}")  # cached from here on
+    assert r.status_code == 200, r.text
+
+    # removed by another worker, whose invalidation never reaches this one
+    await async_session.execute(delete(Task).where(Task.id == task.id))
+    async_session.expunge_all()
+
+    r = await client.patch(f"/api/v1/tasks/id/{task.id}", json={"complete": True})
+    assert r.status_code == 404, r.text
+    r = await client.delete(f"/api/v1/tasks/id/{task.id}")
+    assert r.status_code == 404, r.text
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_paginates_with_cursor(client, async_session):
+    tasks = [await TaskFactory.create_async(session=async_session) for _ in range(5)]
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        r = await client.get("/api/v1/tasks/", params=params)
+        assert r.status_code == 200, r.text
+        body = r.json()
+        assert len(body["items"]) <= 2
+        seen.extend(item["id"] for item in body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 5
+    assert set(seen) == {str(t.id) for t in tasks}
+
+    # order is stable: (created_at, id) ascending
+    ordered = sorted(tasks, key=lambda t: (t.created_at, str(t.id).replace("-", "")))
+    assert seen == [str(t.id) for t in ordered]
+
+
+@pytest.mark.asyncio
+async def test_list_rows_match_the_schema_encoding(client, async_session):
+    project = await ProjectFactory.create_async(session=async_session)
+    await TaskFactory.create_async(
+        session=async_session, owner=project.owner, project=project
+    )
+    await TaskFactory.create_async(session=async_session, deadline=None)
+
+    listed = (await client.get("/api/v1/tasks/")).json()["items"]
+    assert len(listed) == 2
+    for item in listed:
+        # the raw row encoding is byte-for-byte what TaskOut produces
+        r = await client.get(f"/api/v1/tasks/id/{item['id']}")
+        assert r.json() == item
+        assert r.text == json.dumps(item, separators=(",", ":"))
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_rejects_bad_cursor_and_limit(client):
+    r = await client.get("/api/v1/tasks/", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400, r.text
+    assert r.json()["code"] == "BAD_REQUEST"
+
+    r = await client.get("/api/v1/tasks/", params={"limit": 0})
+    assert r.status_code == 422, r.text
+
+
+async def _walk(client, url, params, limit=2):
+    """Follow ``next_cursor`` to the end; the ids in listing order."""
+    seen, cursor = [], None
+    while True:
+        page = {**params, "limit": limit, **({"cursor": cursor} if cursor else {})}
+        r = await client.get(url, params=page)
+        assert r.status_code == 200, r.text
+        seen.extend(item["id"] for item in r.json()["items"])
+        cursor = r.json()["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_filters_and_sorts(client, async_session):
+    owner = await UserFactory.create_async(session=async_session)
+    deadlines = [None, date(2030, 1, 3), None, date(2030, 1, 1), date(2030, 1, 3)]
+    tasks = [
+        await TaskFactory.create_async(session=async_session, owner=owner, deadline=d)
+        for d in deadlines
+    ]
+    await TaskFactory.create_async(session=async_session, owner=owner, complete=True)
+    await TaskFactory.create_async(session=async_session)  # someone else's
+
+    dated = sorted(
+        (t for t in tasks if t.deadline), key=lambda t: (t.deadline, t.id.hex)
+    )
+    undated = sorted((t for t in tasks if not t.deadline), key=lambda t: t.id.hex)
+    # NULL deadlines come last ascending; descending is the exact reverse
+    expected = [str(t.id) for t in dated + undated]
+
+    params = {"owner_id": str(owner.id), "complete": "false"}
+    # odd page sizes put cursors on both sides of the NULL boundary
+    for limit in (1, 2, 3):
+        url = "/api/v1/tasks/"
+        asc = await _walk(client, url, {**params, "sort": "deadline"}, limit)
+        assert asc == expected
+        desc = await _walk(client, url, {**params, "sort": "-deadline"}, limit)
+        assert desc == expected[::-1]
+
+    r = await client.get(
+        "/api/v1/tasks/",
+        params={**params, "deadline_after": "2030-01-01", "sort": "-created_at"},
+    )
+    ordered = sorted(tasks, key=lambda t: (t.created_at, t.id.hex), reverse=True)
+    assert [item["id"] for item in r.json()["items"]] == [
+        str(t.id) for t in ordered if t.deadline and t.deadline > date(2030, 1, 1)
+    ]
+
+    oldest = min(tasks, key=lambda t: (t.created_at, t.id.hex))
+    r = await client.get(
+        "/api/v1/tasks/",
+        params={"owner_id": str(owner.id), "created_after": oldest.created_at},
+    )
+    listed = {item["id"] for item in r.json()["items"]}
+    assert str(oldest.id) not in listed and len(listed) >= 1
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_rejects_unknown_sort_and_foreign_cursor(
+    client, async_session
+):
+    for _ in range(3):
+        await TaskFactory.create_async(session=async_session)
+
+    r = await client.get("/api/v1/tasks/", params={"sort": "description"})
+    assert r.status_code == 422, r.text
+
+    cursor = (await client.get("/api/v1/tasks/", params={"limit": 1})).json()[
+        "next_cursor"
+    ]
+    r = await client.get(
+        "/api/v1/tasks/", params={"limit": 1, "cursor": cursor, "sort": "-updated_at"}
+    )
+    assert r.status_code == 400, r.text
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tasks(client, async_session):
+    alice = await UserFactory.create_async(session=async_session)
+    bob = await UserFactory.create_async(session=async_session)
+    items = [
+        {
+            "name": f"Bulk {i}",
+            "description": None,
+            "deadline": None,
+            "owner_id": str(owner.id),
+        }
+        for i, owner in enumerate([alice, bob, alice])
+    ]
+
+    r = await client.post("/api/v1/tasks/bulk", json={"items": items})
+    assert r.status_code == 201, r.text
+    created = r.json()
+    assert [t["name"] for t in created] == ["Bulk 0", "Bulk 1", "Bulk 2"]
+    assert [t["owner_id"] for t in created] == [i["owner_id"] for i in items]
+    assert all(t["complete"] is False and t["created_at"] for t in created)
+
+    r = await client.get("/api/v1/tasks/")
+    assert len(r.json()["items"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_is_constant_round_trips(client, async_session):
+    user = await UserFactory.create_async(session=async_session)
+    items = [
+        {
+            "name": f"Bulk {i}",
+            "description": None,
+            "deadline": None,
+            "owner_id": str(user.id),
+        }
+        for i in range(2500)
+    ]
+    statements = []
+    engine = async_session.bind.sync_engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        r = await client.post("/api/v1/tasks/bulk", json={"items": items})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert r.status_code == 201, r.text
+    assert len(r.json()) == 2500
+    # one owner check + a handful of multi-row INSERT pages, not one per task
+    assert len(statements) <= 5, statements
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_rejects_unknown_owner(client, async_session):
+    user = await UserFactory.create_async(session=async_session)
+    items = [
+        {"name": "ok", "description": None, "deadline": None, "owner_id": str(user.id)},
+        {
+            "name": "bad",
+            "description": None,
+            "deadline": None,
+            "owner_id": str(uuid4()),
+        },
+    ]
+
+    r = await client.post("/api/v1/tasks/bulk", json={"items": items})
+    assert r.status_code == 404, r.text
+
+    r = await client.get("/api/v1/tasks/")
+    assert r.json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_by_filter(client, async_session):
+    project = await ProjectFactory.create_async(session=async_session)
+    owner = project.owner
+    in_project = [
+        await TaskFactory.create_async(
+            session=async_session, owner=owner, project=project
+        )
+        for _ in range(2)
+    ]
+    outside = await TaskFactory.create_async(session=async_session, owner=owner)
+
+    r = await client.patch(
+        "/api/v1/tasks/bulk",
+        json={
+            "filter": {"owner_id": str(owner.id), "project_id": str(project.id)},
+            "changes": {"complete": True},
+            "return_ids": True,
+        },
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["affected"] == 2
+    assert set(body["ids"]) == {str(t.id) for t in in_project}
+
+    r = await client.get(f"/api/v1/tasks/id/{in_project[0].id}")
+    assert r.json()["complete"] is True
+    r = await client.get(f"/api/v1/tasks/id/{outside.id}")
+    assert r.json()["complete"] is False
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_by_filter(client, async_session):
+    owner = await UserFactory.create_async(session=async_session)
+    done = await TaskFactory.create_async(
+        session=async_session, owner=owner, complete=True
+    )
+    todo = await TaskFactory.create_async(session=async_session, owner=owner)
+
+    r = await client.delete(
+        "/api/v1/tasks/bulk",
+        params={"owner_id": str(owner.id), "complete": "true"},
+    )
+    assert r.status_code == 200, r.text
+    assert r.json() == {"affected": 1, "ids": None}
+
+    r = await client.get(f"/api/v1/tasks/id/{done.id}")
+    assert r.status_code == 404, r.text
+    r = await client.get(f"/api/v1/tasks/id/{todo.id}")
+    assert r.status_code == 200, r.text
+
+
+@pytest.mark.asyncio
+async def test_bulk_operations_require_filter_and_changes(client, async_session):
+    await TaskFactory.create_async(session=async_session)
+
+    r = await client.delete("/api/v1/tasks/bulk")
+    assert r.status_code == 400, r.text
+
+    r = await client.patch(
+        "/api/v1/tasks/bulk", json={"filter": {}, "changes": {"complete": True}}
+    )
+    assert r.status_code == 400, r.text
+
+    r = await client.patch(
+        "/api/v1/tasks/bulk",
+        json={"filter": {"complete": False}, "changes": {}},
+    )
+    assert r.status_code == 400, r.text
+
+
+async def _sync(client, since=None, **params):
+    if since is not None:
+        params["since"] = since
+    r = await client.get("/api/v1/tasks/changes", params=params)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    # SQLite timestamps have millisecond resolution: keep later writes from
+    # landing in the millisecond of the cursor's horizon
+    await asyncio.sleep(0.01)
+    return body
+
+
+@pytest.mark.asyncio
+async def test_changes_delta_sync(client, async_session, monkeypatch):
+    monkeypatch.setattr(settings, "sync_settle_seconds", 0)
+    owner = await UserFactory.create_async(session=async_session)
+    project = await ProjectFactory.create_async(session=async_session, owner=owner)
+    kept, edited, deleted = [
+        await TaskFactory.create_async(session=async_session, owner=owner)
+        for _ in range(3)
+    ]
+    in_project = await TaskFactory.create_async(
+        session=async_session, owner=owner, project=project
+    )
+    other = await TaskFactory.create_async(session=async_session)
+    params = {"owner_id": str(owner.id), "limit": 3}
+
+    # first sync: every task of the owner, paged, and no deletions
+    first = await _sync(client, **params)
+    assert first["has_more"] is True and first["deleted"] == []
+    rest = await _sync(client, first["next_cursor"], **params)
+    assert rest["has_more"] is False
+    synced = {t["id"] for t in first["items"] + rest["items"]}
+    assert synced == {str(t.id) for t in (kept, edited, deleted, in_project)}
+    cursor = rest["next_cursor"]
+
+    nothing = await _sync(client, cursor, **params)
+    assert (nothing["items"], nothing["deleted"]) == ([], [])
+
+    r = await client.patch(f"/api/v1/tasks/id/{edited.id}", json={"complete": True})
+    assert r.status_code == 200, r.text
+    r = await client.delete(f"/api/v1/tasks/id/{deleted.id}")
+    assert r.status_code == 204, r.text
+    r = await client.delete(f"/api/v1/projects/{project.id}")  # cascades
+    assert r.status_code == 204, r.text
+    r = await client.delete(f"/api/v1/tasks/id/{other.id}")
+    assert r.status_code == 204, r.text
+
+    delta = await _sync(client, cursor, **params)
+    assert [t["id"] for t in delta["items"]] == [str(edited.id)]
+    assert delta["items"][0]["complete"] is True
+    assert set(delta["deleted"]) == {str(deleted.id), str(in_project.id)}
+    assert delta["has_more"] is False
+
+    everyone = await _sync(client, cursor)
+    assert str(other.id) in everyone["deleted"]
+
+    nothing = await _sync(client, delta["next_cursor"], **params)
+    assert (nothing["items"], nothing["deleted"]) == ([], [])
+
+
+@pytest.mark.asyncio
+async def test_changes_rejects_bad_and_expired_cursors(client, monkeypatch):
+    r = await client.get("/api/v1/tasks/changes", params={"since": "garbage"})
+    assert r.status_code == 400, r.text
+
+    cursor = (await _sync(client))["next_cursor"]
+    monkeypatch.setattr(settings, "tombstone_retention_days", -1)
+    r = await client.get("/api/v1/tasks/changes", params={"since": cursor})
+    assert r.status_code == 410, r.text
+    assert r.json()["code"] == "GONE"
@@ -1,6 +1,8 @@
+import datetime
+import json
 import pytest
 from uuid import uuid4, UUID
-from tests.factories import UserFactory
+from tests.factories import ProjectFactory, TaskFactory, UserFactory
 from tests.e2e.helper_functions import parse_iso
 
 
@@ -27,7 +29,7 @@ async def test_list_users_returns_all(client, async_session):
     response = await client.get("/api/v1/users/")
     assert response.status_code == 200, response.text
 
-    payload = response.json()  # ← list[dict]
+    payload = response.json()["items"]  # ← list[dict]
 
     assert len(payload) == 3
 
@@ -41,6 +43,16 @@ async def test_list_users_returns_all(client, async_session):
         assert row["full_name"] == user.full_name
 
 
+@pytest.mark.asyncio
+async def test_list_users_filters_on_is_active(client, async_session):
+    await UserFactory.create_async(session=async_session)
+    inactive = await UserFactory.create_async(session=async_session, is_active=False)
+
+    r = await client.get("/api/v1/users/", params={"is_active": "false"})
+    assert r.status_code == 200, r.text
+    assert [item["id"] for item in r.json()["items"]] == [str(inactive.id)]
+
+
 @pytest.mark.asyncio
 async def test_update_user(client, async_session):
     # Create user
@@ -92,3 +104,138 @@ async def test_delete_user(client, async_session):
 
     r = await client.get(f"/api/v1/users/{user.id}")
     assert r.status_code == 404, r.text
+
+
+@pytest.mark.asyncio
+async def test_export_user_streams_ndjson(client, async_session):
+    user = await UserFactory.create_async(session=async_session)
+    project = await ProjectFactory.create_async(session=async_session, owner=user)
+    tasks = [
+        await TaskFactory.create_async(session=async_session, owner=user)
+        for _ in range(3)
+    ]
+    tasks[0].project = project
+    await TaskFactory.create_async(session=async_session)  # someone else's
+    await async_session.flush()
+
+    r = await client.get(f"/api/v1/users/{user.id}/export")
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert [rec["type"] for rec in records] == ["user", "project"] + ["task"] * 3
+    assert records[0]["data"]["email"] == user.email
+    assert records[1]["data"]["id"] == str(project.id)
+    assert {rec["data"]["id"] for rec in records[2:]} == {str(t.id) for t in tasks}
+    linked = [rec for rec in records[2:] if rec["data"]["project_id"]]
+    assert [rec["data"]["id"] for rec in linked] == [str(tasks[0].id)]
+
+
+@pytest.mark.asyncio
+async def test_export_unknown_user_is_404(client):
+    r = await client.get(f"/api/v1/users/{uuid4()}/export")
+    assert r.status_code == 404, r.text
+
+
+@pytest.mark.asyncio
+async def test_get_user_relationships_are_opt_in(client, async_session):
+    user = await UserFactory.create_async(session=async_session)
+    await ProjectFactory.create_async(session=async_session, owner=user)
+    await TaskFactory.create_async(session=async_session, owner=user)
+
+    r = await client.get(f"/api/v1/users/{user.id}")
+    assert r.status_code == 200, r.text
+    assert "projects" not in r.json() and "tasks" not in r.json()
+
+    r = await client.get(f"/api/v1/users/{user.id}", params={"expand": "tasks"})
+    assert r.status_code == 200, r.text
+    assert len(r.json()["tasks"]) == 1
+    assert "projects" not in r.json()
+
+    r = await client.get("/api/v1/users/", params={"expand": "projects,tasks"})
+    assert r.status_code == 200, r.text
+    (row,) = r.json()["items"]
+    assert len(row["projects"]) == 1 and len(row["tasks"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_user_full_expand_and_export_fit_their_budgets(client, async_session):
+    user = await UserFactory.create_async(session=async_session)
+    projects = [
+        await ProjectFactory.create_async(session=async_session, owner=user)
+        for _ in range(2)
+    ]
+    for project in projects:
+        for _ in range(2):
+            task = await TaskFactory.create_async(session=async_session, owner=user)
+            task.project = project
+    await async_session.flush()
+
+    r = await client.get(
+        f"/api/v1/users/{user.id}", params={"expand": "projects,tasks"}
+    )
+    assert r.status_code == 200, r.text
+    assert len(r.json()["projects"]) == 2 and len(r.json()["tasks"]) == 4
+
+    r = await client.get(f"/api/v1/users/{user.id}/export")
+    assert r.status_code == 200, r.text
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert [rec["type"] for rec in records] == ["user"] + ["project"] * 2 + ["task"] * 4
+
+
+@pytest.mark.asyncio
+async def test_get_user_sparse_fields(client, async_session):
+    user = await UserFactory.create_async(session=async_session)
+
+    r = await client.get(f"/api/v1/users/{user.id}", params={"fields": "email"})
+    assert r.status_code == 200, r.text
+    assert r.json() == {"id": str(user.id), "email": user.email}
+
+    r = await client.get(f"/api/v1/users/{user.id}", params={"fields": "hashed_pass"})
+    assert r.status_code == 400, r.text
+    r = await client.get(f"/api/v1/users/{user.id}", params={"expand": "owner"})
+    assert r.status_code == 400, r.text
+
+
+@pytest.mark.asyncio
+async def test_create_user(client):
+    r = await client.post(
+        "/api/v1/users/",
+        json={"email": "new@example.com", "password": "correct-horse"},
+    )
+    assert r.status_code == 201, r.text
+    assert r.json()["email"] == "new@example.com"
+    assert "password" not in r.json() and "hashed_pass" not in r.json()
+
+
+@pytest.mark.asyncio
+async def test_user_stats(client, async_session, max_queries):
+    user = await UserFactory.create_async(session=async_session)
+    today = datetime.date.today()
+    for deadline, complete in [
+        (today - datetime.timedelta(days=3), False),  # overdue
+        (today - datetime.timedelta(days=3), True),  # done late: not overdue
+        (today, False),  # due this week
+        (today + datetime.timedelta(days=30), False),
+        (None, True),
+    ]:
+        await TaskFactory.create_async(
+            session=async_session, owner=user, deadline=deadline, complete=complete
+        )
+    await TaskFactory.create_async(session=async_session)  # someone else's
+
+    with max_queries(1):
+        r = await client.get(f"/api/v1/users/{user.id}/stats")
+    assert r.status_code == 200, r.text
+    assert r.json() == {"total": 5, "completed": 2, "overdue": 1, "due_this_week": 1}
+
+
+@pytest.mark.asyncio
+async def test_user_stats_without_tasks_and_unknown_user(client, async_session):
+    user = await UserFactory.create_async(session=async_session)
+
+    r = await client.get(f"/api/v1/users/{user.id}/stats")
+    assert r.json() == {"total": 0, "completed": 0, "overdue": 0, "due_this_week": 0}
+
+    r = await client.get(f"/api/v1/users/{uuid4()}/stats")
+    assert r.status_code == 404, r.text
@@ -0,0 +1,77 @@
+"""
+EXPLAIN-based guard rails: record the statements a piece of code issues, then
+ask the database how it would execute each of them and report full scans.
+"""
+
+import re
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# SQLite: "SCAN tasks" is a full table scan, "SCAN tasks USING INDEX ..." is an
+# ordered index walk (fine under LIMIT) and "SEARCH ..." is an index lookup.
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+# PostgreSQL reports "Seq Scan on tasks" (enable_seqscan=off keeps it only when
+# no index can serve the predicate).
+_PG_FULL_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+@contextmanager
+def capture_statements(session: AsyncSession) -> Iterator[list[tuple[str, Any]]]:
+    """Collect ``(sql, params)`` for every SELECT run through ``session``."""
+    captured: list[tuple[str, Any]] = []
+    engine = session.bind.sync_engine  # type: ignore[union-attr]
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+
+
+@contextmanager
+def count_statements(session: AsyncSession) -> Iterator[list[str]]:
+    """Collect the SQL of every statement (not just SELECTs) run through ``session``."""
+    captured: list[str] = []
+    engine = session.bind.sync_engine  # type: ignore[union-attr]
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+
+
+async def full_scans(
+    session: AsyncSession, statements: list[tuple[str, Any]]
+) -> list[str]:
+    """Return ``"<table>: <sql>"`` for every statement that scans a whole table."""
+    conn = await session.connection()
+    dialect = conn.dialect.name
+    offenders = []
+    if dialect == "postgresql":
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+    for sql, params in statements:
+        if dialect == "sqlite":
+            res = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = [row[-1] for row in res]
+            pattern = _SQLITE_FULL_SCAN
+        else:
+            res = await conn.exec_driver_sql(f"EXPLAIN {sql}", params)
+            plan = [row[0] for row in res]
+            pattern = _PG_FULL_SCAN
+        for line in plan:
+            match = pattern.search(line.strip())
+            if match:
+                offenders.append(f"{match.group(1)}: {' '.join(sql.split())}")
+    return offenders